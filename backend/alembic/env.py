@@ -28,6 +28,19 @@ config.set_main_option("sqlalchemy.url", settings.DATABASE_URL)
 # add your model's MetaData object here
 target_metadata = Base.metadata
 
+# Database-side objects that are not mapped (see SEARCH_DDL in app.models.wish)
+UNMAPPED_OBJECTS = {
+    "search_vector",
+    "ix_wishes_search_vector",
+    "ix_wishes_title_trgm",
+}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Skip unmapped database-side objects during autogenerate"""
+    return not (reflected and compare_to is None and name in UNMAPPED_OBJECTS)
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -52,6 +65,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -73,7 +87,9 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
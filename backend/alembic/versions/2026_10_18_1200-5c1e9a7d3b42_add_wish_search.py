@@ -0,0 +1,51 @@
+"""Add wish search
+
+Revision ID: 5c1e9a7d3b42
+Revises: 20b754d03b5f
+Create Date: 2026-10-18 12:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1e9a7d3b42'
+down_revision: Union[str, None] = '20b754d03b5f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('russian', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('russian', coalesce(description, '')), 'B') || "
+    "to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(description, ''))"
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.add_column('wishes', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(SEARCH_VECTOR_SQL, persisted=True),
+        nullable=True
+    ))
+    op.create_index(
+        'ix_wishes_search_vector', 'wishes', ['search_vector'],
+        unique=False, postgresql_using='gin'
+    )
+    op.create_index(
+        'ix_wishes_title_trgm', 'wishes', ['title'],
+        unique=False, postgresql_using='gin',
+        postgresql_ops={'title': 'gin_trgm_ops'}
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_wishes_title_trgm', table_name='wishes')
+    op.drop_index('ix_wishes_search_vector', table_name='wishes')
+    op.drop_column('wishes', 'search_vector')
@@ -0,0 +1,48 @@
+"""Add wish list indexes
+
+Revision ID: fd4019ec344f
+Revises: 5c1e9a7d3b42
+Create Date: 2026-10-18 13:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'fd4019ec344f'
+down_revision: Union[str, None] = '5c1e9a7d3b42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+LIST_ORDER = [
+    sa.text('priority DESC'),
+    'order_index',
+    sa.text('created_at DESC'),
+    sa.text('id DESC'),
+]
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_wishes_user_status_order', 'wishes',
+        ['user_id', 'status', *LIST_ORDER],
+        unique=False
+    )
+    op.create_index(
+        'ix_wishes_user_public_order', 'wishes',
+        ['user_id', *LIST_ORDER],
+        unique=False,
+        postgresql_where=sa.text("status = 'ACTIVE' AND is_public")
+    )
+    # Covered by the composite indexes above
+    op.drop_index('ix_wishes_user_id', table_name='wishes')
+
+
+def downgrade() -> None:
+    op.create_index('ix_wishes_user_id', 'wishes', ['user_id'], unique=False)
+    op.drop_index('ix_wishes_user_public_order', table_name='wishes')
+    op.drop_index('ix_wishes_user_status_order', table_name='wishes')
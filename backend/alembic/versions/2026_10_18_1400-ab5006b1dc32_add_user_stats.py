@@ -0,0 +1,162 @@
+"""Add user stats
+
+Revision ID: ab5006b1dc32
+Revises: fd4019ec344f
+Create Date: 2026-10-18 14:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ab5006b1dc32'
+down_revision: Union[str, None] = 'fd4019ec344f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TRIGGERS_DDL = [
+    """
+    CREATE OR REPLACE FUNCTION user_stats_apply_wish(
+        p_user_id bigint, p_status wishstatus, p_price numeric,
+        p_currency varchar, p_sign integer
+    ) RETURNS void AS $$
+    DECLARE
+        v_active integer := CASE WHEN p_status = 'ACTIVE' THEN p_sign ELSE 0 END;
+        v_completed integer := CASE WHEN p_status = 'COMPLETED' THEN p_sign ELSE 0 END;
+        v_cancelled integer := CASE WHEN p_status = 'CANCELLED' THEN p_sign ELSE 0 END;
+        v_currency text := coalesce(p_currency, 'RUB');
+        v_price numeric := CASE
+            WHEN p_status = 'ACTIVE' AND p_price IS NOT NULL THEN p_sign * p_price
+        END;
+    BEGIN
+        INSERT INTO user_stats AS s (
+            user_id, active_count, completed_count, cancelled_count, price_totals
+        )
+        VALUES (
+            p_user_id, v_active, v_completed, v_cancelled,
+            CASE WHEN v_price IS NULL THEN '{}'::jsonb
+                 ELSE jsonb_build_object(v_currency, v_price) END
+        )
+        ON CONFLICT (user_id) DO UPDATE SET
+            active_count = s.active_count + v_active,
+            completed_count = s.completed_count + v_completed,
+            cancelled_count = s.cancelled_count + v_cancelled,
+            price_totals = CASE WHEN v_price IS NULL THEN s.price_totals
+                ELSE s.price_totals || jsonb_build_object(
+                    v_currency,
+                    coalesce((s.price_totals ->> v_currency)::numeric, 0) + v_price
+                ) END,
+            updated_at = now();
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION user_stats_wishes_trigger() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            PERFORM user_stats_apply_wish(
+                OLD.user_id, OLD.status, OLD.price, OLD.currency, -1
+            );
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            PERFORM user_stats_apply_wish(
+                NEW.user_id, NEW.status, NEW.price, NEW.currency, 1
+            );
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION user_stats_group_members_trigger() RETURNS trigger AS $$
+    DECLARE
+        v_user_id bigint := CASE WHEN TG_OP = 'INSERT' THEN NEW.user_id ELSE OLD.user_id END;
+        v_delta integer := CASE WHEN TG_OP = 'INSERT' THEN 1 ELSE -1 END;
+    BEGIN
+        INSERT INTO user_stats AS s (user_id, group_count)
+        VALUES (v_user_id, v_delta)
+        ON CONFLICT (user_id) DO UPDATE SET
+            group_count = s.group_count + v_delta,
+            updated_at = now();
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER user_stats_wishes_insert_delete
+    AFTER INSERT OR DELETE ON wishes
+    FOR EACH ROW EXECUTE FUNCTION user_stats_wishes_trigger()
+    """,
+    """
+    CREATE TRIGGER user_stats_wishes_update
+    AFTER UPDATE OF user_id, status, price, currency ON wishes
+    FOR EACH ROW
+    WHEN (
+        OLD.user_id IS DISTINCT FROM NEW.user_id
+        OR OLD.status IS DISTINCT FROM NEW.status
+        OR OLD.price IS DISTINCT FROM NEW.price
+        OR OLD.currency IS DISTINCT FROM NEW.currency
+    )
+    EXECUTE FUNCTION user_stats_wishes_trigger()
+    """,
+    """
+    CREATE TRIGGER user_stats_group_members
+    AFTER INSERT OR DELETE ON group_members
+    FOR EACH ROW EXECUTE FUNCTION user_stats_group_members_trigger()
+    """,
+]
+
+BACKFILL_SQL = """
+INSERT INTO user_stats (
+    user_id, active_count, completed_count, cancelled_count,
+    group_count, price_totals
+)
+SELECT
+    u.id,
+    (SELECT count(*) FROM wishes w WHERE w.user_id = u.id AND w.status = 'ACTIVE'),
+    (SELECT count(*) FROM wishes w WHERE w.user_id = u.id AND w.status = 'COMPLETED'),
+    (SELECT count(*) FROM wishes w WHERE w.user_id = u.id AND w.status = 'CANCELLED'),
+    (SELECT count(*) FROM group_members m WHERE m.user_id = u.id),
+    coalesce((
+        SELECT jsonb_object_agg(currency, total)
+        FROM (
+            SELECT coalesce(currency, 'RUB') AS currency, sum(price) AS total
+            FROM wishes w
+            WHERE w.user_id = u.id AND w.status = 'ACTIVE' AND w.price IS NOT NULL
+            GROUP BY 1
+        ) totals
+    ), '{}'::jsonb)
+FROM users u
+"""
+
+
+def upgrade() -> None:
+    op.create_table('user_stats',
+    sa.Column('user_id', sa.BigInteger(), nullable=False),
+    sa.Column('active_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('completed_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('cancelled_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('group_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('price_totals', postgresql.JSONB(astext_type=sa.Text()), server_default='{}', nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    for statement in TRIGGERS_DDL:
+        op.execute(statement)
+    op.execute(BACKFILL_SQL)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS user_stats_group_members ON group_members")
+    op.execute("DROP TRIGGER IF EXISTS user_stats_wishes_update ON wishes")
+    op.execute("DROP TRIGGER IF EXISTS user_stats_wishes_insert_delete ON wishes")
+    op.execute("DROP FUNCTION IF EXISTS user_stats_group_members_trigger()")
+    op.execute("DROP FUNCTION IF EXISTS user_stats_wishes_trigger()")
+    op.execute("DROP FUNCTION IF EXISTS user_stats_apply_wish(bigint, wishstatus, numeric, varchar, integer)")
+    op.drop_table('user_stats')
@@ -0,0 +1,159 @@
+"""Add data versions
+
+Revision ID: dd39ed030ea8
+Revises: ab5006b1dc32
+Create Date: 2026-10-18 15:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'dd39ed030ea8'
+down_revision: Union[str, None] = 'ab5006b1dc32'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TRIGGERS_DDL = [
+    """
+    CREATE OR REPLACE FUNCTION bump_user_versions(p_user_ids bigint[]) RETURNS void AS $$
+    BEGIN
+        INSERT INTO user_stats AS s (user_id, version)
+        SELECT id, 1 FROM users WHERE id = ANY(p_user_ids)
+        ON CONFLICT (user_id) DO UPDATE SET version = s.version + 1;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION bump_group_versions(p_group_ids bigint[]) RETURNS void AS $$
+    BEGIN
+        UPDATE groups SET version = version + 1 WHERE id = ANY(p_group_ids);
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION wishes_bump_versions() RETURNS trigger AS $$
+    DECLARE
+        v_user_ids bigint[];
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            v_user_ids := ARRAY(SELECT DISTINCT user_id FROM new_rows);
+        ELSIF TG_OP = 'DELETE' THEN
+            v_user_ids := ARRAY(SELECT DISTINCT user_id FROM old_rows);
+        ELSE
+            v_user_ids := ARRAY(
+                SELECT user_id FROM new_rows UNION SELECT user_id FROM old_rows
+            );
+        END IF;
+
+        PERFORM bump_user_versions(v_user_ids);
+        PERFORM bump_group_versions(ARRAY(
+            SELECT DISTINCT group_id FROM group_members
+            WHERE user_id = ANY(v_user_ids)
+        ));
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION group_rows_bump_versions() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            PERFORM bump_group_versions(ARRAY(SELECT DISTINCT group_id FROM new_rows));
+        END IF;
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            PERFORM bump_group_versions(ARRAY(SELECT DISTINCT group_id FROM old_rows));
+        END IF;
+        IF TG_TABLE_NAME = 'group_members' THEN
+            IF TG_OP = 'INSERT' THEN
+                PERFORM bump_user_versions(ARRAY(SELECT DISTINCT user_id FROM new_rows));
+            ELSE
+                PERFORM bump_user_versions(ARRAY(SELECT DISTINCT user_id FROM old_rows));
+            END IF;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION users_bump_versions() RETURNS trigger AS $$
+    BEGIN
+        PERFORM bump_user_versions(ARRAY(SELECT id FROM new_rows));
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION groups_bump_own_version() RETURNS trigger AS $$
+    BEGIN
+        IF NEW.version = OLD.version THEN
+            NEW.version := OLD.version + 1;
+        END IF;
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    *(
+        f"""
+        CREATE TRIGGER {table}_versions_{op.lower()}
+        AFTER {op} ON {table}
+        REFERENCING {referencing}
+        FOR EACH STATEMENT EXECUTE FUNCTION {function}()
+        """
+        for table, function in (
+            ("wishes", "wishes_bump_versions"),
+            ("group_members", "group_rows_bump_versions"),
+            ("reservations", "group_rows_bump_versions"),
+        )
+        for op, referencing in (
+            ("INSERT", "NEW TABLE AS new_rows"),
+            ("UPDATE", "OLD TABLE AS old_rows NEW TABLE AS new_rows"),
+            ("DELETE", "OLD TABLE AS old_rows"),
+        )
+    ),
+    """
+    CREATE TRIGGER users_versions_update
+    AFTER UPDATE ON users
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION users_bump_versions()
+    """,
+    """
+    CREATE TRIGGER groups_version
+    BEFORE UPDATE ON groups
+    FOR EACH ROW EXECUTE FUNCTION groups_bump_own_version()
+    """,
+]
+
+
+def upgrade() -> None:
+    op.add_column(
+        'user_stats',
+        sa.Column('version', sa.BigInteger(), server_default='0', nullable=False)
+    )
+    op.add_column(
+        'groups',
+        sa.Column('version', sa.BigInteger(), server_default='0', nullable=False)
+    )
+
+    for statement in TRIGGERS_DDL:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS groups_version ON groups")
+    op.execute("DROP TRIGGER IF EXISTS users_versions_update ON users")
+    for table in ("wishes", "group_members", "reservations"):
+        for operation in ("insert", "update", "delete"):
+            op.execute(f"DROP TRIGGER IF EXISTS {table}_versions_{operation} ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS groups_bump_own_version()")
+    op.execute("DROP FUNCTION IF EXISTS users_bump_versions()")
+    op.execute("DROP FUNCTION IF EXISTS group_rows_bump_versions()")
+    op.execute("DROP FUNCTION IF EXISTS wishes_bump_versions()")
+    op.execute("DROP FUNCTION IF EXISTS bump_group_versions(bigint[])")
+    op.execute("DROP FUNCTION IF EXISTS bump_user_versions(bigint[])")
+    op.drop_column('groups', 'version')
+    op.drop_column('user_stats', 'version')
@@ -0,0 +1,38 @@
+"""Add reservation unique constraint
+
+Revision ID: 7b2f4c9e1a60
+Revises: dd39ed030ea8
+Create Date: 2026-10-18 16:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b2f4c9e1a60'
+down_revision: Union[str, None] = 'dd39ed030ea8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keep the earliest reservation of duplicates
+    op.execute("""
+        DELETE FROM reservations r
+        USING reservations earlier
+        WHERE earlier.wish_id = r.wish_id
+          AND earlier.group_id = r.group_id
+          AND earlier.id < r.id
+    """)
+    op.create_unique_constraint(
+        'uq_reservations_wish_group', 'reservations', ['wish_id', 'group_id']
+    )
+    # Covered by the unique constraint above
+    op.drop_index('ix_reservations_wish_id', table_name='reservations')
+
+
+def downgrade() -> None:
+    op.create_index('ix_reservations_wish_id', 'reservations', ['wish_id'], unique=False)
+    op.drop_constraint('uq_reservations_wish_group', 'reservations', type_='unique')
@@ -0,0 +1,161 @@
+"""Derive group versions from members' versions
+
+Revision ID: c3e81f5a9d27
+Revises: 7b2f4c9e1a60
+Create Date: 2026-10-18 17:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e81f5a9d27'
+down_revision: Union[str, None] = '7b2f4c9e1a60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Wish writes stop bumping every group of the writer, version rows are
+# locked in id order
+FUNCTIONS_DDL = [
+    """
+    CREATE OR REPLACE FUNCTION bump_user_versions(p_user_ids bigint[]) RETURNS void AS $$
+    BEGIN
+        INSERT INTO user_stats AS s (user_id, version)
+        SELECT id, 1 FROM users WHERE id = ANY(p_user_ids) ORDER BY id
+        ON CONFLICT (user_id) DO UPDATE SET version = s.version + 1;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION bump_group_versions(p_group_ids bigint[]) RETURNS void AS $$
+    BEGIN
+        PERFORM 1 FROM groups WHERE id = ANY(p_group_ids) ORDER BY id FOR UPDATE;
+        UPDATE groups SET version = version + 1 WHERE id = ANY(p_group_ids);
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION wishes_bump_versions() RETURNS trigger AS $$
+    DECLARE
+        v_user_ids bigint[];
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            v_user_ids := ARRAY(SELECT DISTINCT user_id FROM new_rows);
+        ELSIF TG_OP = 'DELETE' THEN
+            v_user_ids := ARRAY(SELECT DISTINCT user_id FROM old_rows);
+        ELSE
+            v_user_ids := ARRAY(
+                SELECT user_id FROM new_rows UNION SELECT user_id FROM old_rows
+            );
+        END IF;
+
+        PERFORM bump_user_versions(v_user_ids);
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION group_rows_bump_versions() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            PERFORM bump_group_versions(ARRAY(SELECT DISTINCT group_id FROM new_rows));
+        ELSIF TG_OP = 'DELETE' THEN
+            PERFORM bump_group_versions(ARRAY(SELECT DISTINCT group_id FROM old_rows));
+        ELSE
+            PERFORM bump_group_versions(ARRAY(
+                SELECT group_id FROM new_rows UNION SELECT group_id FROM old_rows
+            ));
+        END IF;
+        IF TG_TABLE_NAME = 'group_members' THEN
+            IF TG_OP = 'INSERT' THEN
+                PERFORM bump_user_versions(ARRAY(SELECT DISTINCT user_id FROM new_rows));
+            ELSIF TG_OP = 'DELETE' THEN
+                PERFORM bump_user_versions(ARRAY(SELECT DISTINCT user_id FROM old_rows));
+            ELSE
+                PERFORM bump_user_versions(ARRAY(
+                    SELECT user_id FROM new_rows UNION SELECT user_id FROM old_rows
+                ));
+            END IF;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+]
+
+# Definitions of the add_data_versions migration
+PREVIOUS_FUNCTIONS_DDL = [
+    """
+    CREATE OR REPLACE FUNCTION bump_user_versions(p_user_ids bigint[]) RETURNS void AS $$
+    BEGIN
+        INSERT INTO user_stats AS s (user_id, version)
+        SELECT id, 1 FROM users WHERE id = ANY(p_user_ids)
+        ON CONFLICT (user_id) DO UPDATE SET version = s.version + 1;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION bump_group_versions(p_group_ids bigint[]) RETURNS void AS $$
+    BEGIN
+        UPDATE groups SET version = version + 1 WHERE id = ANY(p_group_ids);
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION wishes_bump_versions() RETURNS trigger AS $$
+    DECLARE
+        v_user_ids bigint[];
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            v_user_ids := ARRAY(SELECT DISTINCT user_id FROM new_rows);
+        ELSIF TG_OP = 'DELETE' THEN
+            v_user_ids := ARRAY(SELECT DISTINCT user_id FROM old_rows);
+        ELSE
+            v_user_ids := ARRAY(
+                SELECT user_id FROM new_rows UNION SELECT user_id FROM old_rows
+            );
+        END IF;
+
+        PERFORM bump_user_versions(v_user_ids);
+        PERFORM bump_group_versions(ARRAY(
+            SELECT DISTINCT group_id FROM group_members
+            WHERE user_id = ANY(v_user_ids)
+        ));
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION group_rows_bump_versions() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            PERFORM bump_group_versions(ARRAY(SELECT DISTINCT group_id FROM new_rows));
+        END IF;
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            PERFORM bump_group_versions(ARRAY(SELECT DISTINCT group_id FROM old_rows));
+        END IF;
+        IF TG_TABLE_NAME = 'group_members' THEN
+            IF TG_OP = 'INSERT' THEN
+                PERFORM bump_user_versions(ARRAY(SELECT DISTINCT user_id FROM new_rows));
+            ELSE
+                PERFORM bump_user_versions(ARRAY(SELECT DISTINCT user_id FROM old_rows));
+            END IF;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+]
+
+
+def upgrade() -> None:
+    for statement in FUNCTIONS_DDL:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    for statement in PREVIOUS_FUNCTIONS_DDL:
+        op.execute(statement)
@@ -0,0 +1,31 @@
+"""Make wish list order columns not null
+
+Revision ID: 4a9d2e7c1b85
+Revises: c3e81f5a9d27
+Create Date: 2026-10-18 18:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4a9d2e7c1b85'
+down_revision: Union[str, None] = 'c3e81f5a9d27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Same values the model defaults to (WishPriority.MEDIUM, first position)
+    op.execute("UPDATE wishes SET priority = 2 WHERE priority IS NULL")
+    op.execute("UPDATE wishes SET order_index = 0 WHERE order_index IS NULL")
+    op.alter_column('wishes', 'priority', existing_type=sa.Integer(), nullable=False)
+    op.alter_column('wishes', 'order_index', existing_type=sa.Integer(), nullable=False)
+
+
+def downgrade() -> None:
+    op.alter_column('wishes', 'order_index', existing_type=sa.Integer(), nullable=True)
+    op.alter_column('wishes', 'priority', existing_type=sa.Integer(), nullable=True)
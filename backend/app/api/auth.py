@@ -0,0 +1,35 @@
+from datetime import timedelta
+from fastapi import APIRouter, Depends, Header
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import get_db
+from app.core.security import create_access_token
+from app.api.deps import get_user_from_init_data
+from app.schemas.auth import SessionToken
+
+router = APIRouter()
+
+
+@router.post("/session", response_model=SessionToken)
+async def create_session(
+    x_telegram_init_data: str = Header(...),
+    session: AsyncSession = Depends(get_db),
+):
+    """Exchange Telegram initData for a short-lived session token"""
+    user = await get_user_from_init_data(x_telegram_init_data, session)
+
+    expires_delta = timedelta(minutes=settings.SESSION_TOKEN_EXPIRE_MINUTES)
+    access_token = create_access_token(
+        {
+            "sub": str(user.id),
+            "telegram_id": user.telegram_id,
+            "is_premium": bool(user.is_premium),
+        },
+        expires_delta=expires_delta
+    )
+
+    return SessionToken(
+        access_token=access_token,
+        expires_in=int(expires_delta.total_seconds())
+    )
@@ -1,33 +1,103 @@
 import json
+import hashlib
 from typing import Optional
-from fastapi import Depends, HTTPException, status, Header
+from fastapi import Depends, HTTPException, status, Header, Request, Response
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 
-from app.core.database import get_db
-from app.core.security import verify_telegram_web_app_data
+from app.core.cache import RequestCoalescer, TTLCache
+from app.core.config import settings
+from app.core.database import get_db, AsyncSessionLocal
+from app.core.security import verify_telegram_web_app_data, decode_access_token
+from app.models.group import GroupRole, GROUP_ROLE_RANK
 from app.models.user import User
+from app.schemas.auth import Principal
+from app.services.groups import get_group_role
+from app.services.users import upsert_user
+from app.services.versions import (
+    get_existing_user_version,
+    get_user_version,
+    get_user_groups_version,
+    get_group_version,
+)
 
+# initData digest -> Principal of the verified user, valid until auth_date + max age
+init_data_cache = TTLCache(maxsize=settings.INIT_DATA_CACHE_SIZE)
 
-async def get_current_user(
-    x_telegram_init_data: str = Header(...),
-    session: AsyncSession = Depends(get_db)
+# (group_id, user_id) -> GroupRole of members, dropped on join/leave/role change
+group_role_cache = TTLCache(
+    maxsize=settings.GROUP_ROLE_CACHE_SIZE,
+    ttl=settings.GROUP_ROLE_CACHE_TTL
+)
+
+# user id -> data version for public wishlists, trusted for max-age: clients
+# and proxies may reuse a shared list that long anyway, so a burst of link
+# opens reads the version once rather than once per request
+public_version_cache = TTLCache(
+    maxsize=settings.PUBLIC_WISHES_CACHE_SIZE,
+    ttl=settings.PUBLIC_WISHES_MAX_AGE
+)
+public_version_loads = RequestCoalescer()
+
+bearer_scheme = HTTPBearer(auto_error=False)
+
+
+def get_token_principal(token: str) -> Principal:
+    """
+    Build principal from session token claims without a DB lookup
+
+    Raises:
+        HTTPException: If token is invalid or expired
+    """
+    payload = decode_access_token(token)
+
+    try:
+        return Principal(
+            id=int(payload["sub"]),
+            telegram_id=payload["telegram_id"],
+            is_premium=payload.get("is_premium", False),
+        )
+    except (KeyError, TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+def _init_data_key(init_data: str) -> bytes:
+    return hashlib.sha256(init_data.encode()).digest()
+
+
+async def get_user_from_init_data(
+    init_data: str,
+    session: AsyncSession
 ) -> User:
     """
-    Get current user from Telegram Web App initData
+    Get user from Telegram Web App initData, creating it on first contact
 
     Args:
-        x_telegram_init_data: Telegram Web App initData from header
+        init_data: Telegram Web App initData
         session: Database session
 
     Returns:
         User: Current user
 
     Raises:
-        HTTPException: If user not found or invalid data
+        HTTPException: If init data is invalid
     """
+    cache_key = _init_data_key(init_data)
+    principal = init_data_cache.get(cache_key)
+
+    if principal:
+        # Init data was already verified, resolve user by primary key
+        user = await session.get(User, principal.id)
+        if user:
+            return user
+        init_data_cache.pop(cache_key)
+
     # Verify and parse init data
-    parsed_data = verify_telegram_web_app_data(x_telegram_init_data)
+    parsed_data = verify_telegram_web_app_data(init_data)
 
     # Get user data from parsed data (use json.loads instead of eval for safety)
     user_json = parsed_data.get("user", "{}")
@@ -40,38 +110,311 @@ async def get_current_user(
             detail="User ID not found in init data"
         )
 
-    # Get user from database
-    result = await session.execute(
-        select(User).where(User.telegram_id == telegram_id)
+    # Get or create user and sync profile fields
+    user = await upsert_user(
+        session,
+        telegram_id=telegram_id,
+        first_name=user_data.get("first_name", "User"),
+        username=user_data.get("username"),
+        last_name=user_data.get("last_name"),
+        language_code=user_data.get("language_code", "ru"),
+        is_premium=user_data.get("is_premium", False),
+    )
+    await session.commit()
+
+    init_data_cache.set(
+        cache_key,
+        Principal.model_validate(user),
+        expires_at=int(parsed_data.get("auth_date", 0)) + settings.INIT_DATA_MAX_AGE
     )
-    user = result.scalar_one_or_none()
-
-    if not user:
-        # Create user if not exists
-        user = User(
-            telegram_id=telegram_id,
-            username=user_data.get("username"),
-            first_name=user_data.get("first_name", "User"),
-            last_name=user_data.get("last_name"),
-            language_code=user_data.get("language_code", "ru"),
-            is_premium=user_data.get("is_premium", False),
-        )
-        session.add(user)
-        await session.commit()
-        await session.refresh(user)
 
     return user
 
 
+async def get_current_user(
+    x_telegram_init_data: Optional[str] = Header(None),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme),
+    session: AsyncSession = Depends(get_db)
+) -> User:
+    """
+    Get current user from session token or Telegram Web App initData
+
+    Args:
+        x_telegram_init_data: Telegram Web App initData from header
+        credentials: Bearer session token from Authorization header
+        session: Database session
+
+    Returns:
+        User: Current user
+
+    Raises:
+        HTTPException: If not authenticated or user not found
+    """
+    if credentials:
+        principal = get_token_principal(credentials.credentials)
+        user = await session.get(User, principal.id)
+
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found"
+            )
+
+        return user
+
+    if not x_telegram_init_data:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated"
+        )
+
+    return await get_user_from_init_data(x_telegram_init_data, session)
+
+
+async def get_current_principal(
+    x_telegram_init_data: Optional[str] = Header(None),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme),
+    session: AsyncSession = Depends(get_db)
+) -> Principal:
+    """
+    Get lightweight current user principal
+
+    With a session token the principal is built from its claims, with
+    initData already verified by this process from the init data cache;
+    the users table is not touched in either case. Other initData is
+    verified and the user upserted.
+    """
+    if credentials:
+        return get_token_principal(credentials.credentials)
+
+    if x_telegram_init_data:
+        principal = init_data_cache.get(_init_data_key(x_telegram_init_data))
+        if principal:
+            return principal
+
+    user = await get_current_user(
+        x_telegram_init_data=x_telegram_init_data,
+        credentials=None,
+        session=session
+    )
+    return Principal.model_validate(user)
+
+
 async def get_current_user_optional(
     x_telegram_init_data: Optional[str] = Header(None),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme),
     session: AsyncSession = Depends(get_db)
 ) -> Optional[User]:
     """Get current user (optional) - for public endpoints"""
-    if not x_telegram_init_data:
+    if not x_telegram_init_data and not credentials:
         return None
 
     try:
-        return await get_current_user(x_telegram_init_data, session)
+        return await get_current_user(
+            x_telegram_init_data=x_telegram_init_data,
+            credentials=credentials,
+            session=session
+        )
     except HTTPException:
         return None
+
+
+def invalidate_group_role(group_id: int, user_id: int) -> None:
+    """Forget cached role after the user joined, left or changed role"""
+    group_role_cache.pop((group_id, user_id))
+
+
+def require_group_role(min_role: GroupRole = GroupRole.MEMBER):
+    """
+    Dependency factory requiring the current user to have at least min_role
+    in the path's group
+
+    The role is resolved once per request, from a short TTL cache, and
+    only on a miss from the database together with the group (which the
+    endpoint then gets from the session's identity map).
+
+    Returns:
+        Dependency returning the user's GroupRole
+    """
+    async def dependency(
+        group_id: int,
+        request: Request,
+        current_user: Principal = Depends(get_current_principal),
+        session: AsyncSession = Depends(get_db)
+    ) -> GroupRole:
+        key = (group_id, current_user.id)
+
+        # Memoized for the request, shared by all dependencies on the route.
+        # Also keeps a loaded group referenced, so session.get(Group, ...)
+        # in the endpoint is served from the identity map.
+        memo = getattr(request.state, "group_roles", None)
+        if memo is None:
+            memo = request.state.group_roles = {}
+
+        role, group = memo.get(key, (None, None))
+        if role is None:
+            role = group_role_cache.get(key)
+        if role is None:
+            membership = await get_group_role(session, group_id, current_user.id)
+            if membership:
+                group, role = membership
+                group_role_cache.set(key, role)
+        memo[key] = (role, group)
+
+        if role is None:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not a member of this group"
+            )
+
+        if GROUP_ROLE_RANK[role] < GROUP_ROLE_RANK[min_role]:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized for this group"
+            )
+
+        return role
+
+    return dependency
+
+
+def check_etag(
+    request: Request,
+    response: Response,
+    tag: str,
+    cache_control: str = "private, no-cache"
+) -> None:
+    """
+    Set weak ETag on the response, answer 304 if the client has it already
+
+    Args:
+        request: Current request
+        response: Response to set headers on
+        tag: Opaque version tag of the representation
+        cache_control: Cache-Control header value
+
+    Raises:
+        HTTPException: 304 Not Modified if If-None-Match matches the tag
+    """
+    etag = f'W/"{tag}"'
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        # Weak comparison ignores the W/ prefix
+        candidates = {
+            candidate.strip().removeprefix("W/")
+            for candidate in if_none_match.split(",")
+        }
+        if "*" in candidates or etag.removeprefix("W/") in candidates:
+            raise HTTPException(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers=headers
+            )
+
+    response.headers.update(headers)
+
+
+async def user_data_etag(
+    request: Request,
+    response: Response,
+    current_user: Principal = Depends(get_current_principal),
+    session: AsyncSession = Depends(get_db)
+) -> str:
+    """
+    Conditional GET for current user's profile and wishes
+
+    Returns:
+        str: Current version of the user's data
+    """
+    version = await get_user_version(session, current_user.id)
+    check_etag(request, response, f"user-{current_user.id}-{version}")
+    return version
+
+
+async def user_groups_etag(
+    request: Request,
+    response: Response,
+    current_user: Principal = Depends(get_current_principal),
+    session: AsyncSession = Depends(get_db)
+) -> None:
+    """Conditional GET for current user's list of groups"""
+    version = await get_user_groups_version(session, current_user.id)
+    check_etag(request, response, f"groups-{current_user.id}-{version}")
+
+
+async def group_etag(
+    group_id: int,
+    request: Request,
+    response: Response,
+    role: GroupRole = Depends(require_group_role()),
+    session: AsyncSession = Depends(get_db)
+) -> None:
+    """
+    Conditional GET for group's data
+
+    Membership comes from the role resolved for the request (memoized, so
+    it costs no extra query), non-members are rejected before any lookup.
+    """
+    version = await get_group_version(session, group_id)
+    if version is not None:
+        check_etag(request, response, f"group-{group_id}-{version}")
+
+
+async def load_public_version(user_id: int) -> Optional[str]:
+    """
+    Read user's data version into public_version_cache
+
+    Uses its own session: the result is shared with concurrent requests
+    that must not depend on the request which started it. Missing users
+    are not cached, so a user created meanwhile is found right away.
+
+    Returns:
+        Optional[str]: Version, None if the user does not exist
+    """
+    async with AsyncSessionLocal() as session:
+        version = await get_existing_user_version(session, user_id)
+
+    if version is not None:
+        public_version_cache.set(user_id, version)
+    return version
+
+
+async def public_wishes_etag(
+    user_id: int,
+    request: Request,
+    response: Response
+) -> str:
+    """
+    Conditional GET for user's public wishes
+
+    Shared links are opened by many people at once, so clients and proxies
+    may reuse the response for PUBLIC_WISHES_MAX_AGE seconds. The version is
+    trusted for as long: within that window requests touch no database,
+    and concurrent misses share one version query.
+
+    Returns:
+        str: User's data version, at most PUBLIC_WISHES_MAX_AGE seconds old
+
+    Raises:
+        HTTPException: 404 if the user does not exist
+    """
+    version = public_version_cache.get(user_id)
+    if version is None:
+        version = await public_version_loads.run(
+            user_id,
+            lambda: load_public_version(user_id)
+        )
+        if version is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found"
+            )
+
+    check_etag(
+        request,
+        response,
+        f"public-{user_id}-{version}",
+        f"public, max-age={settings.PUBLIC_WISHES_MAX_AGE}"
+    )
+    return version
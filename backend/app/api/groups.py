@@ -1,12 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
+from typing import Optional
 
+from app.core.config import settings
 from app.core.database import get_db
-from app.api.deps import get_current_user
-from app.models.user import User
+from app.core.pagination import encode_cursor, decode_cursor
+from app.api.deps import (
+    get_current_principal,
+    user_groups_etag,
+    group_etag,
+    require_group_role,
+    invalidate_group_role,
+)
+from app.schemas.auth import Principal
 from app.models.group import Group, GroupMember, GroupRole
-from app.models.wish import Wish, WishStatus
+from app.models.wish import WishPriority, WISH_CURSOR_TYPES, wish_cursor
 from app.schemas.group import (
     Group as GroupSchema,
     GroupCreate,
@@ -14,66 +23,39 @@ from app.schemas.group import (
     GroupWithMembers,
     GroupMember as GroupMemberSchema,
 )
+from app.schemas.reservation import Reservation as ReservationSchema, ReservationCreate
+from app.schemas.wish import WishFeedResponse
+from app.services.groups import list_user_groups, get_group_feed
+from app.services import reservations as reservation_service
 
 router = APIRouter()
 
 
-@router.get("/", response_model=list[GroupWithMembers])
+@router.get(
+    "/",
+    response_model=list[GroupWithMembers],
+    dependencies=[Depends(user_groups_etag)]
+)
 async def get_groups(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     session: AsyncSession = Depends(get_db),
 ):
-    """Get user's groups"""
-    result = await session.execute(
-        select(Group)
-        .join(GroupMember)
-        .where(GroupMember.user_id == current_user.id)
-        .order_by(Group.created_at.desc())
-    )
-    groups = result.scalars().all()
-
-    # Add member count
-    groups_with_members = []
-    for group in groups:
-        groups_with_members.append(
-            GroupWithMembers(
-                **group.__dict__,
-                member_count=len(group.members)
-            )
-        )
-
-    return groups_with_members
+    """Get user's groups with member counts"""
+    return await list_user_groups(session, current_user.id)
 
 
-@router.get("/{group_id}", response_model=GroupSchema)
+@router.get(
+    "/{group_id}",
+    response_model=GroupSchema,
+    dependencies=[Depends(require_group_role()), Depends(group_etag)]
+)
 async def get_group(
     group_id: int,
-    current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_db),
 ):
     """Get group details"""
-    # Check if user is member
-    result = await session.execute(
-        select(GroupMember).where(
-            and_(
-                GroupMember.group_id == group_id,
-                GroupMember.user_id == current_user.id
-            )
-        )
-    )
-    membership = result.scalar_one_or_none()
-
-    if not membership:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not a member of this group"
-        )
-
-    # Get group
-    result = await session.execute(
-        select(Group).where(Group.id == group_id)
-    )
-    group = result.scalar_one_or_none()
+    # Loaded together with the role, no query unless it came from cache
+    group = await session.get(Group, group_id)
 
     if not group:
         raise HTTPException(
@@ -87,7 +69,7 @@ async def get_group(
 @router.post("/", response_model=GroupSchema, status_code=status.HTTP_201_CREATED)
 async def create_group(
     group_in: GroupCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     session: AsyncSession = Depends(get_db),
 ):
     """Create new group"""
@@ -113,37 +95,18 @@ async def create_group(
     return group
 
 
-@router.put("/{group_id}", response_model=GroupSchema)
+@router.put(
+    "/{group_id}",
+    response_model=GroupSchema,
+    dependencies=[Depends(require_group_role(GroupRole.ADMIN))]
+)
 async def update_group(
     group_id: int,
     group_in: GroupUpdate,
-    current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_db),
 ):
     """Update group (owner/admin only)"""
-    # Check permissions
-    result = await session.execute(
-        select(GroupMember).where(
-            and_(
-                GroupMember.group_id == group_id,
-                GroupMember.user_id == current_user.id,
-                GroupMember.role.in_([GroupRole.OWNER, GroupRole.ADMIN])
-            )
-        )
-    )
-    membership = result.scalar_one_or_none()
-
-    if not membership:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to update this group"
-        )
-
-    # Get group
-    result = await session.execute(
-        select(Group).where(Group.id == group_id)
-    )
-    group = result.scalar_one_or_none()
+    group = await session.get(Group, group_id)
 
     if not group:
         raise HTTPException(
@@ -166,7 +129,7 @@ async def update_group(
 async def join_group(
     group_id: int,
     invite_code: str,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     session: AsyncSession = Depends(get_db),
 ):
     """Join group by invite code"""
@@ -214,34 +177,21 @@ async def join_group(
     await session.commit()
     await session.refresh(membership)
 
+    invalidate_group_role(group_id, current_user.id)
+
     return membership
 
 
-@router.get("/{group_id}/members", response_model=list[GroupMemberSchema])
+@router.get(
+    "/{group_id}/members",
+    response_model=list[GroupMemberSchema],
+    dependencies=[Depends(require_group_role()), Depends(group_etag)]
+)
 async def get_group_members(
     group_id: int,
-    current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_db),
 ):
     """Get group members"""
-    # Check if user is member
-    result = await session.execute(
-        select(GroupMember).where(
-            and_(
-                GroupMember.group_id == group_id,
-                GroupMember.user_id == current_user.id
-            )
-        )
-    )
-    membership = result.scalar_one_or_none()
-
-    if not membership:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not a member of this group"
-        )
-
-    # Get all members
     result = await session.execute(
         select(GroupMember).where(GroupMember.group_id == group_id)
     )
@@ -250,46 +200,128 @@ async def get_group_members(
     return members
 
 
-@router.get("/{group_id}/wishes", response_model=list)
+@router.get(
+    "/{group_id}/wishes",
+    response_model=WishFeedResponse,
+    dependencies=[Depends(require_group_role()), Depends(group_etag)]
+)
 async def get_group_wishes(
     group_id: int,
-    current_user: User = Depends(get_current_user),
+    cursor: Optional[str] = Query(None),
+    page_size: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+    member_id: Optional[int] = Query(None),
+    priority: Optional[int] = Query(None, ge=WishPriority.LOW.value, le=WishPriority.URGENT.value),
+    current_user: Principal = Depends(get_current_principal),
     session: AsyncSession = Depends(get_db),
 ):
-    """Get wishes of all group members"""
-    # Check if user is member
-    result = await session.execute(
-        select(GroupMember).where(
-            and_(
-                GroupMember.group_id == group_id,
-                GroupMember.user_id == current_user.id
-            )
-        )
+    """
+    Get active public wishes of all group members with reservation status
+
+    Pass next_cursor from a previous response as cursor to get the next
+    page. Optionally filter by member and priority.
+    """
+    # Fetch one extra row to know whether there is a next page
+    wishes = await get_group_feed(
+        session,
+        group_id,
+        current_user.id,
+        limit=page_size + 1,
+        after=decode_cursor(cursor, WISH_CURSOR_TYPES) if cursor else None,
+        member_id=member_id,
+        priority=priority,
     )
-    membership = result.scalar_one_or_none()
 
-    if not membership:
+    next_cursor = None
+    if len(wishes) > page_size:
+        wishes = wishes[:page_size]
+        next_cursor = encode_cursor(wish_cursor(wishes[-1]))
+
+    return WishFeedResponse(items=wishes, next_cursor=next_cursor)
+
+
+@router.post(
+    "/{group_id}/wishes/{wish_id}/reservation",
+    response_model=ReservationSchema,
+    status_code=status.HTTP_201_CREATED
+)
+async def reserve_wish(
+    group_id: int,
+    wish_id: int,
+    reservation_in: ReservationCreate,
+    response: Response,
+    current_user: Principal = Depends(get_current_principal),
+    session: AsyncSession = Depends(get_db),
+):
+    """
+    Reserve a group member's wish
+
+    Concurrent requests for the same wish are settled by the database:
+    exactly one succeeds, the others get 409. Repeating a successful
+    request returns the existing reservation.
+    """
+    reservation = await reservation_service.reserve_wish(
+        session,
+        group_id,
+        wish_id,
+        current_user.id,
+        notes=reservation_in.notes
+    )
+
+    if reservation:
+        await session.commit()
+        return reservation
+
+    state, existing = await reservation_service.get_reservation_state(
+        session, group_id, wish_id, current_user.id
+    )
+
+    if not state.is_member:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not a member of this group"
         )
 
-    # Get all member IDs
-    result = await session.execute(
-        select(GroupMember.user_id).where(GroupMember.group_id == group_id)
+    if state.owner_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Wish not found"
+        )
+
+    if state.owner_id == current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot reserve your own wish"
+        )
+
+    if existing and existing.reserved_by == current_user.id:
+        response.status_code = status.HTTP_200_OK
+        return existing
+
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="Wish is already reserved"
     )
-    member_ids = result.scalars().all()
 
-    # Get wishes
-    result = await session.execute(
-        select(Wish).where(
-            and_(
-                Wish.user_id.in_(member_ids),
-                Wish.status == WishStatus.ACTIVE,
-                Wish.is_public == True
-            )
-        ).order_by(Wish.priority.desc(), Wish.created_at.desc())
+
+@router.delete(
+    "/{group_id}/wishes/{wish_id}/reservation",
+    status_code=status.HTTP_204_NO_CONTENT
+)
+async def cancel_reservation(
+    group_id: int,
+    wish_id: int,
+    current_user: Principal = Depends(get_current_principal),
+    session: AsyncSession = Depends(get_db),
+):
+    """Cancel own reservation of a wish"""
+    cancelled = await reservation_service.cancel_reservation(
+        session, group_id, wish_id, current_user.id
     )
-    wishes = result.scalars().all()
 
-    return wishes
+    if not cancelled:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Reservation not found"
+        )
+
+    await session.commit()
@@ -1,53 +1,97 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from typing import Any, Optional, Sequence
 
-from app.core.database import get_db
-from app.api.deps import get_current_user
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+
+from app.core.cache import RequestCoalescer, TTLCache
+from app.core.config import settings
+from app.core.database import get_db, AsyncSessionLocal
+from app.core.pagination import encode_cursor, decode_cursor
+from app.api.deps import (
+    get_current_user,
+    get_current_principal,
+    user_data_etag,
+    public_wishes_etag,
+)
 from app.models.user import User
-from app.models.wish import Wish, WishStatus
-from app.models.group import GroupMember
+from app.models.wish import WISH_CURSOR_TYPES, wish_cursor
+from app.schemas.auth import Principal
 from app.schemas.user import User as UserSchema, UserUpdate, UserProfile
+from app.schemas.wish import PublicWishListResponse
+from app.services.users import get_user_profile
+from app.services.wishes import get_public_wishes
 
 router = APIRouter()
 
+# user id -> (data version, UserProfile). Any write to the user, their
+# wishes or memberships bumps the version, which invalidates the entry.
+profile_cache = TTLCache(
+    maxsize=settings.PROFILE_CACHE_SIZE,
+    ttl=settings.PROFILE_CACHE_TTL
+)
+
+# (user id, cursor, page size) -> (data version, rendered JSON page).
+# Stale versions are replaced on the next request for the page.
+public_wishes_cache = TTLCache(
+    maxsize=settings.PUBLIC_WISHES_CACHE_SIZE,
+    ttl=settings.PUBLIC_WISHES_CACHE_TTL
+)
+public_wishes_loads = RequestCoalescer()
+
+
+async def render_public_wishes(
+    user_id: int,
+    version: str,
+    cursor: Optional[str],
+    after: Optional[Sequence[Any]],
+    page_size: int
+) -> bytes:
+    """
+    Render a public wishlist page and store it in the snapshot cache
+
+    Uses its own session: the result is shared with concurrent requests
+    that must not depend on the request which started it.
+    """
+    async with AsyncSessionLocal() as session:
+        # Fetch one extra row to know whether there is a next page
+        wishes = await get_public_wishes(session, user_id, limit=page_size + 1, after=after)
+
+    next_cursor = None
+    if len(wishes) > page_size:
+        wishes = wishes[:page_size]
+        next_cursor = encode_cursor(wish_cursor(wishes[-1]))
+
+    page = PublicWishListResponse(items=wishes, next_cursor=next_cursor)
+    content = orjson.dumps(page.model_dump(mode="json"))
+
+    public_wishes_cache.set((user_id, cursor, page_size), (version, content))
+    return content
+
 
 @router.get("/profile", response_model=UserProfile)
 async def get_profile(
-    current_user: User = Depends(get_current_user),
+    version: str = Depends(user_data_etag),
+    current_user: Principal = Depends(get_current_principal),
     session: AsyncSession = Depends(get_db),
 ):
     """Get current user profile with statistics"""
+    cached = profile_cache.get(current_user.id)
+    if cached and cached[0] == version:
+        return cached[1]
 
-    # Get wishes count
-    wishes_result = await session.execute(
-        select(func.count(Wish.id)).where(Wish.user_id == current_user.id)
-    )
-    wishes_count = wishes_result.scalar()
+    profile = await get_user_profile(session, current_user.id)
 
-    # Get completed wishes count
-    completed_result = await session.execute(
-        select(func.count(Wish.id)).where(
-            Wish.user_id == current_user.id,
-            Wish.status == WishStatus.COMPLETED
+    if not profile:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found"
         )
-    )
-    completed_wishes_count = completed_result.scalar()
 
-    # Get groups count
-    groups_result = await session.execute(
-        select(func.count(GroupMember.id)).where(
-            GroupMember.user_id == current_user.id
-        )
-    )
-    groups_count = groups_result.scalar()
+    profile_cache.set(current_user.id, (version, profile))
 
-    return UserProfile(
-        **current_user.__dict__,
-        wishes_count=wishes_count,
-        completed_wishes_count=completed_wishes_count,
-        groups_count=groups_count
-    )
+    return profile
 
 
 @router.put("/profile", response_model=UserSchema)
@@ -89,19 +133,40 @@ async def get_user(
     return user
 
 
-@router.get("/{user_id}/wishes", response_model=list)
+@router.get("/{user_id}/wishes", response_model=PublicWishListResponse)
 async def get_user_wishes(
     user_id: int,
-    session: AsyncSession = Depends(get_db),
+    response: Response,
+    cursor: Optional[str] = Query(None),
+    page_size: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+    version: str = Depends(public_wishes_etag),
 ):
-    """Get public wishes of a user"""
-    result = await session.execute(
-        select(Wish).where(
-            Wish.user_id == user_id,
-            Wish.status == WishStatus.ACTIVE,
-            Wish.is_public == True
-        ).order_by(Wish.priority.desc(), Wish.created_at.desc())
-    )
-    wishes = result.scalars().all()
+    """
+    Get public wishes of a user (shared wishlist link)
+
+    Pages are served from a per-process snapshot cache checked against the
+    user's data version (see public_wishes_etag), so writes to the user's
+    wishes invalidate them within PUBLIC_WISHES_MAX_AGE. Concurrent misses
+    for the same page share one database query. Unknown users get 404,
+    which is neither cached nor cacheable.
+    """
+    after = decode_cursor(cursor, WISH_CURSOR_TYPES) if cursor else None
+
+    cached = public_wishes_cache.get((user_id, cursor, page_size))
+    if cached and cached[0] == version:
+        content = cached[1]
+    else:
+        content = await public_wishes_loads.run(
+            (user_id, version, cursor, page_size),
+            lambda: render_public_wishes(user_id, version, cursor, after, page_size)
+        )
 
-    return wishes
+    # Headers set on the injected response are not applied to a returned one
+    return Response(
+        content=content,
+        media_type="application/json",
+        headers={
+            "ETag": response.headers["etag"],
+            "Cache-Control": response.headers["cache-control"],
+        }
+    )
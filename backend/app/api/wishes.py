@@ -1,41 +1,83 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_
-from typing import List
+from typing import List, Literal, Optional
 import logging
 
-from app.core.database import get_db
-from app.api.deps import get_current_user
-from app.models.user import User
-from app.models.wish import Wish, WishStatus
+from app.core.config import settings
+from app.core.database import get_db, AsyncSessionLocal
+from app.core.pagination import encode_cursor, decode_cursor, keyset_after
+from app.core.uploads import MultipartFileStream
+from app.services.search import apply_wish_search
+from app.api.deps import get_current_principal, user_data_etag
+from app.schemas.auth import Principal
+from app.models.wish import (
+    Wish, WishStatus, WISH_LIST_ORDER, WISH_CURSOR_TYPES, wish_cursor
+)
 from app.schemas.wish import (
     Wish as WishSchema,
     WishCreate,
     WishUpdate,
     WishListResponse,
+    WishMove,
+    WishBatchRequest,
+    WishBatchResult,
+    WishBatchResponse,
+    WishImportResult,
 )
+from app.services import wishes as wish_service
+from app.services.export import EXPORT_FORMATS, export_wishes as export_wish_rows
+from app.services.imports import detect_import_format, import_wishes as import_wish_rows
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
-@router.get("/", response_model=WishListResponse)
+async def rebalance_order_in_background(user_id: int) -> None:
+    """Spread user's order_index values again once gaps run out"""
+    async with AsyncSessionLocal() as session:
+        await wish_service.rebalance_order(session, user_id)
+        await session.commit()
+
+
+@router.get(
+    "/",
+    response_model=WishListResponse,
+    dependencies=[Depends(user_data_etag)]
+)
 async def get_wishes(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    status: WishStatus = Query(WishStatus.ACTIVE),
+    cursor: Optional[str] = Query(None),
+    include_total: bool = Query(True),
+    wish_status: WishStatus = Query(WishStatus.ACTIVE, alias="status"),
     category_id: int = Query(None),
     search: str = Query(None),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     session: AsyncSession = Depends(get_db),
 ):
-    """Get user's wishes with pagination"""
+    """
+    Get user's wishes with pagination
+
+    Pass next_cursor from a previous response as cursor to seek past it
+    instead of using page offsets; page is ignored in that case.
+    Search results are ordered by relevance and use page offsets only.
+    """
+    # Blank terms would build an empty full-text query
+    search = search.strip() if search else None
+
+    if search and cursor:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor pagination is not supported with search"
+        )
 
     # Build query
     query = select(Wish).where(
         and_(
             Wish.user_id == current_user.id,
-            Wish.status == status
+            Wish.status == wish_status
         )
     )
 
@@ -43,41 +85,85 @@ async def get_wishes(
     if category_id:
         query = query.where(Wish.category_id == category_id)
 
+    order_by = WISH_LIST_ORDER
     if search:
-        query = query.where(
-            Wish.title.ilike(f"%{search}%")
-        )
+        query, rank = apply_wish_search(query, search, session.bind.dialect.name)
+        order_by = (rank.desc(), *WISH_LIST_ORDER)
 
     # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await session.execute(count_query)
-    total = total_result.scalar()
+    total = None
+    if include_total:
+        count_query = select(func.count()).select_from(query.subquery())
+        total_result = await session.execute(count_query)
+        total = total_result.scalar()
 
     # Add pagination and ordering
-    query = query.order_by(
-        Wish.priority.desc(),
-        Wish.order_index.asc(),
-        Wish.created_at.desc()
-    )
-    query = query.offset((page - 1) * page_size).limit(page_size)
+    query = query.order_by(*order_by)
+    if cursor:
+        query = query.where(
+            keyset_after(WISH_LIST_ORDER, decode_cursor(cursor, WISH_CURSOR_TYPES))
+        )
+    else:
+        query = query.offset((page - 1) * page_size)
 
-    # Execute query
-    result = await session.execute(query)
+    # Fetch one extra row to know whether there is a next page
+    result = await session.execute(query.limit(page_size + 1))
     wishes = result.scalars().all()
 
+    next_cursor = None
+    if len(wishes) > page_size:
+        wishes = wishes[:page_size]
+        if not search:
+            next_cursor = encode_cursor(wish_cursor(wishes[-1]))
+
     return WishListResponse(
         items=wishes,
         total=total,
         page=page,
         page_size=page_size,
-        total_pages=(total + page_size - 1) // page_size
+        total_pages=(
+            (total + page_size - 1) // page_size if total is not None else None
+        ),
+        next_cursor=next_cursor
+    )
+
+
+@router.get("/export")
+async def export_wishes(
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    current_user: Principal = Depends(get_current_principal),
+):
+    """
+    Export all user's wishes as NDJSON or CSV
+
+    Rows are streamed from a server-side cursor, so memory use does not
+    grow with the size of the list.
+    """
+    media_type, _, _ = EXPORT_FORMATS[export_format]
+
+    async def content():
+        # The request-scoped session is closed before the body is sent
+        async with AsyncSessionLocal() as session:
+            async for chunk in export_wish_rows(session, current_user.id, export_format):
+                yield chunk
+
+    return StreamingResponse(
+        content(),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="wishes.{export_format}"'
+        }
     )
 
 
-@router.get("/{wish_id}", response_model=WishSchema)
+@router.get(
+    "/{wish_id}",
+    response_model=WishSchema,
+    dependencies=[Depends(user_data_etag)]
+)
 async def get_wish(
     wish_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     session: AsyncSession = Depends(get_db),
 ):
     """Get single wish"""
@@ -103,7 +189,7 @@ async def get_wish(
 @router.post("/", response_model=WishSchema, status_code=status.HTTP_201_CREATED)
 async def create_wish(
     wish_in: WishCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     session: AsyncSession = Depends(get_db),
 ):
     """Create new wish"""
@@ -126,23 +212,141 @@ async def create_wish(
         raise
 
 
+@router.post("/batch", response_model=WishBatchResponse)
+async def batch_wishes(
+    batch_in: WishBatchRequest,
+    current_user: Principal = Depends(get_current_principal),
+    session: AsyncSession = Depends(get_db),
+):
+    """
+    Create, update and delete wishes in one transaction
+
+    Operations are executed set-based: all creates, then all updates,
+    then all deletes. Each wish ID may be targeted at most once.
+    """
+    operations = batch_in.operations
+
+    if len(operations) > settings.MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Batch too large (max {settings.MAX_BATCH_SIZE} operations)"
+        )
+
+    target_ids = [op.id for op in operations if op.op != "create"]
+    if len(target_ids) != len(set(target_ids)):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Each wish may be targeted by one operation only"
+        )
+
+    creates = [op for op in operations if op.op == "create"]
+    created = iter(await wish_service.create_wishes(
+        session,
+        current_user.id,
+        [op.data.model_dump() for op in creates]
+    ))
+    updated = await wish_service.update_wishes(
+        session,
+        current_user.id,
+        {
+            op.id: op.data.model_dump(exclude_unset=True)
+            for op in operations if op.op == "update"
+        }
+    )
+    deleted = await wish_service.delete_wishes(
+        session,
+        current_user.id,
+        [op.id for op in operations if op.op == "delete"]
+    )
+
+    await session.commit()
+
+    results = []
+    for index, op in enumerate(operations):
+        if op.op == "create":
+            wish = next(created)
+            results.append(WishBatchResult(
+                index=index, op=op.op, status="ok", id=wish.id, wish=wish
+            ))
+        elif op.op == "update":
+            wish = updated.get(op.id)
+            results.append(WishBatchResult(
+                index=index, op=op.op, id=op.id,
+                status="ok" if wish else "not_found", wish=wish
+            ))
+        else:
+            results.append(WishBatchResult(
+                index=index, op=op.op, id=op.id,
+                status="ok" if op.id in deleted else "not_found"
+            ))
+
+    return WishBatchResponse(results=results)
+
+
+@router.post(
+    "/import",
+    response_model=WishImportResult,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "multipart/form-data": {
+                    "schema": {
+                        "type": "object",
+                        "properties": {"file": {"type": "string", "format": "binary"}},
+                        "required": ["file"],
+                    }
+                }
+            },
+        }
+    },
+)
+async def import_wishes(
+    request: Request,
+    import_format: Optional[Literal["ndjson", "csv"]] = Query(None, alias="format"),
+    current_user: Principal = Depends(get_current_principal),
+    session: AsyncSession = Depends(get_db),
+):
+    """
+    Import wishes from an uploaded CSV or NDJSON file
+
+    The multipart body is parsed while it streams in and is limited to
+    MAX_UPLOAD_SIZE. Format defaults to the file extension. Either all
+    valid rows are imported or, if the upload fails, none.
+    """
+    upload = await MultipartFileStream(request).open()
+
+    import_format = import_format or detect_import_format(upload.filename)
+    if not import_format:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unknown file format, pass format=csv or format=ndjson"
+        )
+
+    result = await import_wish_rows(session, current_user.id, upload, import_format)
+    await session.commit()
+
+    logger.info(
+        f"Imported wishes for user {current_user.id}: "
+        f"{result.accepted} accepted, {result.rejected} rejected"
+    )
+    return result
+
+
 @router.put("/{wish_id}", response_model=WishSchema)
 async def update_wish(
     wish_id: int,
     wish_in: WishUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     session: AsyncSession = Depends(get_db),
 ):
     """Update wish"""
-    result = await session.execute(
-        select(Wish).where(
-            and_(
-                Wish.id == wish_id,
-                Wish.user_id == current_user.id
-            )
-        )
+    wish = await wish_service.update_wish(
+        session,
+        current_user.id,
+        wish_id,
+        wish_in.model_dump(exclude_unset=True)
     )
-    wish = result.scalar_one_or_none()
 
     if not wish:
         raise HTTPException(
@@ -150,13 +354,57 @@ async def update_wish(
             detail="Wish not found"
         )
 
-    # Update fields
-    update_data = wish_in.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(wish, field, value)
+    await session.commit()
+
+    return wish
+
+
+@router.post("/{wish_id}/move", response_model=WishSchema)
+async def move_wish(
+    wish_id: int,
+    move_in: WishMove,
+    background_tasks: BackgroundTasks,
+    current_user: Principal = Depends(get_current_principal),
+    session: AsyncSession = Depends(get_db),
+):
+    """Move wish next to another one (drag & drop)"""
+    if (move_in.after_id is None) == (move_in.before_id is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Exactly one of after_id and before_id is required"
+        )
+
+    anchor_id = move_in.after_id if move_in.after_id is not None else move_in.before_id
+    if anchor_id == wish_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot move wish relative to itself"
+        )
+
+    try:
+        wish, exhausted = await wish_service.move_wish(
+            session,
+            current_user.id,
+            wish_id,
+            anchor_id,
+            place_after=move_in.after_id is not None
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cannot move wish: {e}"
+        )
+
+    if not wish:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Wish not found"
+        )
 
     await session.commit()
-    await session.refresh(wish)
+
+    if exhausted:
+        background_tasks.add_task(rebalance_order_in_background, current_user.id)
 
     return wish
 
@@ -164,46 +412,29 @@ async def update_wish(
 @router.delete("/{wish_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_wish(
     wish_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     session: AsyncSession = Depends(get_db),
 ):
     """Delete wish"""
-    result = await session.execute(
-        select(Wish).where(
-            and_(
-                Wish.id == wish_id,
-                Wish.user_id == current_user.id
-            )
-        )
-    )
-    wish = result.scalar_one_or_none()
+    title = await wish_service.delete_wish(session, current_user.id, wish_id)
 
-    if not wish:
+    if title is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Wish not found"
         )
 
-    await session.delete(wish)
     await session.commit()
 
 
 @router.patch("/{wish_id}/complete", response_model=WishSchema)
 async def complete_wish(
     wish_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     session: AsyncSession = Depends(get_db),
 ):
     """Mark wish as completed"""
-    result = await session.execute(
-        select(Wish).where(
-            and_(
-                Wish.id == wish_id,
-                Wish.user_id == current_user.id
-            )
-        )
-    )
-    wish = result.scalar_one_or_none()
+    wish = await wish_service.complete_wish(session, current_user.id, wish_id)
 
     if not wish:
         raise HTTPException(
@@ -211,8 +442,6 @@ async def complete_wish(
             detail="Wish not found"
         )
 
-    wish.status = WishStatus.COMPLETED
     await session.commit()
-    await session.refresh(wish)
 
     return wish
@@ -0,0 +1,26 @@
+from typing import AsyncGenerator, AsyncIterable, TYPE_CHECKING
+
+from aiogram.types import InputFile
+
+if TYPE_CHECKING:
+    from aiogram import Bot
+
+
+class AsyncIterableInputFile(InputFile):
+    """
+    Input file uploaded chunk by chunk from an async iterable
+
+    The iterable is consumed by the upload, so the file can be sent once.
+    """
+
+    # read() cannot start over, a rejected upload must not be retried
+    # (see app.bot.ratelimit.is_replayable)
+    replayable = False
+
+    def __init__(self, chunks: AsyncIterable[bytes], filename: str):
+        super().__init__(filename=filename)
+        self.chunks = chunks
+
+    async def read(self, bot: "Bot") -> AsyncGenerator[bytes, None]:
+        async for chunk in self.chunks:
+            yield chunk
@@ -2,10 +2,10 @@ from aiogram import Router, F
 from aiogram.types import CallbackQuery
 from aiogram.fsm.context import FSMContext
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 
 from app.models.user import User
-from app.models.wish import Wish, WishStatus
+from app.services import wishes as wish_service
+from app.services.user_stats import get_user_stats
 from app.bot.keyboards import (
     get_main_keyboard,
     get_groups_keyboard,
@@ -38,20 +38,15 @@ async def callback_add_wish(callback: CallbackQuery):
 async def callback_my_wishes(callback: CallbackQuery, session: AsyncSession, user: User):
     """Handle my wishes callback"""
     # Get wishes count
-    result = await session.execute(
-        select(Wish)
-        .where(Wish.user_id == user.id)
-        .where(Wish.status == WishStatus.ACTIVE)
-    )
-    wishes = result.scalars().all()
+    stats = await get_user_stats(session, user.id)
 
     wishes_text = f"📋 <b>Мой список желаний</b>\n\n"
 
-    if not wishes:
+    if not stats.active_count:
         wishes_text += "Список пуст. Добавь первое желание!\n\n"
         wishes_text += "Используй /add или открой Web App 👇"
     else:
-        wishes_text += f"Всего желаний: <b>{len(wishes)}</b>\n\n"
+        wishes_text += f"Всего желаний: <b>{stats.active_count}</b>\n\n"
         wishes_text += "Открой Web App для управления списком 👇"
 
     await callback.message.edit_text(
@@ -101,8 +96,10 @@ async def callback_join_group(callback: CallbackQuery):
 
 
 @router.callback_query(F.data == "settings")
-async def callback_settings(callback: CallbackQuery, user: User):
+async def callback_settings(callback: CallbackQuery, session: AsyncSession, user: User):
     """Handle settings callback"""
+    stats = await get_user_stats(session, user.id)
+
     settings_text = f"""
 ⚙️ <b>Настройки</b>
 
@@ -112,9 +109,9 @@ Username: {user.mention}
 Язык: {user.language_code.upper()}
 
 <b>Статистика:</b>
-Всего желаний: загрузка...
-Выполнено: загрузка...
-Групп: загрузка...
+Всего желаний: {stats.wishes_count}
+Выполнено: {stats.completed_count}
+Групп: {stats.group_count}
 
 Полные настройки доступны в Web App 👇
 """
@@ -135,19 +132,12 @@ async def callback_complete_wish(
     """Handle complete wish callback"""
     wish_id = int(callback.data.split(":")[1])
 
-    result = await session.execute(
-        select(Wish).where(
-            Wish.id == wish_id,
-            Wish.user_id == user.id
-        )
-    )
-    wish = result.scalar_one_or_none()
+    wish = await wish_service.complete_wish(session, user.id, wish_id)
 
     if not wish:
         await callback.answer("❌ Желание не найдено", show_alert=True)
         return
 
-    wish.status = WishStatus.COMPLETED
     await session.commit()
 
     await callback.answer("✅ Желание отмечено как выполненное!", show_alert=True)
@@ -166,23 +156,16 @@ async def callback_delete_wish(
     """Handle delete wish callback"""
     wish_id = int(callback.data.split(":")[1])
 
-    result = await session.execute(
-        select(Wish).where(
-            Wish.id == wish_id,
-            Wish.user_id == user.id
-        )
-    )
-    wish = result.scalar_one_or_none()
+    title = await wish_service.delete_wish(session, user.id, wish_id)
 
-    if not wish:
+    if title is None:
         await callback.answer("❌ Желание не найдено", show_alert=True)
         return
 
-    await session.delete(wish)
     await session.commit()
 
     await callback.answer("🗑 Желание удалено", show_alert=True)
     await callback.message.edit_text(
-        f"Желание <b>{wish.title}</b> удалено из списка.",
+        f"Желание <b>{title}</b> удалено из списка.",
         reply_markup=get_main_keyboard()
     )
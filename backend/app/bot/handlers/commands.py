@@ -1,16 +1,20 @@
 from aiogram import Router, F
-from aiogram.filters import Command, CommandStart
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.filters import Command, CommandObject, CommandStart
 from aiogram.types import Message
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select
 
 from app.models.user import User
-from app.models.wish import Wish, WishStatus
+from app.models.wish import Wish, WishStatus, WISH_LIST_ORDER
 from app.bot.keyboards import (
     get_main_keyboard,
     get_share_keyboard,
 )
+from app.bot.files import AsyncIterableInputFile
 from app.core.config import settings
+from app.services.export import EXPORT_FORMATS, export_wishes
+from app.services.user_stats import get_user_stats
 
 router = Router()
 
@@ -54,6 +58,7 @@ async def cmd_help(message: Message):
 /add - Быстро добавить желание
 /list - Показать мой список (топ-5)
 /share - Поделиться списком
+/export - Выгрузить все желания (CSV, или /export ndjson)
 /help - Эта справка
 
 <b>Как пользоваться:</b>
@@ -101,7 +106,7 @@ async def cmd_list(message: Message, session: AsyncSession, user: User):
         select(Wish)
         .where(Wish.user_id == user.id)
         .where(Wish.status == WishStatus.ACTIVE)
-        .order_by(Wish.priority.desc(), Wish.created_at.desc())
+        .order_by(*WISH_LIST_ORDER)
         .limit(5)
     )
     wishes = result.scalars().all()
@@ -115,12 +120,8 @@ async def cmd_list(message: Message, session: AsyncSession, user: User):
         return
 
     # Get total count
-    total_result = await session.execute(
-        select(func.count(Wish.id))
-        .where(Wish.user_id == user.id)
-        .where(Wish.status == WishStatus.ACTIVE)
-    )
-    total_count = total_result.scalar()
+    stats = await get_user_stats(session, user.id)
+    total_count = stats.active_count
 
     # Format wishes
     wishes_text = "🎁 <b>Твои желания (топ-5):</b>\n\n"
@@ -172,3 +173,34 @@ async def cmd_share(message: Message, user: User):
 """
 
     await message.answer(share_text, reply_markup=get_share_keyboard(user.id))
+
+
+@router.message(Command("export"))
+async def cmd_export(
+    message: Message,
+    command: CommandObject,
+    session: AsyncSession,
+    user: User
+):
+    """Handle /export command - send all wishes as a CSV or NDJSON file"""
+    export_format = (command.args or "csv").strip().lower()
+
+    if export_format not in EXPORT_FORMATS:
+        await message.answer(
+            "Формат не поддерживается. Используй /export csv или /export ndjson"
+        )
+        return
+
+    try:
+        await message.answer_document(
+            AsyncIterableInputFile(
+                export_wishes(session, user.id, export_format),
+                filename=f"wishes.{export_format}"
+            ),
+            caption="📦 Все твои желания"
+        )
+    except TelegramRetryAfter as e:
+        # The streamed file was consumed by the rejected upload
+        await message.answer(
+            f"Слишком много запросов, попробуй /export через {e.retry_after} сек."
+        )
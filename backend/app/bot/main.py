@@ -1,11 +1,12 @@
 import asyncio
 import logging
-from aiogram import Bot, Dispatcher
-from aiogram.enums import ParseMode
+from aiogram import Dispatcher
 
 from app.core.config import settings
 from app.bot.handlers import router
 from app.bot.middleware import DatabaseMiddleware
+from app.bot.queue import UpdateQueue, poll_updates
+from app.bot.session import create_bot
 
 logging.basicConfig(
     level=logging.INFO,
@@ -17,15 +18,14 @@ logger = logging.getLogger(__name__)
 async def main():
     """Main bot function"""
     # Initialize bot and dispatcher
-    bot = Bot(
-        token=settings.TELEGRAM_BOT_TOKEN,
-        parse_mode=ParseMode.HTML
-    )
+    bot = create_bot()
 
     dp = Dispatcher()
 
     # Register middleware
-    dp.update.middleware(DatabaseMiddleware())
+    database_middleware = DatabaseMiddleware()
+    dp.message.middleware(database_middleware)
+    dp.callback_query.middleware(database_middleware)
 
     # Register routers
     dp.include_router(router)
@@ -45,9 +45,20 @@ async def main():
             # Keep the script running
             await asyncio.Event().wait()
         else:
-            # Polling mode (for development)
+            # Polling mode (for development), in order per chat
             logger.info("Starting polling...")
-            await dp.start_polling(bot, allowed_updates=dp.resolve_used_update_types())
+            update_queue = UpdateQueue(
+                dp,
+                bot,
+                workers=settings.BOT_UPDATE_WORKERS,
+                maxsize=settings.BOT_UPDATE_QUEUE_SIZE,
+                chat_maxsize=settings.BOT_UPDATE_CHAT_QUEUE_SIZE
+            )
+            update_queue.start()
+            try:
+                await poll_updates(bot, update_queue, dp.resolve_used_update_types())
+            finally:
+                await update_queue.stop(timeout=settings.BOT_UPDATE_DRAIN_TIMEOUT)
 
     except Exception as e:
         logger.error(f"Error: {e}")
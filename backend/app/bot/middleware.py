@@ -1,15 +1,23 @@
-from typing import Callable, Dict, Any, Awaitable
+from typing import Callable, Dict, Any, Awaitable, Optional
 from aiogram import BaseMiddleware
+from aiogram.dispatcher.event.handler import HandlerObject
 from aiogram.types import TelegramObject, User as TelegramUser
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import AsyncSessionLocal
 from app.models.user import User
-from sqlalchemy import select
+from app.services.users import upsert_user
 
 
 class DatabaseMiddleware(BaseMiddleware):
-    """Middleware to provide database session"""
+    """
+    Middleware to provide database session and user
+
+    Must be registered as inner middleware (e.g. ``dp.message.middleware``)
+    so the matched handler is known. A session is opened and the user is
+    resolved only for handlers declaring ``session`` or ``user`` arguments;
+    static replies cost no database connection.
+    """
 
     async def __call__(
         self,
@@ -17,55 +25,46 @@ class DatabaseMiddleware(BaseMiddleware):
         event: TelegramObject,
         data: Dict[str, Any],
     ) -> Any:
+        needs_session, needs_user = self.resolve_needs(data.get("handler"))
+        if not needs_session:
+            return await handler(event, data)
+
         async with AsyncSessionLocal() as session:
             data["session"] = session
 
             # Get or create user
             telegram_user: TelegramUser = data.get("event_from_user")
-            if telegram_user:
+            if telegram_user and needs_user:
                 user = await self.get_or_create_user(session, telegram_user)
                 data["user"] = user
 
             return await handler(event, data)
 
+    @staticmethod
+    def resolve_needs(handler_object: Optional[HandlerObject]) -> tuple[bool, bool]:
+        """Get whether handler needs (session, user) from its signature"""
+        if handler_object is None or handler_object.varkw:
+            return True, True
+
+        needs_user = "user" in handler_object.params
+        needs_session = needs_user or "session" in handler_object.params
+        return needs_session, needs_user
+
     @staticmethod
     async def get_or_create_user(
         session: AsyncSession,
         telegram_user: TelegramUser
     ) -> User:
         """Get or create user from Telegram user data"""
-        result = await session.execute(
-            select(User).where(User.telegram_id == telegram_user.id)
+        user = await upsert_user(
+            session,
+            telegram_id=telegram_user.id,
+            first_name=telegram_user.first_name,
+            username=telegram_user.username,
+            last_name=telegram_user.last_name,
+            language_code=telegram_user.language_code,
+            is_premium=telegram_user.is_premium or False,
         )
-        user = result.scalar_one_or_none()
-
-        if not user:
-            user = User(
-                telegram_id=telegram_user.id,
-                username=telegram_user.username,
-                first_name=telegram_user.first_name,
-                last_name=telegram_user.last_name,
-                language_code=telegram_user.language_code or "ru",
-                is_premium=telegram_user.is_premium or False,
-            )
-            session.add(user)
-            await session.commit()
-            await session.refresh(user)
-        else:
-            # Update user info if changed
-            updated = False
-            if user.username != telegram_user.username:
-                user.username = telegram_user.username
-                updated = True
-            if user.first_name != telegram_user.first_name:
-                user.first_name = telegram_user.first_name
-                updated = True
-            if user.last_name != telegram_user.last_name:
-                user.last_name = telegram_user.last_name
-                updated = True
-
-            if updated:
-                await session.commit()
-                await session.refresh(user)
+        await session.commit()
 
         return user
@@ -0,0 +1,278 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Optional
+
+from aiogram import Bot, Dispatcher
+from aiogram.dispatcher.middlewares.user_context import UserContextMiddleware
+from aiogram.methods import GetUpdates
+from aiogram.types import Update
+from aiogram.utils.backoff import Backoff, BackoffConfig
+
+from app.bot.ratelimit import Priority, priority
+
+logger = logging.getLogger(__name__)
+
+# Retry delays for getUpdates failures (same as aiogram's polling)
+POLLING_BACKOFF = BackoffConfig(min_delay=1.0, max_delay=5.0, factor=1.3, jitter=0.1)
+
+
+class LatencyStats:
+    """Total count, maximum and percentiles of the most recent durations"""
+
+    def __init__(self, window: int = 1000):
+        self.count = 0
+        self.max = 0.0
+        self._recent: deque[float] = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        """Add a duration in seconds"""
+        self.count += 1
+        self.max = max(self.max, seconds)
+        self._recent.append(seconds)
+
+    def snapshot(self) -> dict[str, float]:
+        """Get stats in milliseconds"""
+        recent = sorted(self._recent)
+
+        def percentile(p: float) -> float:
+            if not recent:
+                return 0.0
+            return recent[min(len(recent) - 1, int(p * len(recent)))]
+
+        return {
+            "count": self.count,
+            "p50_ms": round(percentile(0.5) * 1000, 1),
+            "p95_ms": round(percentile(0.95) * 1000, 1),
+            "max_ms": round(self.max * 1000, 1),
+        }
+
+
+def update_order_key(update: Update) -> int:
+    """
+    Get key whose updates must be handled in order
+
+    Chat id if the update belongs to a chat, otherwise the user id. Updates
+    with neither have no ordering requirements.
+    """
+    chat, user, _ = UserContextMiddleware.resolve_event_context(update)
+    if chat:
+        return chat.id
+    if user:
+        return user.id
+    return update.update_id
+
+
+class UpdateQueue:
+    """
+    Bounded per-chat ordered queue of Telegram updates
+
+    Each chat (or user) with pending updates has its own FIFO; a pool of
+    workers takes ready chats round-robin, one update per turn. A chat is
+    held by at most one worker, so its updates run one at a time in arrival
+    order, while up to `workers` chats run in parallel and a slow chat
+    occupies a single worker instead of delaying unrelated chats. A chat's
+    FIFO is dropped as soon as it drains, so idle chats cost nothing.
+    Lets the webhook acknowledge an update as soon as it is validated, and
+    keeps rapid taps of one user (complete then delete) from racing.
+
+    Usage:
+        queue = UpdateQueue(dp, bot, workers=16, maxsize=1000, chat_maxsize=50)
+        queue.start()
+        queue.submit(update)  # False if full or stopping
+        await queue.put(update)  # waits for room instead
+        await queue.stop(timeout=25)
+    """
+
+    def __init__(
+        self,
+        dp: Dispatcher,
+        bot: Bot,
+        workers: int,
+        maxsize: int,
+        chat_maxsize: int
+    ):
+        self.dp = dp
+        self.bot = bot
+        self.workers = workers
+        # Bounds all queued updates, and those of one chat so that a busy
+        # chat cannot take all the room
+        self.maxsize = maxsize
+        self.chat_maxsize = chat_maxsize
+
+        # key -> pending (enqueued at, update), only for keys with pending
+        # updates or one being handled
+        self._chats: dict[int, deque[tuple[float, Update]]] = {}
+        # Keys with pending updates not held by a worker, each at most once
+        self._ready: asyncio.Queue[int] = asyncio.Queue()
+        self._size = 0
+        self._room = asyncio.Condition()
+        self._drained = asyncio.Event()
+        self._drained.set()
+        self._tasks: list[asyncio.Task] = []
+        self._accepting = False
+
+        self.processed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.queue_wait = LatencyStats()
+        self.handler_latency = LatencyStats()
+
+    def start(self) -> None:
+        """Start workers and accept updates"""
+        self._accepting = True
+        self._tasks = [
+            asyncio.create_task(self._work(), name=f"update-worker-{i}")
+            for i in range(self.workers)
+        ]
+
+    def _has_room(self, key: int) -> bool:
+        chat = self._chats.get(key)
+        return self._size < self.maxsize and (
+            chat is None or len(chat) < self.chat_maxsize
+        )
+
+    def _enqueue(self, key: int, update: Update) -> None:
+        chat = self._chats.get(key)
+        if chat is None:
+            # Not pending nor held by a worker
+            chat = self._chats[key] = deque()
+            self._ready.put_nowait(key)
+        chat.append((time.monotonic(), update))
+        self._size += 1
+        self._drained.clear()
+
+    def submit(self, update: Update) -> bool:
+        """
+        Enqueue update without waiting
+
+        Returns:
+            bool: False if the queue or the update's chat is full, or
+            shutting down
+        """
+        key = update_order_key(update)
+        if not self._accepting or not self._has_room(key):
+            self.rejected += 1
+            return False
+
+        self._enqueue(key, update)
+        return True
+
+    async def put(self, update: Update) -> None:
+        """Enqueue update, waiting for room in the queue and its chat"""
+        key = update_order_key(update)
+        async with self._room:
+            await self._room.wait_for(lambda: self._has_room(key))
+            self._enqueue(key, update)
+
+    async def _work(self) -> None:
+        while True:
+            key = await self._ready.get()
+            chat = self._chats[key]
+            enqueued_at, update = chat.popleft()
+            started_at = time.monotonic()
+            self.queue_wait.record(started_at - enqueued_at)
+
+            try:
+                # Replies to the update go ahead of queued notifications
+                with priority(Priority.INTERACTIVE):
+                    await self.dp.feed_update(self.bot, update)
+                self.processed += 1
+            except Exception:
+                self.failed += 1
+                logger.exception(f"Failed to process update {update.update_id}")
+            finally:
+                self.handler_latency.record(time.monotonic() - started_at)
+
+                # Back in line behind other ready chats, or forgotten
+                if chat:
+                    self._ready.put_nowait(key)
+                else:
+                    del self._chats[key]
+
+                self._size -= 1
+                if not self._size:
+                    self._drained.set()
+                async with self._room:
+                    self._room.notify_all()
+
+    def qsize(self) -> int:
+        """Get number of queued updates, including those being handled"""
+        return self._size
+
+    async def stop(self, timeout: float) -> None:
+        """
+        Stop accepting updates, drain the queue and stop workers
+
+        Updates still queued after timeout seconds are dropped (with the
+        webhook they were already acknowledged to Telegram).
+        """
+        self._accepting = False
+
+        try:
+            await asyncio.wait_for(self._drained.wait(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"Dropping {self.qsize()} updates not processed within {timeout}s"
+            )
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def metrics(self) -> dict:
+        """Get queue depth, counters and latency stats"""
+        return {
+            "queue_depth": self.qsize(),
+            "queue_size": self.maxsize,
+            "chats": len(self._chats),
+            "busiest_chat_depth": max(map(len, self._chats.values()), default=0),
+            "workers": len(self._tasks),
+            "processed": self.processed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "queue_wait": self.queue_wait.snapshot(),
+            "handler_latency": self.handler_latency.snapshot(),
+        }
+
+
+async def poll_updates(
+    bot: Bot,
+    queue: UpdateQueue,
+    allowed_updates: Optional[list[str]] = None,
+    polling_timeout: int = 30
+) -> None:
+    """
+    Long-poll getUpdates and hand updates over to the queue
+
+    Used instead of Dispatcher.start_polling, which runs every update as
+    an independent task and so does not keep per-chat order. Waits for
+    room when the queue or the chat is full, so Telegram keeps unconfirmed
+    updates meanwhile.
+    Network and API errors are retried with backoff.
+    """
+    backoff = Backoff(config=POLLING_BACKOFF)
+    get_updates = GetUpdates(timeout=polling_timeout, allowed_updates=allowed_updates)
+
+    # Wait longer than the long poll itself to avoid false timeouts
+    request_timeout = int(bot.session.timeout + polling_timeout)
+
+    while True:
+        try:
+            updates = await bot(get_updates, request_timeout=request_timeout)
+        except Exception as e:
+            logger.error(
+                f"Failed to fetch updates - {type(e).__name__}: {e}, "
+                f"retrying in {backoff.next_delay:.1f}s"
+            )
+            await backoff.asleep()
+            continue
+
+        backoff.reset()
+
+        for update in updates:
+            await queue.put(update)
+            # Confirms the update on the next getUpdates call
+            get_updates.offset = update.update_id + 1
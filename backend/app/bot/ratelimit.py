@@ -0,0 +1,287 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Any, Iterator, Optional, Union
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import Response, TelegramMethod
+from aiogram.methods.base import TelegramType
+from aiogram.types import InputFile
+from pydantic import BaseModel
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Idle per-chat buckets are pruned once there are more than this many
+MAX_IDLE_CHAT_BUCKETS = 10_000
+
+
+class Priority(IntEnum):
+    """Outbound request priority, lower values are sent first"""
+    INTERACTIVE = 0  # replies to the user's own actions
+    NOTIFICATION = 1  # messages sent on the bot's own initiative
+
+
+# Update handling sets INTERACTIVE (see app.bot.queue), anything sent
+# outside of an update is a notification
+request_priority: ContextVar[Priority] = ContextVar(
+    "request_priority", default=Priority.NOTIFICATION
+)
+
+
+@contextmanager
+def priority(value: Priority) -> Iterator[None]:
+    """
+    Send Bot API requests made inside the block with the given priority
+
+    Usage:
+        with priority(Priority.INTERACTIVE):
+            await dp.feed_update(bot, update)
+    """
+    token = request_priority.set(value)
+    try:
+        yield
+    finally:
+        request_priority.reset(token)
+
+
+class TokenBucket:
+    """
+    Token bucket whose waiters are served by priority, then arrival order
+
+    Not thread-safe: intended to be used from a single event loop.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._serving: Optional[asyncio.Task] = None
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        # _updated is in the future while paused
+        if now > self._updated:
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def _delay(self) -> float:
+        """Get seconds until a token is available, 0 if it is now"""
+        self._refill()
+        now = time.monotonic()
+        if now < self._updated:
+            return self._updated - now
+        if self._tokens >= 1:
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+    @property
+    def idle(self) -> bool:
+        """Whether the bucket is full and nobody waits, i.e. can be dropped"""
+        self._refill()
+        return not self._waiters and self._tokens >= self.capacity
+
+    async def acquire(self, priority: int = Priority.NOTIFICATION) -> bool:
+        """
+        Take a token, waiting for one if needed
+
+        Returns:
+            bool: Whether the caller had to wait
+        """
+        if not self._waiters and self._delay() == 0:
+            self._tokens -= 1
+            return False
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        if self._serving is None or self._serving.done():
+            self._serving = asyncio.create_task(self._serve())
+
+        await future
+        return True
+
+    async def _serve(self) -> None:
+        while self._waiters:
+            delay = self._delay()
+            if delay > 0:
+                # Waiters arriving meanwhile are ordered by priority too
+                await asyncio.sleep(delay)
+                continue
+
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                # Waiter was cancelled
+                continue
+
+            self._tokens -= 1
+            future.set_result(None)
+
+    def pause(self, seconds: float) -> None:
+        """Give out no tokens for the given time (Telegram's retry_after)"""
+        self._refill()
+        self._tokens = 0
+        self._updated = max(self._updated, time.monotonic() + seconds)
+
+
+class BotRateLimiter:
+    """
+    Outbound Bot API limits: global, per private chat and per group chat
+
+    Defaults follow Telegram's guidance of about 30 messages per second
+    overall, one per second in a chat and 20 per minute in a group.
+    """
+
+    def __init__(
+        self,
+        global_rate: float,
+        chat_rate: float,
+        group_rate: float,
+        chat_burst: int
+    ):
+        self.chat_rate = chat_rate
+        self.group_rate = group_rate
+        self.chat_burst = chat_burst
+
+        self.global_bucket = TokenBucket(global_rate, max(1.0, global_rate))
+        self._chat_buckets: dict[Union[int, str], TokenBucket] = {}
+
+        self.delayed = 0
+        self.retried = 0
+
+    def _chat_bucket(self, chat_id: Union[int, str]) -> TokenBucket:
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            if len(self._chat_buckets) >= MAX_IDLE_CHAT_BUCKETS:
+                self._chat_buckets = {
+                    key: value
+                    for key, value in self._chat_buckets.items()
+                    if not value.idle
+                }
+
+            # Groups, supergroups and channels have negative ids or @usernames
+            is_group = isinstance(chat_id, str) or chat_id < 0
+            rate = self.group_rate if is_group else self.chat_rate
+            bucket = self._chat_buckets[chat_id] = TokenBucket(rate, self.chat_burst)
+
+        return bucket
+
+    async def acquire(
+        self,
+        chat_id: Union[int, str],
+        priority: Priority = Priority.NOTIFICATION
+    ) -> None:
+        """Wait until a message may be sent to the chat"""
+        delayed = await self._chat_bucket(chat_id).acquire(priority)
+        delayed = await self.global_bucket.acquire(priority) or delayed
+        if delayed:
+            self.delayed += 1
+
+    def pause(self, chat_id: Optional[Union[int, str]], seconds: float) -> None:
+        """
+        Hold messages after Telegram's flood control
+
+        retry_after does not say which limit was hit, so all chats wait,
+        and the chat of the rejected request (if any) at least as long.
+        """
+        self.global_bucket.pause(seconds)
+        if chat_id is not None:
+            self._chat_bucket(chat_id).pause(seconds)
+
+    def metrics(self) -> dict:
+        """Get counters of throttled and retried requests"""
+        return {
+            "delayed": self.delayed,
+            "retried": self.retried,
+            "chat_buckets": len(self._chat_buckets),
+        }
+
+
+bot_rate_limiter = BotRateLimiter(
+    global_rate=settings.BOT_API_GLOBAL_RATE,
+    chat_rate=settings.BOT_API_CHAT_RATE,
+    group_rate=settings.BOT_API_GROUP_RATE,
+    chat_burst=settings.BOT_API_CHAT_BURST,
+)
+
+
+def _input_files(value: Any) -> Iterator[InputFile]:
+    """Find input files in a method's fields, including inside media lists"""
+    if isinstance(value, InputFile):
+        yield value
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _input_files(item)
+    elif isinstance(value, BaseModel):
+        for name in value.model_fields:
+            yield from _input_files(getattr(value, name))
+
+
+def is_replayable(method: TelegramMethod) -> bool:
+    """Whether the request can be sent again, i.e. its files can be re-read"""
+    return all(
+        getattr(input_file, "replayable", True)
+        for input_file in _input_files(method)
+    )
+
+
+class RateLimitMiddleware(BaseRequestMiddleware):
+    """
+    Bot session middleware applying BotRateLimiter to outgoing requests
+
+    Methods addressed to a chat (sending, editing, deleting messages) wait
+    for the chat's and the global bucket, in order of request_priority,
+    then arrival. Flood control pauses the buckets for retry_after, and the
+    rejected request is retried after it unless it uploads a file that can
+    only be read once.
+    """
+
+    def __init__(self, limiter: BotRateLimiter, max_retries: int):
+        self.limiter = limiter
+        self.max_retries = max_retries
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        chat_id = getattr(method, "chat_id", None)
+        retries = 0
+
+        while True:
+            if chat_id is not None:
+                await self.limiter.acquire(chat_id, request_priority.get())
+
+            try:
+                return await make_request(bot, method)
+            except TelegramRetryAfter as e:
+                # Hold other requests whether or not this one is retried
+                self.limiter.pause(chat_id, e.retry_after)
+
+                if retries >= self.max_retries or not is_replayable(method):
+                    raise
+                retries += 1
+
+                self.limiter.retried += 1
+                logger.warning(
+                    f"Flood control on {type(method).__name__}, "
+                    f"retrying in {e.retry_after}s"
+                )
+                if chat_id is None:
+                    # Not throttled by the buckets
+                    await asyncio.sleep(e.retry_after)
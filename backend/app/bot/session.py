@@ -0,0 +1,38 @@
+from typing import Any
+
+from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.enums import ParseMode
+
+from app.bot.ratelimit import RateLimitMiddleware, bot_rate_limiter
+from app.core.config import settings
+
+
+class PooledAiohttpSession(AiohttpSession):
+    """AiohttpSession with a tuned connection pool to api.telegram.org"""
+
+    def __init__(self, limit: int, keepalive_timeout: float, **kwargs: Any):
+        super().__init__(**kwargs)
+        # aiogram has no public option for connector settings
+        self._connector_init.update(
+            limit=limit,
+            keepalive_timeout=keepalive_timeout,
+            ttl_dns_cache=300,
+        )
+
+
+def create_bot() -> Bot:
+    """Create bot with a pooled, rate limited API session"""
+    session = PooledAiohttpSession(
+        limit=settings.BOT_API_CONNECTION_LIMIT,
+        keepalive_timeout=settings.BOT_API_KEEPALIVE_TIMEOUT,
+    )
+    session.middleware(
+        RateLimitMiddleware(bot_rate_limiter, max_retries=settings.BOT_API_MAX_RETRIES)
+    )
+
+    return Bot(
+        token=settings.TELEGRAM_BOT_TOKEN,
+        parse_mode=ParseMode.HTML,
+        session=session
+    )
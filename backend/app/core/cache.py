@@ -0,0 +1,107 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class TTLCache:
+    """
+    Bounded in-process LRU cache with per-entry expiry
+
+    Not thread-safe: intended to be used from a single event loop.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get value by key, dropping it if expired"""
+        item = self._data.get(key)
+        if item is None:
+            return default
+
+        expires_at, value = item
+        if expires_at <= time.time():
+            del self._data[key]
+            return default
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        expires_at: Optional[float] = None
+    ) -> None:
+        """
+        Store value
+
+        Args:
+            key: Cache key
+            value: Value to store
+            expires_at: Absolute unix timestamp of expiry,
+                defaults to now + ttl
+        """
+        if expires_at is None:
+            expires_at = time.time() + (self.ttl if self.ttl is not None else float("inf"))
+
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove key and return its value"""
+        item = self._data.pop(key, None)
+        return default if item is None else item[1]
+
+    def clear(self) -> None:
+        """Remove all entries"""
+        self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+_MISSING = object()
+
+
+class RequestCoalescer:
+    """
+    Share one in-flight call per key between concurrent callers
+
+    The first caller for a key starts the call as a task, callers arriving
+    before it finishes await the same task. Cancelling a caller does not
+    cancel the shared call.
+    """
+
+    def __init__(self):
+        self._calls: dict[Hashable, asyncio.Task] = {}
+
+    async def run(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """Await func() or the call already in flight for key"""
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Mark the exception retrieved in case every caller went away
+            task.exception()
+
+    def __len__(self) -> int:
+        return len(self._calls)
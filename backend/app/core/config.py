@@ -21,12 +21,29 @@ class Settings(BaseSettings):
     # Telegram
     TELEGRAM_BOT_TOKEN: str
     TELEGRAM_BOT_WEBHOOK_URL: Optional[str] = None
+    BOT_UPDATE_WORKERS: int = 16  # chats handled in parallel, each in order
+    BOT_UPDATE_QUEUE_SIZE: int = 1000
+    BOT_UPDATE_CHAT_QUEUE_SIZE: int = 50  # pending updates of one chat
+    BOT_UPDATE_DRAIN_TIMEOUT: int = 25  # seconds to finish queued updates on shutdown
+
+    # Outbound Bot API requests (per process)
+    BOT_API_GLOBAL_RATE: float = 30  # messages per second
+    BOT_API_CHAT_RATE: float = 1  # messages per second in a private chat
+    BOT_API_GROUP_RATE: float = 20 / 60  # messages per second in a group chat
+    BOT_API_CHAT_BURST: int = 3
+    BOT_API_MAX_RETRIES: int = 3  # after flood control (retry_after)
+    BOT_API_CONNECTION_LIMIT: int = 100
+    BOT_API_KEEPALIVE_TIMEOUT: int = 60  # seconds
+    METRICS_TOKEN: Optional[str] = None  # X-Metrics-Token for /metrics, disabled if unset
     WEB_APP_URL: str = "http://localhost:3000"
     API_URL: str = "http://localhost:8000"
 
     # Security
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 days
+    SESSION_TOKEN_EXPIRE_MINUTES: int = 60
     ALGORITHM: str = "HS256"
+    INIT_DATA_MAX_AGE: int = 3600  # 1 hour
+    INIT_DATA_CACHE_SIZE: int = 1024
 
     # CORS
     BACKEND_CORS_ORIGINS: list[str] = [
@@ -45,6 +62,22 @@ class Settings(BaseSettings):
     DEFAULT_PAGE_SIZE: int = 20
     MAX_PAGE_SIZE: int = 100
 
+    # Batch operations
+    MAX_BATCH_SIZE: int = 500
+
+    # Group role cache (per process)
+    GROUP_ROLE_CACHE_TTL: int = 60  # seconds
+    GROUP_ROLE_CACHE_SIZE: int = 4096
+
+    # Profile cache (per process)
+    PROFILE_CACHE_TTL: int = 30  # seconds
+    PROFILE_CACHE_SIZE: int = 4096
+
+    # Public wishlist (shared links)
+    PUBLIC_WISHES_MAX_AGE: int = 60  # seconds, Cache-Control for clients/proxies
+    PUBLIC_WISHES_CACHE_TTL: int = 300  # seconds, rendered pages per process
+    PUBLIC_WISHES_CACHE_SIZE: int = 1024
+
     # External services (optional)
     CLOUDINARY_URL: Optional[str] = None
     SENTRY_DSN: Optional[str] = None
@@ -0,0 +1,83 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Sequence
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, or_, tuple_
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import ColumnElement, UnaryExpression
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode sort key tuple into an opaque cursor"""
+    payload = [
+        value.isoformat() if isinstance(value, datetime) else value
+        for value in values
+    ]
+    raw = json.dumps(payload, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, types: Sequence[type]) -> list[Any]:
+    """
+    Decode cursor produced by encode_cursor
+
+    Args:
+        cursor: Opaque cursor string
+        types: Expected type of each sort key value (int, str, datetime)
+
+    Raises:
+        HTTPException: If cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError("Cursor size mismatch")
+        return [
+            datetime.fromisoformat(value) if type_ is datetime else type_(value)
+            for type_, value in zip(types, values)
+        ]
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def keyset_after(
+    order_by: Sequence[UnaryExpression],
+    values: Sequence[Any]
+) -> ColumnElement[bool]:
+    """
+    Build seek predicate for rows strictly after the given sort key
+
+    Uses a single row-value comparison when all columns share a direction,
+    otherwise expands it into the equivalent OR chain. The chain is prefixed
+    with an inclusive bound on the first column, which an index on the
+    ordering can use as the start of a range scan.
+
+    Args:
+        order_by: Ordering clauses, e.g. [Wish.priority.desc(), Wish.id.asc()]
+        values: Sort key values of the last row seen
+    """
+    columns = [clause.element for clause in order_by]
+    descending = [clause.modifier is operators.desc_op for clause in order_by]
+
+    if all(descending) or not any(descending):
+        row = tuple_(*columns)
+        key = tuple_(*values)
+        return row < key if descending[0] else row > key
+
+    clauses = []
+    for i, (column, value) in enumerate(zip(columns, values)):
+        step = column < value if descending[i] else column > value
+        clauses.append(and_(
+            *(columns[j] == values[j] for j in range(i)),
+            step
+        ))
+
+    # Redundant for the result, but sargable unlike the OR chain
+    leading_bound = columns[0] <= values[0] if descending[0] else columns[0] >= values[0]
+    return and_(leading_bound, or_(*clauses))
@@ -0,0 +1,28 @@
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+def json_default(obj: Any) -> Any:
+    """Serialize types orjson does not support natively"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson
+
+    Used as the default response class of the app. Endpoints with a
+    response_model hand it data already serialized by pydantic.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=json_default,
+            option=orjson.OPT_NON_STR_KEYS
+        )
@@ -10,6 +10,14 @@ from fastapi import HTTPException, status
 from app.core.config import settings
 
 
+# Secret key for Web App data, derived from the bot token once at startup
+WEB_APP_SECRET_KEY = hmac.new(
+    key="WebAppData".encode(),
+    msg=settings.TELEGRAM_BOT_TOKEN.encode(),
+    digestmod=hashlib.sha256
+).digest()
+
+
 def verify_telegram_web_app_data(init_data: str) -> dict:
     """
     Verify Telegram Web App initData signature
@@ -39,16 +47,9 @@ def verify_telegram_web_app_data(init_data: str) -> dict:
         data_check_arr = [f"{k}={v}" for k, v in sorted(parsed_data.items())]
         data_check_string = '\n'.join(data_check_arr)
 
-        # Create secret key
-        secret_key = hmac.new(
-            key="WebAppData".encode(),
-            msg=settings.TELEGRAM_BOT_TOKEN.encode(),
-            digestmod=hashlib.sha256
-        ).digest()
-
         # Calculate hash
         calculated_hash = hmac.new(
-            key=secret_key,
+            key=WEB_APP_SECRET_KEY,
             msg=data_check_string.encode(),
             digestmod=hashlib.sha256
         ).hexdigest()
@@ -60,11 +61,11 @@ def verify_telegram_web_app_data(init_data: str) -> dict:
                 detail="Invalid hash"
             )
 
-        # Check auth_date (data should not be older than 1 hour)
+        # Check auth_date (data should not be older than INIT_DATA_MAX_AGE)
         auth_date = int(parsed_data.get('auth_date', 0))
         current_timestamp = int(datetime.utcnow().timestamp())
 
-        if current_timestamp - auth_date > 3600:
+        if current_timestamp - auth_date > settings.INIT_DATA_MAX_AGE:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Init data is too old"
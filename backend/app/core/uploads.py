@@ -0,0 +1,160 @@
+from typing import AsyncIterator, Optional
+
+from fastapi import HTTPException, Request, status
+from multipart.exceptions import MultipartParseError
+from multipart.multipart import MultipartParser, parse_options_header
+
+from app.core.config import settings
+
+
+class MultipartFileStream:
+    """
+    Stream a single file field of a multipart/form-data request
+
+    Unlike UploadFile the request body is not spooled before the endpoint
+    runs: file data is yielded as it arrives and the request is rejected
+    with 413 as soon as the body exceeds max_size. Other form fields are
+    ignored. The stream can be consumed once.
+
+    Usage:
+        upload = await MultipartFileStream(request).open()
+        upload.filename
+        async for chunk in upload:
+            ...
+    """
+
+    def __init__(
+        self,
+        request: Request,
+        field_name: str = "file",
+        max_size: int = settings.MAX_UPLOAD_SIZE
+    ):
+        self.request = request
+        self.field_name = field_name
+        self.max_size = max_size
+        self.filename: Optional[str] = None
+
+        self._stream = self._parse()
+        self._pending: list[bytes] = []
+        self._chunks: list[bytes] = []
+        self._header_name = b""
+        self._header_value = b""
+        self._disposition = b""
+        self._in_file = False
+        self._file_done = False
+
+    def _too_large(self) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Upload too large (max {self.max_size} bytes)"
+        )
+
+    # Parser callbacks
+
+    def _on_part_begin(self) -> None:
+        self._disposition = b""
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_name += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def _on_header_end(self) -> None:
+        if self._header_name.lower() == b"content-disposition":
+            self._disposition = self._header_value
+        self._header_name = b""
+        self._header_value = b""
+
+    def _on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._disposition)
+        self._in_file = (
+            not self._file_done
+            and b"filename" in options
+            and options.get(b"name") == self.field_name.encode()
+        )
+        if self._in_file:
+            self.filename = options[b"filename"].decode("utf-8", "replace")
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._in_file:
+            self._chunks.append(data[start:end])
+
+    def _on_part_end(self) -> None:
+        if self._in_file:
+            self._in_file = False
+            self._file_done = True
+
+    async def _parse(self) -> AsyncIterator[bytes]:
+        content_type, params = parse_options_header(
+            self.request.headers.get("content-type", "")
+        )
+        if content_type != b"multipart/form-data" or b"boundary" not in params:
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail="Expected multipart/form-data"
+            )
+
+        content_length = self.request.headers.get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > self.max_size:
+            raise self._too_large()
+
+        parser = MultipartParser(params[b"boundary"], {
+            "on_part_begin": self._on_part_begin,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end,
+        })
+
+        received = 0
+        try:
+            async for chunk in self.request.stream():
+                received += len(chunk)
+                if received > self.max_size:
+                    raise self._too_large()
+
+                parser.write(chunk)
+                if self.filename is not None:
+                    # Empty chunk still signals that the file part has started
+                    data = b"".join(self._chunks)
+                    self._chunks.clear()
+                    yield data
+            parser.finalize()
+        except MultipartParseError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Malformed multipart body"
+            )
+
+    async def open(self) -> "MultipartFileStream":
+        """
+        Read the body up to the start of the file part, setting filename
+
+        Raises:
+            HTTPException: If the file field is missing or the body is
+                malformed or too large
+        """
+        async for data in self._stream:
+            self._pending.append(data)
+            break
+
+        if self.filename is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"File field '{self.field_name}' is required"
+            )
+
+        return self
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        for data in self._pending:
+            if data:
+                yield data
+        self._pending.clear()
+
+        async for data in self._stream:
+            if data:
+                yield data
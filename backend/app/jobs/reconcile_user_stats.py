@@ -0,0 +1,33 @@
+import asyncio
+import logging
+
+from sqlalchemy import select
+
+from app.core.database import AsyncSessionLocal
+from app.models.user import User
+from app.services.user_stats import reconcile_user_stats
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+async def main():
+    """Reconcile user_stats with source tables (run periodically, e.g. cron)"""
+    corrected = 0
+    async with AsyncSessionLocal() as session:
+        user_ids = (await session.scalars(select(User.id).order_by(User.id))).all()
+        await session.commit()
+
+        # One transaction per user: each holds that user's stats row lock
+        for user_id in user_ids:
+            corrected += await reconcile_user_stats(session, user_id)
+            await session.commit()
+
+    logger.info(f"User stats reconciled, {corrected} rows corrected")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
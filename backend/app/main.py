@@ -1,16 +1,21 @@
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Header, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 import logging
+import secrets
+from typing import Optional
 
-from aiogram import Bot, Dispatcher
-from aiogram.enums import ParseMode
+from aiogram import Dispatcher
 from aiogram.types import Update
 
 from app.core.config import settings
-from app.api import wishes, users, groups
+from app.core.responses import ORJSONResponse
+from app.api import auth, wishes, users, groups
 from app.bot.handlers import router as bot_router
 from app.bot.middleware import DatabaseMiddleware
+from app.bot.queue import UpdateQueue
+from app.bot.ratelimit import bot_rate_limiter
+from app.bot.session import create_bot
 
 # Configure logging
 logging.basicConfig(
@@ -20,10 +25,21 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # Initialize bot and dispatcher once at module level
-bot = Bot(token=settings.TELEGRAM_BOT_TOKEN, parse_mode=ParseMode.HTML)
+bot = create_bot()
 dp = Dispatcher()
 dp.include_router(bot_router)
-dp.update.middleware(DatabaseMiddleware())
+database_middleware = DatabaseMiddleware()
+dp.message.middleware(database_middleware)
+dp.callback_query.middleware(database_middleware)
+
+# Webhook updates are handled in the background, in order per chat
+update_queue = UpdateQueue(
+    dp,
+    bot,
+    workers=settings.BOT_UPDATE_WORKERS,
+    maxsize=settings.BOT_UPDATE_QUEUE_SIZE,
+    chat_maxsize=settings.BOT_UPDATE_CHAT_QUEUE_SIZE
+)
 
 # Create FastAPI app
 app = FastAPI(
@@ -32,6 +48,7 @@ app = FastAPI(
     docs_url="/docs" if settings.is_development else None,
     redoc_url="/redoc" if settings.is_development else None,
     redirect_slashes=False,  # Don't redirect /api/wishes to /api/wishes/
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS - allow all origins for Telegram Web App
@@ -70,6 +87,12 @@ async def health_check():
 
 
 # Include API routers
+app.include_router(
+    auth.router,
+    prefix=f"{settings.API_V1_STR}/auth",
+    tags=["auth"]
+)
+
 app.include_router(
     wishes.router,
     prefix=f"{settings.API_V1_STR}/wishes",
@@ -89,27 +112,63 @@ app.include_router(
 )
 
 
+# Metrics
+@app.get("/metrics")
+async def metrics(x_metrics_token: Optional[str] = Header(None)):
+    """
+    Webhook queue and outbound Bot API throttling stats
+
+    Not found unless METRICS_TOKEN is configured, then the token must be
+    sent in the X-Metrics-Token header.
+    """
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+    if not x_metrics_token or not secrets.compare_digest(
+        x_metrics_token.encode(), settings.METRICS_TOKEN.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token"
+        )
+
+    return {
+        "webhook": update_queue.metrics(),
+        "bot_api": bot_rate_limiter.metrics(),
+    }
+
+
 # Webhook endpoint for Telegram bot
 @app.post("/api/webhook")
 async def telegram_webhook(request: Request):
-    """Telegram webhook endpoint"""
+    """
+    Telegram webhook endpoint
+
+    Validates and enqueues the update, then acknowledges it right away.
+    Handlers run on update_queue workers. When the queue or the chat's
+    pending updates are full Telegram gets 503 and delivers the update
+    again later.
+    """
     try:
-        # Get update data
         data = await request.json()
+        update = Update.model_validate(data, context={"bot": bot})
+    except ValueError as e:
+        logger.warning(f"Invalid webhook update: {e}")
+        return JSONResponse(
+            status_code=400,
+            content={"error": "Invalid update"}
+        )
 
-        # Process update using global bot and dispatcher
-        update = Update(**data)
-        await dp.feed_update(bot, update)
-
-        return {"ok": True}
-
-    except Exception as e:
-        logger.error(f"Webhook error: {e}", exc_info=True)
+    if not update_queue.submit(update):
+        logger.warning(f"Update queue is full or stopping, rejected update {update.update_id}")
         return JSONResponse(
-            status_code=500,
-            content={"error": str(e)}
+            status_code=503,
+            content={"error": "Update queue is full"},
+            headers={"Retry-After": "1"}
         )
 
+    return {"ok": True}
+
 
 # Startup event
 @app.on_event("startup")
@@ -119,6 +178,8 @@ async def startup_event():
     logger.info(f"Environment: {settings.ENVIRONMENT}")
     logger.info(f"Web App URL: {settings.WEB_APP_URL}")
 
+    update_queue.start()
+
 
 # Shutdown event
 @app.on_event("shutdown")
@@ -126,6 +187,10 @@ async def shutdown_event():
     """Shutdown event"""
     logger.info("Shutting down...")
 
+    # Finish updates that were already acknowledged to Telegram
+    await update_queue.stop(timeout=settings.BOT_UPDATE_DRAIN_TIMEOUT)
+    await bot.session.close()
+
 
 if __name__ == "__main__":
     import uvicorn
@@ -4,6 +4,7 @@ from app.models.category import Category
 from app.models.group import Group, GroupMember
 from app.models.reservation import Reservation
 from app.models.notification import Notification
+from app.models.user_stats import UserStats
 
 __all__ = [
     "User",
@@ -13,4 +14,5 @@ __all__ = [
     "GroupMember",
     "Reservation",
     "Notification",
+    "UserStats",
 ]
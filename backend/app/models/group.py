@@ -17,6 +17,14 @@ class GroupRole(str, enum.Enum):
     MEMBER = "member"
 
 
+# Privilege level of each role, a higher role includes lower ones
+GROUP_ROLE_RANK = {
+    GroupRole.MEMBER: 0,
+    GroupRole.ADMIN: 1,
+    GroupRole.OWNER: 2,
+}
+
+
 class Group(Base):
     """Group model"""
     __tablename__ = "groups"
@@ -37,6 +45,10 @@ class Group(Base):
 
     is_active = Column(Boolean, default=True)
 
+    # Bumped on any change to the group or its membership, used with
+    # members' and reservations' versions for ETags (see app.services.versions)
+    version = Column(BigInteger, nullable=False, default=0, server_default="0")
+
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
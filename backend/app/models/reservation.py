@@ -1,4 +1,6 @@
-from sqlalchemy import Column, BigInteger, Text, DateTime, ForeignKey
+from sqlalchemy import (
+    Column, BigInteger, Text, DateTime, ForeignKey, Index, UniqueConstraint
+)
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -6,17 +8,36 @@ from app.core.database import Base
 
 
 class Reservation(Base):
-    """Reservation model - when someone reserves a gift"""
+    """
+    Reservation model - when someone reserves a gift
+
+    Cancelled reservations are kept (cancelled_at is set) so the group's
+    data version still changes, see app.services.versions. The row keeps
+    holding the (wish_id, group_id) slot and is revived by the next
+    reservation of the wish.
+    """
     __tablename__ = "reservations"
 
     id = Column(BigInteger, primary_key=True, index=True)
-    wish_id = Column(BigInteger, ForeignKey("wishes.id"), nullable=False, index=True)
-    group_id = Column(BigInteger, ForeignKey("groups.id"), nullable=False, index=True)
+    wish_id = Column(BigInteger, ForeignKey("wishes.id"), nullable=False)
+    group_id = Column(BigInteger, ForeignKey("groups.id"), nullable=False)
     reserved_by = Column(BigInteger, ForeignKey("users.id"), nullable=False, index=True)
 
     notes = Column(Text, nullable=True)  # Private notes for the person reserving
 
+    # Taken from the global reservation_versions sequence on every write
+    # (PostgreSQL trigger, see app.models.user_stats)
+    version = Column(BigInteger, nullable=False, default=0, server_default="0")
+
     reserved_at = Column(DateTime(timezone=True), server_default=func.now())
+    cancelled_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # One reservation per wish within a group; also serves wish_id lookups
+        UniqueConstraint("wish_id", "group_id", name="uq_reservations_wish_group"),
+        # Group lookups and max(version) per group
+        Index("ix_reservations_group_version", group_id, version),
+    )
 
     # Relationships
     wish = relationship("Wish", back_populates="reservations")
@@ -25,3 +46,8 @@ class Reservation(Base):
 
     def __repr__(self):
         return f"<Reservation wish={self.wish_id} by={self.reserved_by}>"
+
+    @property
+    def is_active(self) -> bool:
+        """Check if reservation is not cancelled"""
+        return self.cancelled_at is None
@@ -0,0 +1,288 @@
+from sqlalchemy import Column, BigInteger, Integer, DateTime, ForeignKey, JSON, DDL, event
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class UserStats(Base):
+    """
+    Per-user wish and membership statistics
+
+    Maintained by database triggers on wishes and group_members, so every
+    write path (ORM, bulk statements, bot) keeps it in sync within the same
+    transaction. See app.services.user_stats for reconciliation.
+    """
+    __tablename__ = "user_stats"
+
+    user_id = Column(
+        BigInteger,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+
+    active_count = Column(Integer, nullable=False, default=0, server_default="0")
+    completed_count = Column(Integer, nullable=False, default=0, server_default="0")
+    cancelled_count = Column(Integer, nullable=False, default=0, server_default="0")
+    group_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # Sum of active wish prices per currency, e.g. {"RUB": 1500.0}
+    price_totals = Column(
+        JSON().with_variant(JSONB(), "postgresql"),
+        nullable=False,
+        default=dict,
+        server_default="{}"
+    )
+
+    # Bumped on every write to the user's wishes or memberships, used for ETags
+    version = Column(BigInteger, nullable=False, default=0, server_default="0")
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<UserStats user={self.user_id} active={self.active_count}>"
+
+    @property
+    def wishes_count(self) -> int:
+        """Get count of wishes in any status"""
+        return self.active_count + self.completed_count + self.cancelled_count
+
+
+# Trigger functions and triggers (PostgreSQL). Mirrored by the
+# add_user_stats migration.
+USER_STATS_DDL = [
+    """
+    CREATE OR REPLACE FUNCTION user_stats_apply_wish(
+        p_user_id bigint, p_status wishstatus, p_price numeric,
+        p_currency varchar, p_sign integer
+    ) RETURNS void AS $$
+    DECLARE
+        v_active integer := CASE WHEN p_status = 'ACTIVE' THEN p_sign ELSE 0 END;
+        v_completed integer := CASE WHEN p_status = 'COMPLETED' THEN p_sign ELSE 0 END;
+        v_cancelled integer := CASE WHEN p_status = 'CANCELLED' THEN p_sign ELSE 0 END;
+        v_currency text := coalesce(p_currency, 'RUB');
+        v_price numeric := CASE
+            WHEN p_status = 'ACTIVE' AND p_price IS NOT NULL THEN p_sign * p_price
+        END;
+    BEGIN
+        INSERT INTO user_stats AS s (
+            user_id, active_count, completed_count, cancelled_count, price_totals
+        )
+        VALUES (
+            p_user_id, v_active, v_completed, v_cancelled,
+            CASE WHEN v_price IS NULL THEN '{}'::jsonb
+                 ELSE jsonb_build_object(v_currency, v_price) END
+        )
+        ON CONFLICT (user_id) DO UPDATE SET
+            active_count = s.active_count + v_active,
+            completed_count = s.completed_count + v_completed,
+            cancelled_count = s.cancelled_count + v_cancelled,
+            price_totals = CASE WHEN v_price IS NULL THEN s.price_totals
+                ELSE s.price_totals || jsonb_build_object(
+                    v_currency,
+                    coalesce((s.price_totals ->> v_currency)::numeric, 0) + v_price
+                ) END,
+            updated_at = now();
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION user_stats_wishes_trigger() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            PERFORM user_stats_apply_wish(
+                OLD.user_id, OLD.status, OLD.price, OLD.currency, -1
+            );
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            PERFORM user_stats_apply_wish(
+                NEW.user_id, NEW.status, NEW.price, NEW.currency, 1
+            );
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION user_stats_group_members_trigger() RETURNS trigger AS $$
+    DECLARE
+        v_user_id bigint := CASE WHEN TG_OP = 'INSERT' THEN NEW.user_id ELSE OLD.user_id END;
+        v_delta integer := CASE WHEN TG_OP = 'INSERT' THEN 1 ELSE -1 END;
+    BEGIN
+        INSERT INTO user_stats AS s (user_id, group_count)
+        VALUES (v_user_id, v_delta)
+        ON CONFLICT (user_id) DO UPDATE SET
+            group_count = s.group_count + v_delta,
+            updated_at = now();
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER user_stats_wishes_insert_delete
+    AFTER INSERT OR DELETE ON wishes
+    FOR EACH ROW EXECUTE FUNCTION user_stats_wishes_trigger()
+    """,
+    """
+    CREATE TRIGGER user_stats_wishes_update
+    AFTER UPDATE OF user_id, status, price, currency ON wishes
+    FOR EACH ROW
+    WHEN (
+        OLD.user_id IS DISTINCT FROM NEW.user_id
+        OR OLD.status IS DISTINCT FROM NEW.status
+        OR OLD.price IS DISTINCT FROM NEW.price
+        OR OLD.currency IS DISTINCT FROM NEW.currency
+    )
+    EXECUTE FUNCTION user_stats_wishes_trigger()
+    """,
+    """
+    CREATE TRIGGER user_stats_group_members
+    AFTER INSERT OR DELETE ON group_members
+    FOR EACH ROW EXECUTE FUNCTION user_stats_group_members_trigger()
+    """,
+]
+
+# Data versions (PostgreSQL), bumped once per statement through transition
+# tables: user_stats.version for the user whose profile, wishes or
+# memberships changed, groups.version for groups whose details or
+# membership changed. Members' wishes are not fanned out to their groups,
+# readers combine both (see app.services.versions), so wish writes lock
+# only the writer's stats row. Rows are locked in id order so multi-row
+# statements cannot deadlock each other. Reservations lock nothing but
+# their own row: each write takes a value of the global
+# reservation_versions sequence and readers use the group's maximum.
+# Mirrored by the add_data_versions, derive_group_versions and
+# add_reservation_versions migrations.
+VERSIONS_DDL = [
+    """
+    CREATE OR REPLACE FUNCTION bump_user_versions(p_user_ids bigint[]) RETURNS void AS $$
+    BEGIN
+        INSERT INTO user_stats AS s (user_id, version)
+        SELECT id, 1 FROM users WHERE id = ANY(p_user_ids) ORDER BY id
+        ON CONFLICT (user_id) DO UPDATE SET version = s.version + 1;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION bump_group_versions(p_group_ids bigint[]) RETURNS void AS $$
+    BEGIN
+        PERFORM 1 FROM groups WHERE id = ANY(p_group_ids) ORDER BY id FOR UPDATE;
+        UPDATE groups SET version = version + 1 WHERE id = ANY(p_group_ids);
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION wishes_bump_versions() RETURNS trigger AS $$
+    DECLARE
+        v_user_ids bigint[];
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            v_user_ids := ARRAY(SELECT DISTINCT user_id FROM new_rows);
+        ELSIF TG_OP = 'DELETE' THEN
+            v_user_ids := ARRAY(SELECT DISTINCT user_id FROM old_rows);
+        ELSE
+            v_user_ids := ARRAY(
+                SELECT user_id FROM new_rows UNION SELECT user_id FROM old_rows
+            );
+        END IF;
+
+        PERFORM bump_user_versions(v_user_ids);
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION group_rows_bump_versions() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            PERFORM bump_group_versions(ARRAY(SELECT DISTINCT group_id FROM new_rows));
+        ELSIF TG_OP = 'DELETE' THEN
+            PERFORM bump_group_versions(ARRAY(SELECT DISTINCT group_id FROM old_rows));
+        ELSE
+            PERFORM bump_group_versions(ARRAY(
+                SELECT group_id FROM new_rows UNION SELECT group_id FROM old_rows
+            ));
+        END IF;
+        IF TG_TABLE_NAME = 'group_members' THEN
+            IF TG_OP = 'INSERT' THEN
+                PERFORM bump_user_versions(ARRAY(SELECT DISTINCT user_id FROM new_rows));
+            ELSIF TG_OP = 'DELETE' THEN
+                PERFORM bump_user_versions(ARRAY(SELECT DISTINCT user_id FROM old_rows));
+            ELSE
+                PERFORM bump_user_versions(ARRAY(
+                    SELECT user_id FROM new_rows UNION SELECT user_id FROM old_rows
+                ));
+            END IF;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    "CREATE SEQUENCE IF NOT EXISTS reservation_versions",
+    """
+    CREATE OR REPLACE FUNCTION reservations_set_version() RETURNS trigger AS $$
+    BEGIN
+        NEW.version := nextval('reservation_versions');
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION users_bump_versions() RETURNS trigger AS $$
+    BEGIN
+        PERFORM bump_user_versions(ARRAY(SELECT id FROM new_rows));
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION groups_bump_own_version() RETURNS trigger AS $$
+    BEGIN
+        IF NEW.version = OLD.version THEN
+            NEW.version := OLD.version + 1;
+        END IF;
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    *(
+        f"""
+        CREATE TRIGGER {table}_versions_{op.lower()}
+        AFTER {op} ON {table}
+        REFERENCING {referencing}
+        FOR EACH STATEMENT EXECUTE FUNCTION {function}()
+        """
+        for table, function in (
+            ("wishes", "wishes_bump_versions"),
+            ("group_members", "group_rows_bump_versions"),
+        )
+        for op, referencing in (
+            ("INSERT", "NEW TABLE AS new_rows"),
+            ("UPDATE", "OLD TABLE AS old_rows NEW TABLE AS new_rows"),
+            ("DELETE", "OLD TABLE AS old_rows"),
+        )
+    ),
+    """
+    CREATE TRIGGER users_versions_update
+    AFTER UPDATE ON users
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION users_bump_versions()
+    """,
+    """
+    CREATE TRIGGER groups_version
+    BEFORE UPDATE ON groups
+    FOR EACH ROW EXECUTE FUNCTION groups_bump_own_version()
+    """,
+    """
+    CREATE TRIGGER reservations_version
+    BEFORE INSERT OR UPDATE ON reservations
+    FOR EACH ROW EXECUTE FUNCTION reservations_set_version()
+    """,
+]
+
+for _statement in USER_STATS_DDL + VERSIONS_DDL:
+    event.listen(
+        Base.metadata,
+        "after_create",
+        DDL(_statement).execute_if(dialect="postgresql")
+    )
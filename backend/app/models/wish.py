@@ -1,9 +1,11 @@
 from sqlalchemy import (
     Column, BigInteger, Integer, String, Text, Numeric,
-    DateTime, Boolean, ForeignKey, Enum as SQLEnum
+    DateTime, Boolean, ForeignKey, Enum as SQLEnum, DDL, Index, event, literal_column,
+    text, true
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
+from datetime import datetime
 import enum
 
 from app.core.database import Base
@@ -24,12 +26,16 @@ class WishPriority(int, enum.Enum):
     URGENT = 4
 
 
+# Partial index predicate of ix_wishes_user_public_order, see PUBLIC_WISH_FILTER
+PUBLIC_WISH_PREDICATE = "status = 'ACTIVE' AND is_public"
+
+
 class Wish(Base):
     """Wish model"""
     __tablename__ = "wishes"
 
     id = Column(BigInteger, primary_key=True, index=True)
-    user_id = Column(BigInteger, ForeignKey("users.id"), nullable=False, index=True)
+    user_id = Column(BigInteger, ForeignKey("users.id"), nullable=False)
     category_id = Column(Integer, ForeignKey("categories.id"), nullable=True)
 
     title = Column(String(200), nullable=False)
@@ -40,7 +46,8 @@ class Wish(Base):
     price = Column(Numeric(10, 2), nullable=True)
     currency = Column(String(3), default="RUB")
 
-    priority = Column(Integer, default=WishPriority.MEDIUM.value)
+    # Part of WISH_LIST_ORDER and keyset cursors, so never NULL
+    priority = Column(Integer, default=WishPriority.MEDIUM.value, nullable=False)
     status = Column(
         SQLEnum(WishStatus),
         default=WishStatus.ACTIVE,
@@ -49,7 +56,7 @@ class Wish(Base):
     )
 
     # Order for drag & drop
-    order_index = Column(Integer, default=0)
+    order_index = Column(Integer, default=0, nullable=False)
 
     # Metadata
     is_public = Column(Boolean, default=True)
@@ -68,13 +75,29 @@ class Wish(Base):
         cascade="all, delete-orphan"
     )
 
+    # Indexes matching the list order (priority desc, order_index,
+    # created_at desc, id desc) so listings need no sort
+    __table_args__ = (
+        Index(
+            "ix_wishes_user_status_order",
+            user_id, status, priority.desc(), order_index,
+            created_at.desc(), id.desc(),
+        ),
+        Index(
+            "ix_wishes_user_public_order",
+            user_id, priority.desc(), order_index,
+            created_at.desc(), id.desc(),
+            postgresql_where=text(PUBLIC_WISH_PREDICATE),
+        ),
+    )
+
     def __repr__(self):
         return f"<Wish {self.id} - {self.title}>"
 
     @property
     def is_reserved(self) -> bool:
         """Check if wish is reserved"""
-        return len(self.reservations) > 0
+        return any(reservation.is_active for reservation in self.reservations)
 
     @property
     def formatted_price(self) -> str:
@@ -88,3 +111,82 @@ class Wish(Base):
             symbol = currency_symbols.get(self.currency, self.currency)
             return f"{self.price} {symbol}"
         return "Не указана"
+
+
+# Listing order, with id as a unique tiebreaker for keyset pagination.
+# Matches the ix_wishes_*_order indexes.
+WISH_LIST_ORDER = (
+    Wish.priority.desc(),
+    Wish.order_index.asc(),
+    Wish.created_at.desc(),
+    Wish.id.desc(),
+)
+
+# Active public wishes. Renders as PUBLIC_WISH_PREDICATE so the planner can
+# prove it implies the partial index predicate: `is_public IS true` does not,
+# and neither does a bound status parameter in a generic prepared plan.
+PUBLIC_WISH_FILTER = (
+    Wish.status == literal_column("'ACTIVE'", Wish.status.type),
+    Wish.is_public == true(),
+)
+
+# Python types of the WISH_LIST_ORDER values in a cursor
+WISH_CURSOR_TYPES = (int, int, datetime, int)
+
+
+def wish_cursor(wish: "Wish") -> list:
+    """Get WISH_LIST_ORDER values of a wish for encode_cursor"""
+    return [wish.priority, wish.order_index, wish.created_at, wish.id]
+
+
+# Full-text search. The search_vector column and search indexes are managed
+# by DDL rather than mapped, as they only exist on the database side:
+# PostgreSQL gets a generated tsvector column plus GIN indexes (see the
+# add_wish_search migration), SQLite gets an FTS5 table kept in sync by
+# triggers so search works offline.
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('russian', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('russian', coalesce(description, '')), 'B') || "
+    "to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(description, ''))"
+)
+
+SEARCH_DDL = {
+    "postgresql": [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        f"ALTER TABLE wishes ADD COLUMN search_vector tsvector "
+        f"GENERATED ALWAYS AS ({SEARCH_VECTOR_SQL}) STORED",
+        "CREATE INDEX ix_wishes_search_vector ON wishes USING gin (search_vector)",
+        "CREATE INDEX ix_wishes_title_trgm ON wishes USING gin (title gin_trgm_ops)",
+    ],
+    "sqlite": [
+        "CREATE VIRTUAL TABLE wishes_fts USING fts5("
+        "title, description, content='wishes', content_rowid='id')",
+        "CREATE TRIGGER wishes_fts_ai AFTER INSERT ON wishes BEGIN "
+        "INSERT INTO wishes_fts(rowid, title, description) "
+        "VALUES (new.id, new.title, new.description); END",
+        "CREATE TRIGGER wishes_fts_ad AFTER DELETE ON wishes BEGIN "
+        "INSERT INTO wishes_fts(wishes_fts, rowid, title, description) "
+        "VALUES ('delete', old.id, old.title, old.description); END",
+        "CREATE TRIGGER wishes_fts_au AFTER UPDATE OF title, description ON wishes BEGIN "
+        "INSERT INTO wishes_fts(wishes_fts, rowid, title, description) "
+        "VALUES ('delete', old.id, old.title, old.description); "
+        "INSERT INTO wishes_fts(rowid, title, description) "
+        "VALUES (new.id, new.title, new.description); END",
+    ],
+}
+
+# Objects not dropped together with the wishes table
+SEARCH_DROP_DDL = {
+    "sqlite": [
+        "DROP TABLE IF EXISTS wishes_fts",
+    ],
+}
+
+for _event, _ddl in (("after_create", SEARCH_DDL), ("before_drop", SEARCH_DROP_DDL)):
+    for _dialect, _statements in _ddl.items():
+        for _statement in _statements:
+            event.listen(
+                Wish.__table__,
+                _event,
+                DDL(_statement).execute_if(dialect=_dialect)
+            )
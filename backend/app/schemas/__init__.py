@@ -1,3 +1,4 @@
+from app.schemas.auth import SessionToken, Principal
 from app.schemas.user import User, UserCreate, UserUpdate
 from app.schemas.wish import Wish, WishCreate, WishUpdate
 from app.schemas.category import Category, CategoryCreate
@@ -6,6 +7,7 @@ from app.schemas.reservation import Reservation, ReservationCreate
 from app.schemas.notification import Notification
 
 __all__ = [
+    "SessionToken", "Principal",
     "User", "UserCreate", "UserUpdate",
     "Wish", "WishCreate", "WishUpdate",
     "Category", "CategoryCreate",
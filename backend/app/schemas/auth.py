@@ -0,0 +1,17 @@
+from pydantic import BaseModel, ConfigDict
+
+
+class SessionToken(BaseModel):
+    """Session token issued in exchange for Telegram initData"""
+    access_token: str
+    token_type: str = "bearer"
+    expires_in: int
+
+
+class Principal(BaseModel):
+    """Authenticated user built from session token claims"""
+    id: int
+    telegram_id: int
+    is_premium: bool = False
+
+    model_config = ConfigDict(from_attributes=True)
@@ -9,9 +9,8 @@ class ReservationBase(BaseModel):
 
 
 class ReservationCreate(ReservationBase):
-    """Reservation creation schema"""
-    wish_id: int
-    group_id: int
+    """Reservation creation schema, wish and group come from the path"""
+    pass
 
 
 class Reservation(ReservationBase):
@@ -0,0 +1,11 @@
+from decimal import Decimal
+from typing import Annotated
+
+from pydantic import PlainSerializer
+
+# Exact Decimal in Python, JSON number on the wire (the Web App expects
+# numbers, pydantic would emit strings)
+Money = Annotated[
+    Decimal,
+    PlainSerializer(float, return_type=float, when_used="json")
+]
@@ -2,6 +2,9 @@ from pydantic import BaseModel, ConfigDict
 from typing import Optional
 from datetime import datetime
 
+from app.models.wish import WishStatus
+from app.schemas.types import Money
+
 
 class UserBase(BaseModel):
     """Base user schema"""
@@ -48,5 +51,10 @@ class User(UserBase):
 class UserProfile(User):
     """Extended user profile with statistics"""
     wishes_count: int = 0
+    active_wishes_count: int = 0
     completed_wishes_count: int = 0
     groups_count: int = 0
+    price_totals: dict[str, Money] = {}
+    wishes_by_status: dict[WishStatus, int] = {}
+    # Active wishes by priority value (1-4)
+    wishes_by_priority: dict[int, int] = {}
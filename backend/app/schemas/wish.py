@@ -1,9 +1,9 @@
-from pydantic import BaseModel, ConfigDict, HttpUrl
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl, field_validator
+from typing import Annotated, Literal, Optional, Union
 from datetime import datetime
-from decimal import Decimal
 
 from app.models.wish import WishStatus, WishPriority
+from app.schemas.types import Money
 
 
 class WishBase(BaseModel):
@@ -12,7 +12,7 @@ class WishBase(BaseModel):
     description: Optional[str] = None
     image_url: Optional[str] = None
     link: Optional[str] = None
-    price: Optional[Decimal] = None
+    price: Optional[Money] = None
     currency: str = "RUB"
     priority: int = WishPriority.MEDIUM.value
     category_id: Optional[int] = None
@@ -31,7 +31,7 @@ class WishUpdate(BaseModel):
     description: Optional[str] = None
     image_url: Optional[str] = None
     link: Optional[str] = None
-    price: Optional[Decimal] = None
+    price: Optional[Money] = None
     currency: Optional[str] = None
     priority: Optional[int] = None
     category_id: Optional[int] = None
@@ -40,6 +40,14 @@ class WishUpdate(BaseModel):
     notes: Optional[str] = None
     order_index: Optional[int] = None
 
+    @field_validator("priority", "order_index")
+    @classmethod
+    def not_null(cls, value: Optional[int]) -> int:
+        """May be omitted, but not set to null: wishes are ordered by them"""
+        if value is None:
+            raise ValueError("may be omitted but not null")
+        return value
+
 
 class Wish(WishBase):
     """Wish response schema"""
@@ -54,8 +62,15 @@ class Wish(WishBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class WishMove(BaseModel):
+    """Drag & drop move: place wish right after or right before another"""
+    after_id: Optional[int] = None
+    before_id: Optional[int] = None
+
+
 class WishWithReservation(Wish):
-    """Wish with reservation info"""
+    """Wish of a group member with reservation info, without private notes"""
+    notes: Optional[str] = Field(None, exclude=True)
     is_reserved: bool = False
     reserved_by: Optional[int] = None
     reservation_notes: Optional[str] = None
@@ -64,7 +79,82 @@ class WishWithReservation(Wish):
 class WishListResponse(BaseModel):
     """Wish list response with pagination"""
     items: list[Wish]
-    total: int
+    total: Optional[int] = None
     page: int
     page_size: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None
+
+
+class WishFeedResponse(BaseModel):
+    """Cursor-paginated group wish feed"""
+    items: list[WishWithReservation]
+    next_cursor: Optional[str] = None
+
+
+class PublicWish(Wish):
+    """Wish as shown to anyone with a shared link, without private notes"""
+    notes: Optional[str] = Field(None, exclude=True)
+
+
+class PublicWishListResponse(BaseModel):
+    """Cursor-paginated public wishlist of a user"""
+    items: list[PublicWish]
+    next_cursor: Optional[str] = None
+
+
+class WishBatchCreate(BaseModel):
+    """Batch operation: create wish"""
+    op: Literal["create"]
+    data: WishCreate
+
+
+class WishBatchUpdate(BaseModel):
+    """Batch operation: update wish"""
+    op: Literal["update"]
+    id: int
+    data: WishUpdate
+
+
+class WishBatchDelete(BaseModel):
+    """Batch operation: delete wish"""
+    op: Literal["delete"]
+    id: int
+
+
+WishBatchOperation = Annotated[
+    Union[WishBatchCreate, WishBatchUpdate, WishBatchDelete],
+    Field(discriminator="op"),
+]
+
+
+class WishBatchRequest(BaseModel):
+    """Batch of wish operations executed in one transaction"""
+    operations: list[WishBatchOperation]
+
+
+class WishBatchResult(BaseModel):
+    """Result of a single batch operation"""
+    index: int
+    op: str
+    status: Literal["ok", "not_found"]
+    id: Optional[int] = None
+    wish: Optional[Wish] = None
+
+
+class WishBatchResponse(BaseModel):
+    """Batch results in the order of operations"""
+    results: list[WishBatchResult]
+
+
+class WishImportError(BaseModel):
+    """Rejected import row (1-based data row, CSV header excluded)"""
+    row: int
+    error: str
+
+
+class WishImportResult(BaseModel):
+    """Import summary"""
+    accepted: int
+    rejected: int
+    errors: list[WishImportError] = []
@@ -0,0 +1,115 @@
+import csv
+import enum
+import io
+from typing import AsyncIterator, Callable, Sequence
+
+import orjson
+from sqlalchemy import Row, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.responses import json_default
+from app.models.category import Category
+from app.models.wish import Wish, WISH_LIST_ORDER
+
+# Rows fetched from the server-side cursor per round trip
+EXPORT_BATCH_SIZE = 500
+
+# Wish fields included in exports (no reservation data)
+EXPORT_COLUMNS = (
+    Wish.id,
+    Wish.title,
+    Wish.description,
+    Wish.link,
+    Wish.image_url,
+    Wish.price,
+    Wish.currency,
+    Wish.priority,
+    Wish.status,
+    Category.name.label("category"),
+    Wish.is_public,
+    Wish.notes,
+    Wish.created_at,
+    Wish.completed_at,
+)
+EXPORT_FIELDS = [column.key for column in EXPORT_COLUMNS]
+
+
+async def stream_wish_rows(
+    session: AsyncSession,
+    user_id: int
+) -> AsyncIterator[Sequence[Row]]:
+    """
+    Stream all user's wishes in batches through a server-side cursor
+
+    Yields:
+        Sequence[Row]: Up to EXPORT_BATCH_SIZE rows of EXPORT_COLUMNS
+    """
+    result = await session.stream(
+        select(*EXPORT_COLUMNS)
+        .outerjoin(Category, Category.id == Wish.category_id)
+        .where(Wish.user_id == user_id)
+        .order_by(Wish.status, *WISH_LIST_ORDER),
+        execution_options={"yield_per": EXPORT_BATCH_SIZE},
+    )
+    async for rows in result.partitions():
+        yield rows
+
+
+def _ndjson_chunk(rows: Sequence[Row]) -> bytes:
+    return b"".join(
+        orjson.dumps(row._asdict(), default=json_default) + b"\n"
+        for row in rows
+    )
+
+
+def _csv_chunk(rows: Sequence[Row]) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows(
+        [
+            value.value if isinstance(value, enum.Enum) else value
+            for value in row
+        ]
+        for row in rows
+    )
+    return buffer.getvalue().encode()
+
+
+def _csv_header() -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(EXPORT_FIELDS)
+    # BOM so spreadsheet apps detect UTF-8
+    return buffer.getvalue().encode("utf-8-sig")
+
+
+# Format -> (media type, header, batch serializer)
+EXPORT_FORMATS: dict[str, tuple[str, bytes, Callable[[Sequence[Row]], bytes]]] = {
+    "ndjson": ("application/x-ndjson", b"", _ndjson_chunk),
+    "csv": ("text/csv", _csv_header(), _csv_chunk),
+}
+
+
+async def export_wishes(
+    session: AsyncSession,
+    user_id: int,
+    export_format: str
+) -> AsyncIterator[bytes]:
+    """
+    Serialize all user's wishes chunk by chunk
+
+    Memory use is bounded by EXPORT_BATCH_SIZE regardless of list size.
+
+    Args:
+        session: Database session, must stay open while iterating
+        user_id: Owner of the wishes
+        export_format: Key of EXPORT_FORMATS
+
+    Yields:
+        bytes: Serialized chunks
+    """
+    _, header, serialize = EXPORT_FORMATS[export_format]
+    if header:
+        yield header
+
+    async for rows in stream_wish_rows(session, user_id):
+        yield serialize(rows)
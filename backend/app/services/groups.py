@@ -0,0 +1,152 @@
+from typing import Optional, Sequence
+
+from sqlalchemy import Row, and_, case, exists, func, null, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.pagination import keyset_after
+from app.models.group import Group, GroupMember, GroupRole
+from app.models.reservation import Reservation
+from app.models.wish import Wish, PUBLIC_WISH_FILTER, WISH_LIST_ORDER
+
+# Columns of the Group response schema
+GROUP_COLUMNS = (
+    Group.id,
+    Group.name,
+    Group.description,
+    Group.avatar_url,
+    Group.creator_id,
+    Group.invite_code,
+    Group.is_active,
+    Group.created_at,
+    Group.updated_at,
+)
+
+
+# Wish columns shown to other group members, private notes stay with the owner
+FEED_WISH_COLUMNS = tuple(
+    column for column in Wish.__table__.columns if column.key != "notes"
+)
+
+
+async def list_user_groups(session: AsyncSession, user_id: int) -> Sequence[Row]:
+    """
+    Get user's groups with member counts in a single statement
+
+    Member counts come from one GROUP BY over the user's groups joined to
+    the group list, no relationships are loaded.
+
+    Returns:
+        Sequence[Row]: GROUP_COLUMNS and member_count, newest first
+    """
+    member_counts = (
+        select(GroupMember.group_id, func.count().label("member_count"))
+        .where(
+            GroupMember.group_id.in_(
+                select(GroupMember.group_id).where(GroupMember.user_id == user_id)
+            )
+        )
+        .group_by(GroupMember.group_id)
+        .subquery()
+    )
+
+    result = await session.execute(
+        select(*GROUP_COLUMNS, member_counts.c.member_count)
+        .join(member_counts, member_counts.c.group_id == Group.id)
+        .order_by(Group.created_at.desc(), Group.id.desc())
+    )
+    return result.all()
+
+
+async def get_group_role(
+    session: AsyncSession,
+    group_id: int,
+    user_id: int
+) -> Optional[tuple[Group, GroupRole]]:
+    """
+    Get group and user's role in it with one joined query
+
+    Returns:
+        Optional[tuple[Group, GroupRole]]: Group and role, None if the user
+        is not a member
+    """
+    result = await session.execute(
+        select(Group, GroupMember.role)
+        .join(GroupMember, GroupMember.group_id == Group.id)
+        .where(Group.id == group_id, GroupMember.user_id == user_id)
+    )
+    row = result.one_or_none()
+    return tuple(row) if row else None
+
+
+async def get_group_feed(
+    session: AsyncSession,
+    group_id: int,
+    viewer_id: int,
+    limit: int,
+    after: Optional[list] = None,
+    member_id: Optional[int] = None,
+    priority: Optional[int] = None
+) -> Sequence[Row]:
+    """
+    Get a page of active public wishes of group members with reservations
+
+    One statement joins group_members to wishes, checks the viewer's
+    membership (nothing is returned to non-members) and left joins the
+    group's active reservation of each wish. Owners never see whether their
+    own wishes are reserved; reservation notes are shown to the reserver
+    only.
+
+    Args:
+        session: Database session
+        group_id: Group to read
+        viewer_id: Current user, must be a member
+        limit: Page size
+        after: WISH_LIST_ORDER values of the last wish of the previous page
+        member_id: Only wishes of this member
+        priority: Only wishes with this priority
+
+    Returns:
+        Sequence[Row]: FEED_WISH_COLUMNS plus is_reserved, reserved_by and
+        reservation_notes, in WISH_LIST_ORDER
+    """
+    viewer_membership = exists().where(
+        GroupMember.group_id == group_id,
+        GroupMember.user_id == viewer_id
+    )
+    visible = Wish.user_id != viewer_id
+
+    query = (
+        select(
+            *FEED_WISH_COLUMNS,
+            and_(visible, Reservation.id.is_not(None)).label("is_reserved"),
+            case((visible, Reservation.reserved_by), else_=null()).label("reserved_by"),
+            case(
+                (Reservation.reserved_by == viewer_id, Reservation.notes),
+                else_=null()
+            ).label("reservation_notes"),
+        )
+        .join(
+            GroupMember,
+            (GroupMember.user_id == Wish.user_id) & (GroupMember.group_id == group_id)
+        )
+        .outerjoin(
+            Reservation,
+            (Reservation.wish_id == Wish.id)
+            & (Reservation.group_id == group_id)
+            & Reservation.cancelled_at.is_(None)
+        )
+        .where(
+            viewer_membership,
+            *PUBLIC_WISH_FILTER,
+        )
+    )
+
+    if member_id is not None:
+        query = query.where(Wish.user_id == member_id)
+    if priority is not None:
+        query = query.where(Wish.priority == priority)
+    if after is not None:
+        query = query.where(keyset_after(WISH_LIST_ORDER, after))
+
+    result = await session.execute(query.order_by(*WISH_LIST_ORDER).limit(limit))
+    return result.all()
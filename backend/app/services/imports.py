@@ -0,0 +1,163 @@
+import codecs
+import csv
+from typing import Any, AsyncIterable, AsyncIterator, Optional
+
+import orjson
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.category import Category
+from app.models.wish import Wish
+from app.schemas.wish import WishCreate, WishImportError, WishImportResult
+
+# Rows per multi-row INSERT
+IMPORT_BATCH_SIZE = 500
+
+# Rejected rows reported back in detail, the rest are only counted
+MAX_IMPORT_ERRORS = 100
+
+
+def detect_import_format(filename: Optional[str]) -> Optional[str]:
+    """Guess import format from file extension (.csv, .ndjson, .jsonl, .json)"""
+    extension = (filename or "").rsplit(".", 1)[-1].lower()
+    if extension == "csv":
+        return "csv"
+    if extension in ("ndjson", "jsonl", "json"):
+        return "ndjson"
+    return None
+
+
+async def _iter_records(
+    chunks: AsyncIterable[bytes],
+    quoted: bool
+) -> AsyncIterator[str]:
+    """
+    Decode UTF-8 chunks and yield non-empty records one line at a time
+
+    With quoted=True a record continues over newlines inside CSV quoted
+    fields (odd number of quote characters so far).
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    pending = ""
+    record = ""
+
+    async def lines():
+        nonlocal pending
+        async for chunk in chunks:
+            pending += decoder.decode(chunk)
+            *complete, pending = pending.split("\n")
+            for line in complete:
+                yield line + "\n"
+        pending += decoder.decode(b"", final=True)
+        if pending:
+            yield pending
+
+    async for line in lines():
+        record += line
+        if quoted and record.count('"') % 2:
+            continue
+        if record.strip():
+            yield record
+        record = ""
+
+    if record.strip():
+        yield record
+
+
+async def _iter_ndjson(chunks: AsyncIterable[bytes]) -> AsyncIterator[Any]:
+    async for record in _iter_records(chunks, quoted=False):
+        try:
+            yield orjson.loads(record)
+        except orjson.JSONDecodeError as e:
+            yield ValueError(f"Invalid JSON: {e}")
+
+
+async def _iter_csv(chunks: AsyncIterable[bytes]) -> AsyncIterator[Any]:
+    header = None
+    async for record in _iter_records(chunks, quoted=True):
+        values = next(csv.reader([record]), [])
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+
+        # Empty cells fall back to schema defaults
+        yield {
+            name: value
+            for name, value in zip(header, values)
+            if value != ""
+        }
+
+
+async def import_wishes(
+    session: AsyncSession,
+    user_id: int,
+    chunks: AsyncIterable[bytes],
+    import_format: str
+) -> WishImportResult:
+    """
+    Parse, validate and insert wishes from an uploaded file incrementally
+
+    Each row is validated with WishCreate; valid rows are inserted with one
+    multi-row INSERT per IMPORT_BATCH_SIZE rows. A "category" name column
+    (as produced by the export) is resolved to category_id. The caller
+    commits.
+
+    Args:
+        session: Database session
+        user_id: Owner of the imported wishes
+        chunks: Raw file content
+        import_format: "csv" or "ndjson"
+
+    Returns:
+        WishImportResult: Accepted and rejected row counts with errors
+    """
+    result = await session.execute(select(Category.name, Category.id))
+    categories = dict(result.all())
+
+    records = _iter_csv(chunks) if import_format == "csv" else _iter_ndjson(chunks)
+
+    accepted = 0
+    rejected = 0
+    errors: list[WishImportError] = []
+    batch: list[dict[str, Any]] = []
+
+    async def flush():
+        nonlocal accepted
+        if batch:
+            await session.execute(insert(Wish).values(batch))
+            accepted += len(batch)
+            batch.clear()
+
+    row = 0
+    async for record in records:
+        row += 1
+        try:
+            if isinstance(record, Exception):
+                raise record
+            if not isinstance(record, dict):
+                raise ValueError("Row must be an object")
+
+            category = record.get("category")
+            if category and not record.get("category_id"):
+                record["category_id"] = categories.get(category)
+
+            wish_in = WishCreate.model_validate(record)
+        except (ValueError, ValidationError) as e:
+            rejected += 1
+            if len(errors) < MAX_IMPORT_ERRORS:
+                if isinstance(e, ValidationError):
+                    first = e.errors()[0]
+                    message = f"{'.'.join(map(str, first['loc']))}: {first['msg']}"
+                else:
+                    message = str(e)
+                errors.append(WishImportError(row=row, error=message))
+            continue
+
+        batch.append({**wish_in.model_dump(), "user_id": user_id})
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            await flush()
+
+    await flush()
+
+    return WishImportResult(accepted=accepted, rejected=rejected, errors=errors)
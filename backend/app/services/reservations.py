@@ -0,0 +1,147 @@
+from typing import Optional
+
+from sqlalchemy import BigInteger, Row, exists, func, literal, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.group import GroupMember
+from app.models.reservation import Reservation
+from app.models.wish import Wish, PUBLIC_WISH_FILTER
+
+
+def _is_member(group_id: int, user_id):
+    return exists().where(
+        GroupMember.group_id == group_id,
+        GroupMember.user_id == user_id
+    )
+
+
+def _reservable_wish(group_id: int, wish_id: int):
+    """Active public wish of a group member"""
+    return (
+        select(Wish.user_id)
+        .where(
+            Wish.id == wish_id,
+            *PUBLIC_WISH_FILTER,
+            _is_member(group_id, Wish.user_id),
+        )
+    )
+
+
+async def reserve_wish(
+    session: AsyncSession,
+    group_id: int,
+    wish_id: int,
+    user_id: int,
+    notes: Optional[str] = None
+) -> Optional[Reservation]:
+    """
+    Reserve wish in a group with a single INSERT ... ON CONFLICT
+
+    The unique (wish_id, group_id) constraint decides between concurrent
+    requests for a wish, so exactly one wins without locking the wish or
+    the group. A cancelled reservation still holds its slot: the conflict
+    revives it for the new reserver, while an active one is left alone.
+    The insert only happens if the user is a group member and the wish is
+    an active public wish of another member.
+
+    Returns:
+        Optional[Reservation]: Created reservation, None if the wish is
+        already reserved or cannot be reserved by the user (see
+        get_reservation_state)
+    """
+    wish = _reservable_wish(group_id, wish_id).subquery()
+
+    source = (
+        select(
+            literal(wish_id, BigInteger),
+            literal(group_id, BigInteger),
+            literal(user_id, BigInteger),
+            literal(notes, Reservation.notes.type),
+        )
+        .select_from(wish)
+        .where(wish.c.user_id != user_id, _is_member(group_id, user_id))
+    )
+
+    statement = insert(Reservation).from_select(
+        ["wish_id", "group_id", "reserved_by", "notes"], source
+    )
+    result = await session.scalars(
+        statement
+        .on_conflict_do_update(
+            index_elements=["wish_id", "group_id"],
+            set_={
+                "reserved_by": statement.excluded.reserved_by,
+                "notes": statement.excluded.notes,
+                "reserved_at": func.now(),
+                "cancelled_at": None,
+            },
+            where=Reservation.cancelled_at.is_not(None),
+        )
+        .returning(Reservation),
+        execution_options={"populate_existing": True},
+    )
+    return result.one_or_none()
+
+
+async def get_reservation_state(
+    session: AsyncSession,
+    group_id: int,
+    wish_id: int,
+    user_id: int
+) -> tuple[Row, Optional[Reservation]]:
+    """
+    Explain why a wish could not be reserved
+
+    Only needed on the failure path of reserve_wish.
+
+    Returns:
+        Row with is_member and owner_id (None if the wish is not reservable
+        in the group), and the active reservation if any
+    """
+    result = await session.execute(
+        select(
+            _is_member(group_id, user_id).label("is_member"),
+            _reservable_wish(group_id, wish_id).scalar_subquery().label("owner_id"),
+        )
+    )
+    state = result.one()
+
+    reservation = await session.scalar(
+        select(Reservation).where(
+            Reservation.wish_id == wish_id,
+            Reservation.group_id == group_id,
+            Reservation.cancelled_at.is_(None),
+        )
+    )
+    return state, reservation
+
+
+async def cancel_reservation(
+    session: AsyncSession,
+    group_id: int,
+    wish_id: int,
+    user_id: int
+) -> bool:
+    """
+    Cancel user's reservation of a wish in a group
+
+    The reservation is marked cancelled rather than deleted, which gives
+    it a new version (see app.models.reservation).
+
+    Returns:
+        bool: Whether a reservation was cancelled
+    """
+    result = await session.execute(
+        update(Reservation)
+        .where(
+            Reservation.wish_id == wish_id,
+            Reservation.group_id == group_id,
+            Reservation.reserved_by == user_id,
+            Reservation.cancelled_at.is_(None),
+        )
+        .values(cancelled_at=func.now())
+        .returning(Reservation.id),
+        execution_options={"synchronize_session": False},
+    )
+    return result.scalar_one_or_none() is not None
@@ -0,0 +1,70 @@
+from sqlalchemy import Select, func, literal, literal_column, or_, table, column
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.models.wish import Wish
+
+# Database-side search objects, see SEARCH_DDL in app.models.wish
+search_vector = literal_column("wishes.search_vector")
+wishes_fts = table("wishes_fts", column("rowid"), column("wishes_fts"))
+
+
+def fts5_query(term: str) -> str:
+    """Build FTS5 MATCH query: every token as a quoted prefix, ANDed"""
+    tokens = term.split()
+    return " ".join(
+        '"' + token.replace('"', '""') + '"*' for token in tokens
+    )
+
+
+def apply_wish_search(
+    query: Select,
+    term: str,
+    dialect_name: str
+) -> tuple[Select, ColumnElement]:
+    """
+    Filter wish query by search term and build relevance expression
+
+    On PostgreSQL matches the title/description tsvector (Russian and simple
+    configs) or the title by trigram word similarity for typo tolerance,
+    both served by GIN indexes. On SQLite uses the FTS5 stand-in table.
+
+    Args:
+        query: Wish select to filter
+        term: Search term as typed by the user
+        dialect_name: Name of the database dialect
+
+    Returns:
+        Filtered query and relevance expression (higher is better)
+    """
+    if dialect_name == "postgresql":
+        ts_query = func.websearch_to_tsquery(
+            literal_column("'russian'::regconfig"), term
+        ).op("||")(
+            func.websearch_to_tsquery(literal_column("'simple'::regconfig"), term)
+        )
+        query = query.where(or_(
+            search_vector.op("@@")(ts_query),
+            literal(term).op("<%")(Wish.title),
+        ))
+        rank = (
+            func.ts_rank_cd(search_vector, ts_query)
+            + func.word_similarity(term, Wish.title)
+        )
+        return query, rank
+
+    if dialect_name == "sqlite":
+        query = query.join(
+            wishes_fts, wishes_fts.c.rowid == Wish.id
+        ).where(
+            wishes_fts.c.wishes_fts.op("MATCH")(fts5_query(term))
+        )
+        # bm25() is lower for better matches
+        rank = -func.bm25(literal_column("wishes_fts"))
+        return query, rank
+
+    # Unindexed fallback
+    query = query.where(or_(
+        Wish.title.ilike(f"%{term}%"),
+        Wish.description.ilike(f"%{term}%"),
+    ))
+    return query, literal(0)
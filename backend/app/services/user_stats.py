@@ -0,0 +1,107 @@
+from sqlalchemy import BigInteger, bindparam, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user_stats import UserStats
+
+# Stats row of a user, created empty if missing so it can be locked
+ENSURE_STATS_SQL = """
+INSERT INTO user_stats (user_id)
+SELECT id FROM users WHERE id = :user_id
+ON CONFLICT (user_id) DO NOTHING
+"""
+
+# Stats row locked before recomputing: trigger deltas of concurrent writers
+# wait for the reconcile to commit, and the recompute (a later statement,
+# so a later snapshot under READ COMMITTED) sees every write that committed
+# before the lock was granted. Nothing is overwritten with stale counts.
+LOCK_STATS_SQL = """
+SELECT user_id FROM user_stats WHERE user_id = :user_id FOR UPDATE
+"""
+
+# Recompute stats of a locked user from source tables, rewriting the row
+# only if it drifted
+RECONCILE_SQL = """
+UPDATE user_stats AS s SET
+    active_count = c.active_count,
+    completed_count = c.completed_count,
+    cancelled_count = c.cancelled_count,
+    group_count = c.group_count,
+    price_totals = c.price_totals,
+    version = s.version + 1,
+    updated_at = now()
+FROM (
+    SELECT
+        (SELECT count(*) FROM wishes
+         WHERE user_id = :user_id AND status = 'ACTIVE') AS active_count,
+        (SELECT count(*) FROM wishes
+         WHERE user_id = :user_id AND status = 'COMPLETED') AS completed_count,
+        (SELECT count(*) FROM wishes
+         WHERE user_id = :user_id AND status = 'CANCELLED') AS cancelled_count,
+        (SELECT count(*) FROM group_members
+         WHERE user_id = :user_id) AS group_count,
+        coalesce((
+            SELECT jsonb_object_agg(currency, total)
+            FROM (
+                SELECT coalesce(currency, 'RUB') AS currency, sum(price) AS total
+                FROM wishes
+                WHERE user_id = :user_id AND status = 'ACTIVE' AND price IS NOT NULL
+                GROUP BY 1
+            ) totals
+        ), '{}'::jsonb) AS price_totals
+) c
+WHERE s.user_id = :user_id
+AND (
+    s.active_count, s.completed_count, s.cancelled_count,
+    s.group_count, s.price_totals
+) IS DISTINCT FROM (
+    c.active_count, c.completed_count, c.cancelled_count,
+    c.group_count, c.price_totals
+)
+"""
+
+
+async def get_user_stats(session: AsyncSession, user_id: int) -> UserStats:
+    """
+    Get user statistics by primary key
+
+    Returns:
+        UserStats: Stored stats, or zeroed stats if the user has none yet
+    """
+    stats = await session.get(UserStats, user_id)
+    if stats is None:
+        stats = UserStats(
+            user_id=user_id,
+            active_count=0,
+            completed_count=0,
+            cancelled_count=0,
+            group_count=0,
+            price_totals={},
+            version=0,
+        )
+    return stats
+
+
+async def reconcile_user_stats(session: AsyncSession, user_id: int) -> bool:
+    """
+    Recompute stats of a user from wishes and group_members
+
+    Holds the user's stats row lock until the caller commits, so reconcile
+    one user per transaction to keep concurrent writers waiting briefly.
+
+    Args:
+        session: Database session
+        user_id: User to reconcile
+
+    Returns:
+        bool: Whether the stored stats had drifted and were corrected
+    """
+    user_param = bindparam("user_id", user_id, type_=BigInteger)
+
+    await session.execute(text(ENSURE_STATS_SQL).bindparams(user_param))
+    locked = await session.execute(text(LOCK_STATS_SQL).bindparams(user_param))
+    if locked.first() is None:
+        # No such user
+        return False
+
+    result = await session.execute(text(RECONCILE_SQL).bindparams(user_param))
+    return result.rowcount > 0
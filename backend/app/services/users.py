@@ -0,0 +1,162 @@
+from typing import Optional
+from sqlalchemy import select, exists, or_, union_all, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.group import GroupMember
+from app.models.user import User
+from app.models.user_stats import UserStats
+from app.models.wish import Wish, WishPriority, WishStatus
+from app.schemas.user import UserProfile
+
+# Fields synced from Telegram on every contact
+SYNCED_FIELDS = ("username", "first_name", "last_name", "is_premium")
+
+
+async def upsert_user(
+    session: AsyncSession,
+    telegram_id: int,
+    first_name: str,
+    username: Optional[str] = None,
+    last_name: Optional[str] = None,
+    language_code: Optional[str] = None,
+    is_premium: bool = False,
+) -> User:
+    """
+    Get or create user and sync Telegram profile fields in one statement
+
+    Runs INSERT ... ON CONFLICT (telegram_id) DO UPDATE only when synced
+    fields differ, and falls back to the existing row within the same
+    statement when nothing changed. Does not commit.
+
+    Args:
+        session: Database session
+        telegram_id: Telegram user ID
+        first_name: Telegram first name
+        username: Telegram username
+        last_name: Telegram last name
+        language_code: Language code, only used on creation
+        is_premium: Telegram Premium flag
+
+    Returns:
+        User: Created, updated or existing user
+    """
+    insert_stmt = insert(User).values(
+        telegram_id=telegram_id,
+        username=username,
+        first_name=first_name,
+        last_name=last_name,
+        language_code=language_code or "ru",
+        is_premium=is_premium,
+        is_active=True,
+    )
+    changed = or_(*(
+        getattr(User, field).is_distinct_from(insert_stmt.excluded[field])
+        for field in SYNCED_FIELDS
+    ))
+    upsert = (
+        insert_stmt
+        .on_conflict_do_update(
+            index_elements=[User.telegram_id],
+            set_={
+                **{field: insert_stmt.excluded[field] for field in SYNCED_FIELDS},
+                "updated_at": func.now(),
+            },
+            where=changed,
+        )
+        .returning(*User.__table__.c)
+        .cte("upsert")
+    )
+
+    # Upserted row, or the unchanged existing one
+    stmt = union_all(
+        select(upsert),
+        select(User.__table__).where(
+            User.telegram_id == telegram_id,
+            ~exists(select(upsert.c.id))
+        ),
+    )
+    result = await session.execute(
+        select(User).from_statement(stmt),
+        execution_options={"populate_existing": True},
+    )
+    user = result.scalar_one_or_none()
+
+    if user is None:
+        # Row was committed concurrently after this statement's snapshot
+        result = await session.execute(
+            select(User).where(User.telegram_id == telegram_id)
+        )
+        user = result.scalar_one()
+
+    return user
+
+
+async def get_user_profile(
+    session: AsyncSession,
+    user_id: int
+) -> Optional[UserProfile]:
+    """
+    Get user with wish and membership statistics in one statement
+
+    Wish counts per status and per priority (of active wishes) come from a
+    single aggregate over the user's wishes with FILTER clauses, group
+    count and price totals from scalar subqueries.
+
+    Returns:
+        Optional[UserProfile]: Profile, None if the user does not exist
+    """
+    wish_counts = (
+        select(
+            func.count().label("wishes_count"),
+            *(
+                func.count().filter(Wish.status == wish_status).label(f"status_{wish_status.value}")
+                for wish_status in WishStatus
+            ),
+            *(
+                func.count()
+                .filter(Wish.status == WishStatus.ACTIVE, Wish.priority == priority.value)
+                .label(f"priority_{priority.value}")
+                for priority in WishPriority
+            ),
+        )
+        .where(Wish.user_id == user_id)
+        .subquery()
+    )
+
+    result = await session.execute(
+        select(
+            *User.__table__.c,
+            wish_counts,
+            select(func.count())
+            .where(GroupMember.user_id == user_id)
+            .scalar_subquery()
+            .label("groups_count"),
+            select(UserStats.price_totals)
+            .where(UserStats.user_id == user_id)
+            .scalar_subquery()
+            .label("price_totals"),
+        )
+        .where(User.id == user_id)
+    )
+    row = result.one_or_none()
+    if row is None:
+        return None
+
+    by_status = {
+        wish_status: getattr(row, f"status_{wish_status.value}")
+        for wish_status in WishStatus
+    }
+    return UserProfile.model_validate({
+        **{column.name: row._mapping[column] for column in User.__table__.c},
+        "wishes_count": row.wishes_count,
+        "active_wishes_count": by_status[WishStatus.ACTIVE],
+        "completed_wishes_count": by_status[WishStatus.COMPLETED],
+        "groups_count": row.groups_count,
+        "price_totals": row.price_totals or {},
+        "wishes_by_status": by_status,
+        "wishes_by_priority": {
+            priority.value: getattr(row, f"priority_{priority.value}")
+            for priority in WishPriority
+        },
+    })
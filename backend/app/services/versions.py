@@ -0,0 +1,108 @@
+from typing import Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.group import Group, GroupMember
+from app.models.reservation import Reservation
+from app.models.user import User
+from app.models.user_stats import UserStats
+
+
+def _user_version(user_id: int):
+    """Scalar subquery of user's data version, 0 until first write"""
+    return func.coalesce(
+        select(UserStats.version)
+        .where(UserStats.user_id == user_id)
+        .scalar_subquery(),
+        0
+    )
+
+
+async def get_user_version(session: AsyncSession, user_id: int) -> str:
+    """Get version of user's profile and wishes"""
+    version = await session.scalar(select(_user_version(user_id)))
+    return str(version)
+
+
+async def get_existing_user_version(session: AsyncSession, user_id: int) -> Optional[str]:
+    """
+    Get version of user's profile and wishes if the user exists
+
+    For requests naming another user, e.g. shared wishlist links.
+
+    Returns:
+        Optional[str]: Version, None if the user does not exist
+    """
+    version = await session.scalar(
+        select(_user_version(user_id)).where(User.id == user_id)
+    )
+    return None if version is None else str(version)
+
+
+async def get_user_groups_version(session: AsyncSession, user_id: int) -> str:
+    """
+    Get version of the list of user's groups
+
+    Joining or leaving bumps the user version, changes to a group's details
+    or membership bump that group's version, so the pair changes whenever
+    the list does.
+    """
+    result = await session.execute(
+        select(
+            _user_version(user_id),
+            func.coalesce(func.sum(Group.version), 0),
+        )
+        .select_from(GroupMember)
+        .join(Group, Group.id == GroupMember.group_id)
+        .where(GroupMember.user_id == user_id)
+    )
+    user_version, groups_version = result.one()
+    return f"{user_version}.{groups_version}"
+
+
+def _members_version(group_id: int):
+    """Scalar subquery of the sum of group members' data versions"""
+    return (
+        select(func.coalesce(func.sum(UserStats.version), 0))
+        .join(GroupMember, GroupMember.user_id == UserStats.user_id)
+        .where(GroupMember.group_id == group_id)
+        .scalar_subquery()
+    )
+
+
+def _reservations_version(group_id: int):
+    """Scalar subquery of the latest version of group's reservations"""
+    return (
+        select(func.coalesce(func.max(Reservation.version), 0))
+        .where(Reservation.group_id == group_id)
+        .scalar_subquery()
+    )
+
+
+async def get_group_version(session: AsyncSession, group_id: int) -> Optional[str]:
+    """
+    Get version of group's data
+
+    Combines the group's own version with its members' versions, which
+    wish writes bump instead of every group of the writer. Membership
+    changes bump the group version, so while it stays the same the member
+    set does too and their sum only grows. Reservations take increasing
+    versions from a global sequence and are cancelled rather than deleted,
+    so their maximum grows with every reservation write without locking
+    the group row. The triple changes whenever any of the group's data
+    does. Membership of the reader is not checked, see deps.group_etag.
+
+    Returns:
+        Optional[str]: Version, None if the group does not exist
+    """
+    result = await session.execute(
+        select(
+            Group.version,
+            _members_version(group_id),
+            _reservations_version(group_id),
+        )
+        .where(Group.id == group_id)
+    )
+    row = result.one_or_none()
+    return None if row is None else ".".join(map(str, row))
@@ -0,0 +1,363 @@
+from collections import defaultdict
+from typing import Any, Optional, Sequence
+
+from sqlalchemy import (
+    BigInteger, any_, bindparam, cast, column, delete, func, insert, select, update, values
+)
+from sqlalchemy.sql import operators
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.pagination import keyset_after
+from app.models.reservation import Reservation
+from app.models.wish import Wish, WishStatus, PUBLIC_WISH_FILTER, WISH_LIST_ORDER
+
+
+def _ids_param(ids: Sequence[int]):
+    """Bind a list of ids as a single BIGINT[] parameter for = ANY(...)"""
+    return any_(bindparam("ids", list(ids), type_=ARRAY(BigInteger)))
+
+
+async def get_public_wishes(
+    session: AsyncSession,
+    user_id: int,
+    limit: int,
+    after: Optional[Sequence[Any]] = None
+) -> Sequence[Wish]:
+    """
+    Get a page of user's active public wishes
+
+    Args:
+        session: Database session
+        user_id: Owner of the wishes
+        limit: Maximum number of wishes
+        after: Sort key of the last wish of the previous page
+            (see wish_cursor)
+    """
+    query = select(Wish).where(
+        Wish.user_id == user_id,
+        *PUBLIC_WISH_FILTER,
+    )
+    if after:
+        query = query.where(keyset_after(WISH_LIST_ORDER, after))
+
+    result = await session.scalars(query.order_by(*WISH_LIST_ORDER).limit(limit))
+    return result.all()
+
+
+async def create_wishes(
+    session: AsyncSession,
+    user_id: int,
+    rows: Sequence[dict[str, Any]]
+) -> list[Wish]:
+    """
+    Create wishes with a single multi-row INSERT ... RETURNING
+
+    Returns:
+        list[Wish]: Created wishes in the order of rows
+    """
+    if not rows:
+        return []
+
+    result = await session.scalars(
+        insert(Wish).returning(Wish, sort_by_parameter_order=True),
+        [{**row, "user_id": user_id} for row in rows],
+    )
+    return list(result)
+
+
+async def update_wishes(
+    session: AsyncSession,
+    user_id: int,
+    changes: dict[int, dict[str, Any]]
+) -> dict[int, Wish]:
+    """
+    Update user's wishes with UPDATE ... FROM (VALUES ...) RETURNING
+
+    Changes touching the same set of fields are applied by one statement.
+
+    Args:
+        session: Database session
+        user_id: Owner of the wishes
+        changes: Wish ID -> fields to set
+
+    Returns:
+        dict[int, Wish]: Updated wishes by ID; missing IDs were not found
+    """
+    groups: dict[tuple[str, ...], list[int]] = defaultdict(list)
+    for wish_id, fields in changes.items():
+        groups[tuple(sorted(fields))].append(wish_id)
+
+    updated: dict[int, Wish] = {}
+    table = Wish.__table__
+
+    for fields, wish_ids in groups.items():
+        if not fields:
+            # Nothing to set, only check ownership
+            result = await session.scalars(
+                select(Wish).where(
+                    Wish.id == _ids_param(wish_ids),
+                    Wish.user_id == user_id
+                )
+            )
+            updated.update({wish.id: wish for wish in result})
+            continue
+
+        data = values(
+            column("id", BigInteger),
+            *(column(field, table.c[field].type) for field in fields),
+            name="data",
+        ).data([
+            (wish_id, *(changes[wish_id][field] for field in fields))
+            for wish_id in wish_ids
+        ])
+
+        result = await session.scalars(
+            update(Wish)
+            .where(Wish.id == data.c.id, Wish.user_id == user_id)
+            .values({
+                field: cast(data.c[field], table.c[field].type)
+                for field in fields
+            })
+            .returning(Wish),
+            execution_options={
+                "synchronize_session": False,
+                "populate_existing": True,
+            },
+        )
+        updated.update({wish.id: wish for wish in result})
+
+    return updated
+
+
+async def update_wish(
+    session: AsyncSession,
+    user_id: int,
+    wish_id: int,
+    fields: dict[str, Any]
+) -> Optional[Wish]:
+    """
+    Update user's wish with a single UPDATE ... RETURNING
+
+    Returns:
+        Optional[Wish]: Updated wish, None if not found
+    """
+    if not fields:
+        result = await session.scalars(
+            select(Wish).where(Wish.id == wish_id, Wish.user_id == user_id)
+        )
+        return result.one_or_none()
+
+    result = await session.scalars(
+        update(Wish)
+        .where(Wish.id == wish_id, Wish.user_id == user_id)
+        .values(fields)
+        .returning(Wish),
+        execution_options={
+            "synchronize_session": False,
+            "populate_existing": True,
+        },
+    )
+    return result.one_or_none()
+
+
+async def complete_wish(
+    session: AsyncSession,
+    user_id: int,
+    wish_id: int
+) -> Optional[Wish]:
+    """
+    Mark user's wish as completed, setting completed_at server-side
+
+    Returns:
+        Optional[Wish]: Completed wish, None if not found
+    """
+    return await update_wish(session, user_id, wish_id, {
+        "status": WishStatus.COMPLETED,
+        "completed_at": func.now(),
+    })
+
+
+async def delete_wishes(
+    session: AsyncSession,
+    user_id: int,
+    wish_ids: Sequence[int]
+) -> dict[int, str]:
+    """
+    Delete user's wishes with DELETE ... WHERE id = ANY(...) RETURNING
+
+    Reservations of the deleted wishes are removed by a data-modifying CTE
+    of the same statement.
+
+    Returns:
+        dict[int, str]: Titles of deleted wishes by ID
+    """
+    if not wish_ids:
+        return {}
+
+    owned = (
+        Wish.id == _ids_param(wish_ids)
+    ) & (Wish.user_id == user_id)
+
+    deleted_reservations = (
+        delete(Reservation)
+        .where(Reservation.wish_id.in_(select(Wish.id).where(owned)))
+        .returning(Reservation.id)
+        .cte("deleted_reservations")
+    )
+    result = await session.execute(
+        delete(Wish)
+        .where(owned)
+        .add_cte(deleted_reservations)
+        .returning(Wish.id, Wish.title),
+        execution_options={"synchronize_session": False},
+    )
+    return {row.id: row.title for row in result}
+
+
+async def delete_wish(
+    session: AsyncSession,
+    user_id: int,
+    wish_id: int
+) -> Optional[str]:
+    """
+    Delete user's wish in a single statement
+
+    Returns:
+        Optional[str]: Title of the deleted wish, None if not found
+    """
+    deleted = await delete_wishes(session, user_id, [wish_id])
+    return deleted.get(wish_id)
+
+
+# Spacing between consecutive order_index values after rebalancing
+ORDER_INDEX_STEP = 1024
+
+# Position within a priority group (see WISH_LIST_ORDER)
+GROUP_ORDER = (Wish.order_index.asc(), Wish.created_at.desc(), Wish.id.desc())
+
+
+async def rebalance_order(session: AsyncSession, user_id: int) -> None:
+    """
+    Renumber user's order_index evenly within each (status, priority) group
+
+    Keeps the current order and only rewrites rows whose value changes.
+    """
+    positions = select(
+        Wish.id,
+        (func.row_number().over(
+            partition_by=(Wish.status, Wish.priority),
+            order_by=GROUP_ORDER,
+        ) * ORDER_INDEX_STEP).label("order_index"),
+    ).where(Wish.user_id == user_id).subquery()
+
+    await session.execute(
+        update(Wish)
+        .where(
+            Wish.id == positions.c.id,
+            Wish.order_index.is_distinct_from(positions.c.order_index)
+        )
+        .values(order_index=positions.c.order_index),
+        execution_options={"synchronize_session": False},
+    )
+
+
+async def move_wish(
+    session: AsyncSession,
+    user_id: int,
+    wish_id: int,
+    anchor_id: int,
+    place_after: bool
+) -> tuple[Optional[Wish], bool]:
+    """
+    Move wish right after (or before) the anchor wish
+
+    Takes the midpoint between the anchor and its current neighbour, so
+    the common case updates a single row. The wish adopts the anchor's
+    priority. When there is no gap left the user's list is rebalanced
+    first.
+
+    Args:
+        session: Database session
+        user_id: Owner of the wishes
+        wish_id: Wish to move
+        anchor_id: Wish to place it next to
+        place_after: Place after the anchor if true, before it otherwise
+
+    Returns:
+        Moved wish (None if either wish is not found) and whether the
+        gaps around it are exhausted and a rebalance should be scheduled
+
+    Raises:
+        ValueError: Anchor is in a different list than the wish
+    """
+    for attempt in range(2):
+        result = await session.execute(
+            select(Wish.id, Wish.status, Wish.priority, Wish.order_index, Wish.created_at)
+            .where(Wish.id.in_([wish_id, anchor_id]), Wish.user_id == user_id)
+        )
+        rows = {row.id: row for row in result}
+        if wish_id not in rows or anchor_id not in rows:
+            return None, False
+
+        anchor = rows[anchor_id]
+        if anchor.status != rows[wish_id].status:
+            raise ValueError(
+                f"Anchor wish is {anchor.status.value}, "
+                f"the moved wish is {rows[wish_id].status.value}"
+            )
+
+        group_order = GROUP_ORDER if place_after else tuple(
+            clause.element.desc() if clause.modifier is operators.asc_op
+            else clause.element.asc()
+            for clause in GROUP_ORDER
+        )
+
+        # Current neighbour on the target side of the anchor
+        result = await session.execute(
+            select(Wish.order_index)
+            .where(
+                Wish.user_id == user_id,
+                Wish.status == anchor.status,
+                Wish.priority == anchor.priority,
+                Wish.id != wish_id,
+                keyset_after(
+                    group_order,
+                    [anchor.order_index, anchor.created_at, anchor.id]
+                ),
+            )
+            .order_by(*group_order)
+            .limit(1)
+        )
+        neighbour = result.scalar_one_or_none()
+
+        step = ORDER_INDEX_STEP if place_after else -ORDER_INDEX_STEP
+        if neighbour is None:
+            order_index = anchor.order_index + step
+            exhausted = False
+            break
+
+        if abs(neighbour - anchor.order_index) >= 2:
+            order_index = (anchor.order_index + neighbour) // 2
+            exhausted = min(
+                abs(order_index - anchor.order_index),
+                abs(neighbour - order_index)
+            ) < 2
+            break
+
+        # No gap between anchor and neighbour
+        if attempt:
+            raise RuntimeError("No order_index gap after rebalancing")
+        await rebalance_order(session, user_id)
+
+    result = await session.scalars(
+        update(Wish)
+        .where(Wish.id == wish_id, Wish.user_id == user_id)
+        .values(order_index=order_index, priority=anchor.priority)
+        .returning(Wish),
+        execution_options={
+            "synchronize_session": False,
+            "populate_existing": True,
+        },
+    )
+    return result.one(), exhausted
@@ -0,0 +1,82 @@
+"""
+Serialization cost of wish lists, before and after the orjson path
+
+    python -m tests.bench_serialization [--repeat N]
+
+"before" is what FastAPI did for `response_model=list` endpoints: walk ORM
+objects with jsonable_encoder and render with json.dumps. "after" is the
+current path: validate through the TypeAdapter of list[Wish] built once,
+dump in JSON mode and render with ORJSONResponse.
+"""
+import argparse
+import json
+import timeit
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+import tests.conftest  # noqa: F401  (test settings, all models mapped)
+from app.core.responses import ORJSONResponse
+from app.models.wish import Wish, WishStatus
+from app.schemas.wish import Wish as WishSchema
+
+SIZES = (100, 1000)
+
+adapter = TypeAdapter(list[WishSchema])
+response = ORJSONResponse(None)
+
+
+def make_wishes(count: int) -> list[Wish]:
+    created = datetime(2026, 1, 1)
+    return [
+        Wish(
+            id=i,
+            user_id=1,
+            title=f"Wish number {i}",
+            description="Some description of the wish " * 3,
+            link=f"https://example.com/item/{i}",
+            price=Decimal("1999.90") + i,
+            currency="RUB",
+            priority=1 + i % 4,
+            status=WishStatus.ACTIVE,
+            order_index=i * 1024,
+            is_public=True,
+            created_at=created + timedelta(minutes=i),
+        )
+        for i in range(count)
+    ]
+
+
+def render_before(wishes: list[Wish]) -> bytes:
+    return json.dumps(
+        jsonable_encoder(wishes),
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode()
+
+
+def render_after(wishes: list[Wish]) -> bytes:
+    validated = adapter.validate_python(wishes, from_attributes=True)
+    return response.render(adapter.dump_python(validated, mode="json"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'items':>6} {'before, ms':>11} {'after, ms':>10} {'speedup':>8}")
+    for size in SIZES:
+        wishes = make_wishes(size)
+        before, after = (
+            min(timeit.repeat(lambda: render(wishes), number=1, repeat=args.repeat)) * 1000
+            for render in (render_before, render_after)
+        )
+        print(f"{size:>6} {before:>11.3f} {after:>10.3f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Update queue throughput and latency by worker count
+
+    python -m tests.bench_update_queue [--chats N] [--updates N]
+
+Many chats send bursts of updates whose handlers wait on I/O, while one
+chat's handlers are slow. Per worker count it reports the total time and
+the queue wait of updates of the other chats: with per-chat ordering on a
+worker pool, adding workers scales throughput and the slow chat holds a
+single worker without delaying anyone else.
+"""
+import argparse
+import asyncio
+import time
+
+from aiogram.types import Update
+
+import tests.conftest  # noqa: F401  (test settings)
+from app.bot.queue import LatencyStats, UpdateQueue
+
+WORKERS = (1, 4, 16, 64)
+SLOW_CHAT = 0
+
+
+def make_update(update_id: int, chat_id: int) -> Update:
+    return Update.model_validate({
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": 0,
+            "chat": {"id": chat_id, "type": "private"},
+            "text": "/start",
+        },
+    })
+
+
+class FakeDispatcher:
+    """Records handled updates, handlers sleep for delay(chat_id) seconds"""
+
+    def __init__(self, delay=lambda chat_id: 0.0):
+        self.delay = delay
+        self.handled: list[tuple[int, int]] = []
+        self.running: set[int] = set()
+        self.overlaps = 0
+
+    async def feed_update(self, bot, update: Update) -> None:
+        chat_id = update.message.chat.id
+        if chat_id in self.running:
+            self.overlaps += 1
+        self.running.add(chat_id)
+        try:
+            await asyncio.sleep(self.delay(chat_id))
+            self.handled.append((chat_id, update.update_id))
+        finally:
+            self.running.discard(chat_id)
+
+
+async def measure(workers: int, chats: int, updates: int) -> tuple[float, dict]:
+    """Total seconds and queue wait stats of the chats other than SLOW_CHAT"""
+    dp = FakeDispatcher(lambda chat_id: 0.2 if chat_id == SLOW_CHAT else 0.005)
+    queue = UpdateQueue(dp, None, workers=workers, maxsize=chats * updates, chat_maxsize=updates)
+
+    submitted: dict[int, float] = {}
+    others_wait = LatencyStats()
+    feed_update = dp.feed_update
+
+    async def timed_feed_update(bot, update):
+        if update.message.chat.id != SLOW_CHAT:
+            others_wait.record(time.monotonic() - submitted[update.update_id])
+        await feed_update(bot, update)
+
+    dp.feed_update = timed_feed_update
+
+    started = time.monotonic()
+    queue.start()
+    update_id = 0
+    for _ in range(updates):
+        for chat_id in range(chats):
+            update_id += 1
+            submitted[update_id] = time.monotonic()
+            assert queue.submit(make_update(update_id, chat_id))
+    await queue.stop(timeout=600)
+    assert dp.overlaps == 0
+
+    return time.monotonic() - started, others_wait.snapshot()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--chats", type=int, default=200)
+    parser.add_argument("--updates", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{args.chats} chats x {args.updates} updates, chat {SLOW_CHAT} is slow")
+    print(f"{'workers':>7} {'total, s':>9} {'wait p50, ms':>13} {'wait p95, ms':>13}")
+    for workers in WORKERS:
+        total, wait = asyncio.run(measure(workers, args.chats, args.updates))
+        print(f"{workers:>7} {total:>9.2f} {wait['p50_ms']:>13} {wait['p95_ms']:>13}")
+
+
+if __name__ == "__main__":
+    main()
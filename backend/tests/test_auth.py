@@ -0,0 +1,47 @@
+import hashlib
+import hmac
+import json
+import time
+from urllib.parse import urlencode
+
+from app.api.deps import _init_data_key, get_current_principal, init_data_cache
+from app.core.security import WEB_APP_SECRET_KEY, verify_telegram_web_app_data
+from app.schemas.auth import Principal
+
+from tests.conftest import run
+
+
+def make_init_data(telegram_id: int = 42, auth_date: int = 0) -> str:
+    """Build initData signed like Telegram does"""
+    fields = {
+        "auth_date": str(auth_date or int(time.time())),
+        "query_id": "AAH",
+        "user": json.dumps({"id": telegram_id, "first_name": "Test"}),
+    }
+    check_string = "\n".join(f"{k}={v}" for k, v in sorted(fields.items()))
+    fields["hash"] = hmac.new(
+        WEB_APP_SECRET_KEY, check_string.encode(), hashlib.sha256
+    ).hexdigest()
+    return urlencode(fields)
+
+
+def test_signed_init_data_is_verified():
+    parsed = verify_telegram_web_app_data(make_init_data(telegram_id=7))
+    assert json.loads(parsed["user"])["id"] == 7
+
+
+def test_principal_from_cached_init_data_skips_database(session_factory, statements):
+    init_data = make_init_data()
+    principal = Principal(id=1, telegram_id=42)
+    init_data_cache.set(_init_data_key(init_data), principal)
+
+    async def main():
+        async with session_factory() as session:
+            return await get_current_principal(
+                x_telegram_init_data=init_data,
+                credentials=None,
+                session=session
+            )
+
+    assert run(main()) == principal
+    assert statements == []
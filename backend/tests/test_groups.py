@@ -0,0 +1,119 @@
+import pytest
+
+from app.models import User, Wish
+from app.models.group import Group, GroupMember, GroupRole
+
+from tests.conftest import auth_headers, run
+
+
+def seed_groups(session_factory, count):
+    async def main():
+        async with session_factory() as session:
+            session.add_all([
+                User(id=u, telegram_id=u, first_name=f"user {u}") for u in (1, 2, 3)
+            ])
+            session.add_all([
+                Group(id=g, name=f"group {g}", creator_id=1) for g in range(1, count + 1)
+            ])
+            await session.flush()
+            for g in range(1, count + 1):
+                session.add(GroupMember(group_id=g, user_id=1, role=GroupRole.OWNER))
+                # Different member counts per group
+                session.add_all([
+                    GroupMember(group_id=g, user_id=u, role=GroupRole.MEMBER)
+                    for u in (2, 3)[:g % 3]
+                ])
+            await session.commit()
+
+    run(main())
+
+
+def get_groups(client):
+    async def main():
+        async with client() as http:
+            return await http.get("/api/groups/", headers=auth_headers(1))
+
+    return run(main())
+
+
+def test_group_list_has_member_counts(session_factory, client):
+    seed_groups(session_factory, 3)
+
+    response = get_groups(client)
+
+    assert response.status_code == 200
+    counts = {g["id"]: g["member_count"] for g in response.json()}
+    assert counts == {1: 2, 2: 3, 3: 1}
+
+
+@pytest.mark.parametrize("group_count", [1, 10])
+def test_group_list_is_one_statement(session_factory, client, statements, group_count):
+    seed_groups(session_factory, group_count)
+    statements.clear()
+
+    response = get_groups(client)
+
+    assert len(response.json()) == group_count
+    # ETag version lookup, then the groups with member counts
+    assert len(statements) == 2
+    assert "member_count" in statements[1]
+
+
+def test_group_feed_hides_private_notes(session_factory, client):
+    seed_groups(session_factory, 2)
+
+    async def main():
+        async with session_factory() as session:
+            session.add(Wish(id=1, user_id=2, title="Bike", notes="bought one already"))
+            await session.commit()
+
+        async with client() as http:
+            return await http.get("/api/groups/2/wishes", headers=auth_headers(1))
+
+    response = run(main())
+
+    assert response.status_code == 200
+    [item] = response.json()["items"]
+    assert item["title"] == "Bike"
+    assert "notes" not in item
+
+
+def get_group(client, user_id, **headers):
+    async def main():
+        async with client() as http:
+            return await http.get(
+                "/api/groups/1",
+                headers={**auth_headers(user_id), **headers}
+            )
+
+    return run(main())
+
+
+def test_group_etag_reuses_resolved_role(session_factory, client, statements):
+    seed_groups(session_factory, 1)
+    statements.clear()
+
+    response = get_group(client, 1)
+
+    assert response.status_code == 200
+    # Group with the role, then the version without a membership join
+    assert len(statements) == 2
+    assert "group_members.role" in statements[0]
+    assert "FROM groups \nWHERE groups.id" in statements[1]
+
+    statements.clear()
+    cached = get_group(client, 1, **{"If-None-Match": response.headers["ETag"]})
+
+    assert cached.status_code == 304
+    assert len(statements) == 1
+
+
+def test_group_etag_rejects_non_members(session_factory, client, statements):
+    seed_groups(session_factory, 1)
+    statements.clear()
+
+    response = get_group(client, 3)
+
+    assert response.status_code == 403
+    assert "ETag" not in response.headers
+    assert len(statements) == 1
@@ -0,0 +1,24 @@
+from app.core.config import settings
+
+from tests.conftest import run
+
+
+def get_metrics(client, headers=None) -> int:
+    async def main():
+        async with client() as http:
+            return (await http.get("/metrics", headers=headers)).status_code
+
+    return run(main())
+
+
+def test_metrics_are_disabled_by_default(client):
+    assert settings.METRICS_TOKEN is None
+    assert get_metrics(client, {"X-Metrics-Token": ""}) == 404
+
+
+def test_metrics_require_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "metrics-secret")
+
+    assert get_metrics(client) == 401
+    assert get_metrics(client, {"X-Metrics-Token": "wrong"}) == 401
+    assert get_metrics(client, {"X-Metrics-Token": "metrics-secret"}) == 200
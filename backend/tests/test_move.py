@@ -0,0 +1,66 @@
+from datetime import datetime
+
+from app.models import User, Wish
+from app.models.wish import WishStatus
+
+from tests.conftest import auth_headers, run
+
+
+def seed(session_factory):
+    # Explicit timestamps: SQLite stores server defaults in another format
+    # than bound datetimes, which breaks created_at comparisons
+    created = datetime(2026, 1, 1)
+
+    async def main():
+        async with session_factory() as session:
+            session.add_all([
+                User(id=1, telegram_id=1, first_name="A"),
+                User(id=2, telegram_id=2, first_name="B"),
+            ])
+            await session.flush()
+            session.add_all([
+                Wish(id=1, user_id=1, title="first", order_index=1000, created_at=created),
+                Wish(id=2, user_id=1, title="second", order_index=2000, created_at=created),
+                Wish(id=3, user_id=1, title="done", status=WishStatus.COMPLETED, created_at=created),
+                Wish(id=4, user_id=2, title="foreign", created_at=created),
+            ])
+            await session.commit()
+
+    run(main())
+
+
+def move(client, wish_id, **body):
+    async def main():
+        async with client() as http:
+            return await http.post(
+                f"/api/wishes/{wish_id}/move",
+                json=body,
+                headers=auth_headers(1)
+            )
+
+    return run(main())
+
+
+def test_move_after_anchor(session_factory, client):
+    seed(session_factory)
+
+    response = move(client, 1, after_id=2)
+
+    assert response.status_code == 200
+    assert response.json()["order_index"] > 2000
+
+
+def test_move_next_to_wish_of_other_list_is_bad_request(session_factory, client):
+    seed(session_factory)
+
+    response = move(client, 1, after_id=3)
+
+    assert response.status_code == 400
+    assert "completed" in response.json()["detail"]
+
+
+def test_move_missing_or_foreign_wish_is_not_found(session_factory, client):
+    seed(session_factory)
+
+    assert move(client, 1, after_id=4).status_code == 404
+    assert move(client, 99, after_id=1).status_code == 404
@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+
+from app.core.pagination import decode_cursor, encode_cursor, keyset_after
+from app.models import User, Wish
+from app.models.wish import WISH_CURSOR_TYPES, WISH_LIST_ORDER
+
+from tests.conftest import auth_headers, run
+
+
+def test_cursor_round_trip():
+    values = [3, 10, datetime(2026, 1, 2, 3, 4, 5), 99]
+    assert decode_cursor(encode_cursor(values), WISH_CURSOR_TYPES) == values
+
+
+def test_malformed_cursor_is_rejected():
+    with pytest.raises(HTTPException) as e:
+        decode_cursor("not-a-cursor", WISH_CURSOR_TYPES)
+    assert e.value.status_code == 400
+
+
+def test_mixed_direction_seek_has_sargable_leading_bound():
+    predicate = keyset_after(WISH_LIST_ORDER, [3, 10, datetime(2026, 1, 1), 99])
+    sql = str(predicate.compile(dialect=postgresql.dialect()))
+
+    assert sql.startswith("wishes.priority <= ")
+    assert " OR " in sql
+
+
+def test_same_direction_seek_is_row_comparison():
+    predicate = keyset_after((Wish.priority.desc(), Wish.id.desc()), [3, 99])
+    sql = str(predicate.compile(dialect=postgresql.dialect()))
+
+    assert sql.startswith("(wishes.priority, wishes.id) < (")
+
+
+def test_cursor_pages_cover_all_wishes_in_order(session_factory, client):
+    created = datetime(2026, 1, 1)
+
+    async def main():
+        async with session_factory() as session:
+            session.add(User(id=1, telegram_id=1, first_name="A"))
+            await session.flush()
+            for i in range(25):
+                session.add(Wish(
+                    id=i + 1,
+                    user_id=1,
+                    title=f"wish {i}",
+                    priority=1 + i % 4,
+                    order_index=i % 3,
+                    created_at=created + timedelta(minutes=i),
+                ))
+            await session.commit()
+
+        seen = []
+        cursor = None
+        async with client() as http:
+            while True:
+                params = {"page_size": 4, "include_total": "false"}
+                if cursor:
+                    params["cursor"] = cursor
+                response = await http.get("/api/wishes/", params=params, headers=auth_headers(1))
+                assert response.status_code == 200
+                page = response.json()
+                seen += [(w["priority"], w["order_index"], w["id"]) for w in page["items"]]
+                cursor = page["next_cursor"]
+                if not cursor:
+                    return seen
+
+    seen = run(main())
+
+    assert len(seen) == len({wish_id for _, _, wish_id in seen}) == 25
+    assert seen == sorted(seen, key=lambda w: (-w[0], w[1], -w[2]))
+
+
+def test_list_order_fields_cannot_be_set_to_null(session_factory, client):
+    async def main():
+        async with session_factory() as session:
+            session.add(User(id=1, telegram_id=1, first_name="A"))
+            await session.flush()
+            session.add(Wish(id=1, user_id=1, title="wish"))
+            await session.commit()
+
+        async with client() as http:
+            return [
+                (await http.put("/api/wishes/1", json=body, headers=auth_headers(1))).status_code
+                for body in ({"priority": None}, {"order_index": None}, {"title": "renamed"})
+            ]
+
+    # Omitting them is still fine
+    assert run(main()) == [422, 422, 200]
@@ -0,0 +1,78 @@
+import asyncio
+
+from app.models import User, Wish
+
+from tests.conftest import run
+
+
+def seed(session_factory):
+    async def main():
+        async with session_factory() as session:
+            session.add(User(id=1, telegram_id=1, first_name="A"))
+            await session.flush()
+            session.add_all([
+                Wish(id=1, user_id=1, title="Public", notes="private"),
+                Wish(id=2, user_id=1, title="Hidden", is_public=False),
+            ])
+            await session.commit()
+
+    run(main())
+
+
+def test_burst_of_link_opens_costs_one_version_and_one_list_query(
+    session_factory, client, statements
+):
+    seed(session_factory)
+    statements.clear()
+
+    async def burst():
+        async with client() as http:
+            return await asyncio.gather(*(
+                http.get("/api/user/1/wishes") for _ in range(10)
+            ))
+
+    responses = run(burst())
+
+    assert {r.status_code for r in responses} == {200}
+    assert len({r.content for r in responses}) == 1
+    assert len(statements) == 2
+
+    # Within max-age neither the version nor the page is read again
+    statements.clear()
+    assert {r.status_code for r in run(burst())} == {200}
+    assert statements == []
+
+
+def test_public_wishes_answer_conditional_requests(session_factory, client):
+    seed(session_factory)
+
+    async def main():
+        async with client() as http:
+            first = await http.get("/api/user/1/wishes")
+            again = await http.get(
+                "/api/user/1/wishes",
+                headers={"If-None-Match": first.headers["ETag"]}
+            )
+            return first, again
+
+    first, again = run(main())
+
+    assert [w["title"] for w in first.json()["items"]] == ["Public"]
+    assert "notes" not in first.json()["items"][0]
+    assert first.headers["Cache-Control"].startswith("public, max-age=")
+    assert again.status_code == 304
+
+
+def test_unknown_user_is_not_found_and_not_cached(session_factory, client):
+    async def get():
+        async with client() as http:
+            return await http.get("/api/user/1/wishes")
+
+    missing = run(get())
+    seed(session_factory)
+    created = run(get())
+
+    assert missing.status_code == 404
+    assert "Cache-Control" not in missing.headers
+    # Found as soon as the user exists
+    assert created.status_code == 200
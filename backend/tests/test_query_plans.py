@@ -0,0 +1,187 @@
+"""
+EXPLAIN regressions for the wish listings
+
+The listings must be served by the ix_wishes_*_order indexes. A query whose
+filters stop implying the partial index predicate, or whose ORDER BY drifts
+from the index order, falls back to a scan plus sort, which these tests catch.
+"""
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import and_, event
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.api.wishes import get_wishes
+from app.core.pagination import encode_cursor
+from app.models import User, Wish
+from app.models.group import Group, GroupMember, GroupRole
+from app.models.wish import PUBLIC_WISH_FILTER, PUBLIC_WISH_PREDICATE, WishStatus
+from app.schemas.auth import Principal
+from app.services.groups import get_group_feed
+from app.services.wishes import get_public_wishes
+
+from tests.conftest import run
+
+USERS = 20
+WISHES_PER_USER = 50
+MEMBERS = range(1, 6)
+CURSOR = encode_cursor([2, 1, datetime(2026, 1, 1), 10])
+
+
+def test_public_filter_renders_partial_index_predicate():
+    sql = str(and_(*PUBLIC_WISH_FILTER).compile(dialect=postgresql.dialect()))
+
+    # Same shape as the index predicate, without parameters
+    assert PUBLIC_WISH_PREDICATE == "status = 'ACTIVE' AND is_public"
+    assert sql == "wishes.status = 'ACTIVE' AND wishes.is_public = true"
+
+
+@pytest.fixture
+def pg_session_factory(pg_engine):
+    """PostgreSQL database with enough analyzed wishes for index plans"""
+    created = datetime(2026, 1, 1)
+
+    async def seed():
+        async with async_sessionmaker(pg_engine, class_=AsyncSession)() as session:
+            session.add_all([
+                User(id=u, telegram_id=u, first_name=f"user {u}")
+                for u in range(1, USERS + 1)
+            ])
+            session.add(Group(id=1, name="group", creator_id=1))
+            await session.flush()
+            session.add_all([
+                GroupMember(group_id=1, user_id=u, role=GroupRole.MEMBER)
+                for u in MEMBERS
+            ])
+            session.add_all([
+                Wish(
+                    user_id=u,
+                    title=f"wish {i}",
+                    priority=1 + i % 4,
+                    order_index=i % 7,
+                    status=WishStatus.ACTIVE if i % 5 else WishStatus.COMPLETED,
+                    is_public=bool(i % 3),
+                    created_at=created + timedelta(minutes=i),
+                )
+                for u in range(1, USERS + 1)
+                for i in range(WISHES_PER_USER)
+            ])
+            await session.commit()
+
+        async with pg_engine.connect() as conn:
+            await conn.exec_driver_sql("ANALYZE")
+
+    run(seed())
+    return async_sessionmaker(pg_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+def plan_nodes(plan: dict):
+    """Nodes of a JSON plan, depth first"""
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def explain(session_factory, call) -> list[dict]:
+    """
+    Plan of the last query run by call(session)
+
+    Sequential scans are disabled so the tiny test tables do not hide
+    whether an index can serve the query at all.
+    """
+    engine = session_factory.kw["bind"]
+    queries = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if context.compiled is not None:
+            queries.append(context.compiled.statement)
+
+    async def main():
+        event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            async with session_factory() as session:
+                await call(session)
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+        sql = str(queries[-1].compile(
+            dialect=engine.dialect,
+            compile_kwargs={"literal_binds": True}
+        ))
+        async with engine.connect() as conn:
+            await conn.exec_driver_sql("SET enable_seqscan = off")
+            result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")
+            plan = result.scalar()
+
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return list(plan_nodes(plan[0]["Plan"]))
+
+    return run(main())
+
+
+def index_names(nodes) -> set[str]:
+    return {node["Index Name"] for node in nodes if "Index Name" in node}
+
+
+def sorts(nodes) -> list[str]:
+    return [node["Node Type"] for node in nodes if node["Node Type"].endswith("Sort")]
+
+
+def own_wishes(cursor=None):
+    async def call(session):
+        await get_wishes(
+            page=1,
+            page_size=20,
+            cursor=cursor,
+            include_total=False,
+            wish_status=WishStatus.ACTIVE,
+            category_id=None,
+            search=None,
+            current_user=Principal(id=1, telegram_id=1),
+            session=session,
+        )
+
+    return call
+
+
+@pytest.mark.parametrize("cursor", [None, CURSOR])
+def test_own_wishes_use_status_order_index(pg_session_factory, cursor):
+    nodes = explain(pg_session_factory, own_wishes(cursor))
+
+    assert "ix_wishes_user_status_order" in index_names(nodes)
+    assert sorts(nodes) == []
+
+
+@pytest.mark.parametrize("after", [None, [2, 1, datetime(2026, 1, 1), 10]])
+def test_public_wishes_use_partial_index(pg_session_factory, after):
+    nodes = explain(
+        pg_session_factory,
+        lambda session: get_public_wishes(session, 1, 20, after)
+    )
+
+    assert "ix_wishes_user_public_order" in index_names(nodes)
+    assert sorts(nodes) == []
+
+
+def test_member_feed_uses_partial_index_without_sort(pg_session_factory):
+    nodes = explain(
+        pg_session_factory,
+        lambda session: get_group_feed(session, 1, 1, 20, member_id=2)
+    )
+
+    assert "ix_wishes_user_public_order" in index_names(nodes)
+    assert sorts(nodes) == []
+
+
+def test_group_feed_uses_partial_index(pg_session_factory):
+    # Wishes of several members are merged into one order: the index only
+    # serves the per-member lookups, a top-N sort over them is expected
+    nodes = explain(
+        pg_session_factory,
+        lambda session: get_group_feed(session, 1, 1, 20)
+    )
+
+    assert "ix_wishes_user_public_order" in index_names(nodes)
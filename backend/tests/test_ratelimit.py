@@ -0,0 +1,138 @@
+import asyncio
+import time
+
+import pytest
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import SendDocument, SendMediaGroup, SendMessage
+from aiogram.types import BufferedInputFile, InputMediaPhoto
+
+from app.bot.files import AsyncIterableInputFile
+from app.bot.ratelimit import (
+    BotRateLimiter,
+    Priority,
+    RateLimitMiddleware,
+    TokenBucket,
+    is_replayable,
+    priority,
+)
+
+from tests.conftest import run
+
+
+async def chunks():
+    yield b"id,title\n"
+
+
+def make_limiter() -> BotRateLimiter:
+    return BotRateLimiter(global_rate=1000, chat_rate=1000, group_rate=1000, chat_burst=10)
+
+
+def flaky_request(failures: int, retry_after: int = 0):
+    """Fake make_request failing with flood control the first times"""
+    calls = []
+
+    async def make_request(bot, method):
+        calls.append(method)
+        if len(calls) <= failures:
+            raise TelegramRetryAfter(method, "Flood control exceeded", retry_after)
+        return "ok"
+
+    return make_request, calls
+
+
+def test_bucket_serves_waiters_in_arrival_order():
+    async def main():
+        bucket = TokenBucket(rate=200, capacity=1)
+        served = []
+
+        async def take(i):
+            await bucket.acquire()
+            served.append(i)
+
+        await asyncio.gather(*(take(i) for i in range(10)))
+        return served
+
+    assert run(main()) == list(range(10))
+
+
+def test_interactive_send_overtakes_queued_notifications():
+    sent = []
+
+    async def make_request(bot, method):
+        sent.append(method.text)
+        return "ok"
+
+    async def main():
+        # Only the global bucket throttles, without a burst
+        limiter = make_limiter()
+        limiter.global_bucket = TokenBucket(rate=50, capacity=1)
+        middleware = RateLimitMiddleware(limiter, max_retries=0)
+
+        async def notify(i):
+            await middleware(make_request, None, SendMessage(chat_id=i, text=f"notification {i}"))
+
+        async def reply():
+            with priority(Priority.INTERACTIVE):
+                await middleware(make_request, None, SendMessage(chat_id=100, text="reply"))
+
+        notifications = [asyncio.create_task(notify(i)) for i in range(1, 6)]
+        # Notifications 2-5 are queued behind the first one's token
+        await asyncio.sleep(0.005)
+        await asyncio.gather(reply(), *notifications)
+
+    run(main())
+
+    assert sent == [
+        "notification 1", "reply",
+        "notification 2", "notification 3", "notification 4", "notification 5",
+    ]
+
+
+def test_flood_control_pauses_all_chats():
+    async def main():
+        limiter = make_limiter()
+        limiter.pause(1, 0.2)
+
+        started = time.monotonic()
+        await limiter.acquire(2)
+        return time.monotonic() - started
+
+    assert run(main()) >= 0.15
+
+
+def test_rejected_message_is_retried():
+    make_request, calls = flaky_request(failures=1)
+    limiter = make_limiter()
+    middleware = RateLimitMiddleware(limiter, max_retries=3)
+
+    result = run(middleware(make_request, None, SendMessage(chat_id=1, text="hi")))
+
+    assert result == "ok"
+    assert len(calls) == 2
+    assert limiter.retried == 1
+
+
+def test_one_shot_upload_is_not_retried():
+    make_request, calls = flaky_request(failures=1)
+    middleware = RateLimitMiddleware(make_limiter(), max_retries=3)
+    method = SendDocument(
+        chat_id=1,
+        document=AsyncIterableInputFile(chunks(), filename="wishes.csv")
+    )
+
+    with pytest.raises(TelegramRetryAfter):
+        run(middleware(make_request, None, method))
+
+    assert len(calls) == 1
+
+
+def test_replayable_files_are_detected_in_media_groups():
+    buffered = BufferedInputFile(b"png", filename="a.png")
+    one_shot = AsyncIterableInputFile(chunks(), filename="b.png")
+
+    assert is_replayable(SendDocument(chat_id=1, document=buffered))
+    assert is_replayable(SendMediaGroup(chat_id=1, media=[InputMediaPhoto(media=buffered)]))
+    assert not is_replayable(SendMediaGroup(chat_id=1, media=[
+        InputMediaPhoto(media=buffered),
+        InputMediaPhoto(media=one_shot),
+    ]))
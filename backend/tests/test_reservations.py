@@ -0,0 +1,191 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+import httpx
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database import get_db
+from app.main import app as fastapi_app
+from app.models import User, Wish
+from app.models.group import Group, GroupMember, GroupRole
+from app.models.reservation import Reservation
+from app.services.reservations import cancel_reservation
+from app.services.versions import get_group_version
+
+from tests.conftest import auth_headers, run
+
+# Concurrent requests share a pool sized like the app's (see
+# app.core.database), as they would in production
+MEMBERS = 300
+POOL_SIZE = 10
+MAX_OVERFLOW = 20
+# Loose floor, only catches requests serializing on a lock
+MIN_REQUESTS_PER_SECOND = 50
+
+
+async def seed(session, wishes=1):
+    session.add_all([
+        User(id=u, telegram_id=u, first_name=f"user {u}") for u in range(1, MEMBERS + 1)
+    ])
+    session.add(Group(id=1, name="group", creator_id=1))
+    await session.flush()
+    session.add_all([
+        GroupMember(
+            group_id=1,
+            user_id=u,
+            role=GroupRole.OWNER if u == 1 else GroupRole.MEMBER
+        )
+        for u in range(1, MEMBERS + 1)
+    ])
+    session.add_all([Wish(id=w, user_id=1, title=f"wish {w}") for w in range(1, wishes + 1)])
+    await session.commit()
+
+
+@asynccontextmanager
+async def pooled_sessions(pg_engine):
+    """Session factory over a connection pool to the test database"""
+    engine = create_async_engine(
+        pg_engine.url, pool_size=POOL_SIZE, max_overflow=MAX_OVERFLOW
+    )
+    try:
+        yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    finally:
+        await engine.dispose()
+
+
+def test_second_reservation_conflicts(session_factory, client):
+    async def main():
+        async with session_factory() as session:
+            await seed(session)
+
+        async with client() as http:
+            url = "/api/groups/1/wishes/1/reservation"
+            return [
+                (await http.post(url, json={}, headers=auth_headers(user_id))).status_code
+                for user_id in (2, 3, 2, 1)
+            ]
+
+    # Winner, loser, winner again, owner
+    assert run(main()) == [201, 409, 200, 400]
+
+
+def test_cancelled_reservation_is_kept_and_revived(session_factory, client):
+    async def main():
+        async with session_factory() as session:
+            await seed(session)
+
+        async with client() as http:
+            url = "/api/groups/1/wishes/1/reservation"
+            codes = [
+                (await http.post(url, json={}, headers=auth_headers(2))).status_code,
+                (await http.delete(url, headers=auth_headers(2))).status_code,
+                (await http.delete(url, headers=auth_headers(2))).status_code,
+                (await http.post(url, json={"notes": "mine"}, headers=auth_headers(3))).status_code,
+                (await http.post(url, json={}, headers=auth_headers(2))).status_code,
+            ]
+
+        async with session_factory() as session:
+            reservations = (await session.scalars(select(Reservation))).all()
+        return codes, reservations
+
+    codes, reservations = run(main())
+
+    # Reserve, cancel, nothing left to cancel, another member, conflict
+    assert codes == [201, 204, 404, 201, 409]
+    assert [(r.reserved_by, r.notes, r.is_active) for r in reservations] == [(3, "mine", True)]
+
+
+async def post_reservations(sessions, requests) -> tuple[list[int], float]:
+    """
+    POST (wish_id, user_id) reservations concurrently through the app
+
+    Returns:
+        Status codes in request order and requests per second
+    """
+    async def override_get_db():
+        async with sessions() as session:
+            yield session
+
+    fastapi_app.dependency_overrides[get_db] = override_get_db
+    try:
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=fastapi_app),
+            base_url="http://test"
+        ) as http:
+            started = time.perf_counter()
+            responses = await asyncio.gather(*(
+                http.post(
+                    f"/api/groups/1/wishes/{wish_id}/reservation",
+                    json={},
+                    headers=auth_headers(user_id),
+                )
+                for wish_id, user_id in requests
+            ))
+            elapsed = time.perf_counter() - started
+    finally:
+        fastapi_app.dependency_overrides.clear()
+
+    return [r.status_code for r in responses], len(requests) / elapsed
+
+
+def test_concurrent_reservations_have_one_winner(pg_engine):
+    async def main():
+        async with pooled_sessions(pg_engine) as sessions:
+            async with sessions() as session:
+                await seed(session)
+
+            codes, rate = await post_reservations(
+                sessions, [(1, u) for u in range(2, MEMBERS + 1)]
+            )
+
+            async with sessions() as session:
+                stored = await session.scalar(select(func.count()).select_from(Reservation))
+        return codes, rate, stored
+
+    codes, rate, stored = run(main())
+    print(f"{len(codes)} requests for one wish: {rate:.0f} req/s")
+
+    assert sorted(codes) == [201] + [409] * (MEMBERS - 2)
+    assert stored == 1
+    assert rate >= MIN_REQUESTS_PER_SECOND
+
+
+def test_concurrent_reservations_in_one_group_leave_group_row_alone(pg_engine):
+    # Reservations take sequence versions instead of bumping the group row,
+    # so reservations of different wishes in a group do not queue on it
+    async def versions(sessions):
+        async with sessions() as session:
+            row = await session.scalar(select(Group.version).where(Group.id == 1))
+            return row, await get_group_version(session, 1)
+
+    async def main():
+        async with pooled_sessions(pg_engine) as sessions:
+            async with sessions() as session:
+                await seed(session, wishes=MEMBERS - 1)
+
+            before = await versions(sessions)
+            codes, rate = await post_reservations(
+                sessions, [(wish_id, wish_id + 1) for wish_id in range(1, MEMBERS)]
+            )
+            after_reserve = await versions(sessions)
+
+            async with sessions() as session:
+                await cancel_reservation(session, 1, 1, 2)
+                await session.commit()
+                reservation_versions = (await session.scalars(
+                    select(Reservation.version)
+                )).all()
+            after_cancel = await versions(sessions)
+        return codes, rate, reservation_versions, [before, after_reserve, after_cancel]
+
+    codes, rate, reservation_versions, [(row0, v0), (row1, v1), (row2, v2)] = run(main())
+    print(f"{len(codes)} requests for different wishes: {rate:.0f} req/s")
+
+    assert codes == [201] * (MEMBERS - 1)
+    assert rate >= MIN_REQUESTS_PER_SECOND
+    assert len(set(reservation_versions)) == MEMBERS - 1
+    assert row0 == row1 == row2
+    # Reserving and cancelling both change the group's data version
+    assert len({v0, v1, v2}) == 3
@@ -0,0 +1,24 @@
+from decimal import Decimal
+
+import orjson
+from pydantic import TypeAdapter
+
+from app.core.responses import ORJSONResponse
+from app.schemas.wish import Wish as WishSchema
+
+from tests.bench_serialization import make_wishes, render_after
+
+
+def test_decimal_is_rendered_as_number():
+    assert ORJSONResponse({"price": Decimal("10.50")}).body == b'{"price":10.5}'
+
+
+def test_typed_path_renders_wish_price_as_number():
+    wishes = make_wishes(2)
+    adapter = TypeAdapter(list[WishSchema])
+
+    items = orjson.loads(render_after(wishes))
+
+    assert items[0]["price"] == 1999.9
+    assert adapter.validate_python(items)[1].price == Decimal("2000.9")
+
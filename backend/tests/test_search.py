@@ -0,0 +1,79 @@
+from sqlalchemy import create_engine
+
+from app.core.database import Base
+from app.models import User, Wish
+from app.services.search import fts5_query
+
+from tests.conftest import auth_headers, run
+
+
+def test_fts5_query_quotes_prefix_tokens():
+    assert fts5_query(' red  "bike ') == '"red"* """bike"*'
+
+
+def test_schema_can_be_dropped_and_recreated(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'schema.db'}")
+    Base.metadata.create_all(engine)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    engine.dispose()
+
+
+def seed(session_factory):
+    async def main():
+        async with session_factory() as session:
+            session.add(User(id=1, telegram_id=1, first_name="A"))
+            await session.flush()
+            session.add_all([
+                Wish(id=1, user_id=1, title="Red bicycle", description="Road bike"),
+                Wish(id=2, user_id=1, title="Blue mug"),
+                Wish(id=3, user_id=1, title="Bicycle helmet"),
+            ])
+            await session.commit()
+
+    run(main())
+
+
+def search(client, term):
+    async def main():
+        async with client() as http:
+            return await http.get(
+                "/api/wishes/",
+                params={"search": term},
+                headers=auth_headers(1)
+            )
+
+    return run(main())
+
+
+def test_search_matches_prefixes(session_factory, client):
+    seed(session_factory)
+
+    response = search(client, "bicyc")
+
+    assert response.status_code == 200
+    assert {w["id"] for w in response.json()["items"]} == {1, 3}
+
+
+def test_blank_search_is_ignored(session_factory, client):
+    seed(session_factory)
+
+    response = search(client, "   ")
+
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == 3
+
+
+def test_search_index_follows_updates_and_deletes(session_factory, client):
+    seed(session_factory)
+
+    async def main():
+        async with session_factory() as session:
+            (await session.get(Wish, 2)).title = "Bicycle bell"
+            await session.delete(await session.get(Wish, 3))
+            await session.commit()
+
+    run(main())
+    response = search(client, "bicycle")
+
+    assert {w["id"] for w in response.json()["items"]} == {1, 2}
@@ -0,0 +1,116 @@
+import asyncio
+import random
+
+from app.bot.queue import UpdateQueue
+from app.bot.ratelimit import Priority, request_priority
+
+from tests.bench_update_queue import FakeDispatcher, make_update
+from tests.conftest import run
+
+
+def test_updates_of_a_chat_are_handled_in_order_one_at_a_time():
+    rng = random.Random(1)
+    dp = FakeDispatcher(lambda chat_id: rng.random() / 1000)
+
+    async def main():
+        queue = UpdateQueue(dp, None, workers=8, maxsize=1000, chat_maxsize=100)
+        queue.start()
+        for update_id in range(1, 301):
+            assert queue.submit(make_update(update_id, chat_id=update_id % 5))
+        await queue.stop(timeout=10)
+        return queue
+
+    queue = run(main())
+
+    assert dp.overlaps == 0
+    assert queue.processed == 300
+    for chat_id in range(5):
+        handled = [u for c, u in dp.handled if c == chat_id]
+        assert handled == sorted(handled) and len(handled) == 60
+    # Drained chats are forgotten
+    assert queue.metrics()["chats"] == 0
+
+
+def test_slow_chat_does_not_block_other_chats():
+    release = asyncio.Event()
+
+    class BlockingDispatcher(FakeDispatcher):
+        async def feed_update(self, bot, update):
+            if update.message.chat.id == 1:
+                await release.wait()
+            await super().feed_update(bot, update)
+
+    dp = BlockingDispatcher()
+
+    async def main():
+        queue = UpdateQueue(dp, None, workers=2, maxsize=100, chat_maxsize=10)
+        queue.start()
+        queue.submit(make_update(1, chat_id=1))
+        queue.submit(make_update(2, chat_id=1))
+        for update_id in range(3, 8):
+            queue.submit(make_update(update_id, chat_id=update_id))
+
+        await asyncio.sleep(0.05)
+        handled_while_blocked = list(dp.handled)
+        release.set()
+        await queue.stop(timeout=5)
+        return handled_while_blocked
+
+    handled_while_blocked = run(main())
+
+    assert [u for _, u in handled_while_blocked] == [3, 4, 5, 6, 7]
+    assert [u for c, u in dp.handled if c == 1] == [1, 2]
+
+
+def test_submit_rejects_when_chat_or_queue_is_full():
+    async def main():
+        # No workers: nothing is taken off the queue
+        queue = UpdateQueue(FakeDispatcher(), None, workers=0, maxsize=3, chat_maxsize=2)
+        queue.start()
+        results = [
+            queue.submit(make_update(1, chat_id=1)),
+            queue.submit(make_update(2, chat_id=1)),
+            queue.submit(make_update(3, chat_id=1)),  # chat full
+            queue.submit(make_update(4, chat_id=2)),
+            queue.submit(make_update(5, chat_id=3)),  # queue full
+        ]
+        return results, queue.rejected
+
+    assert run(main()) == ([True, True, False, True, False], 2)
+
+
+def test_put_waits_for_room():
+    dp = FakeDispatcher(lambda chat_id: 0.01)
+
+    async def main():
+        queue = UpdateQueue(dp, None, workers=1, maxsize=2, chat_maxsize=2)
+        queue.start()
+        for update_id in range(1, 6):
+            await queue.put(make_update(update_id, chat_id=1))
+            assert queue.qsize() <= 2
+        await queue.stop(timeout=5)
+
+    run(main())
+
+    assert [u for _, u in dp.handled] == [1, 2, 3, 4, 5]
+
+
+def test_updates_are_handled_with_interactive_priority():
+    priorities = []
+
+    class RecordingDispatcher(FakeDispatcher):
+        async def feed_update(self, bot, update):
+            priorities.append(request_priority.get())
+            await super().feed_update(bot, update)
+
+    async def main():
+        queue = UpdateQueue(RecordingDispatcher(), None, workers=2, maxsize=10, chat_maxsize=10)
+        queue.start()
+        queue.submit(make_update(1, chat_id=1))
+        await queue.stop(timeout=5)
+
+    run(main())
+
+    # Sends outside of update handling are notifications
+    assert priorities == [Priority.INTERACTIVE]
+    assert request_priority.get() == Priority.NOTIFICATION
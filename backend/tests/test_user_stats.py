@@ -0,0 +1,69 @@
+import asyncio
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models import User, Wish
+from app.models.user_stats import UserStats
+from app.services.user_stats import get_user_stats, reconcile_user_stats
+
+from tests.conftest import run
+
+
+def test_reconcile_corrects_drift(pg_engine):
+    sessions = async_sessionmaker(pg_engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def main():
+        async with sessions() as session:
+            session.add(User(id=1, telegram_id=1, first_name="A"))
+            await session.flush()
+            session.add(Wish(user_id=1, title="wish", price=100, currency="RUB"))
+            await session.commit()
+
+            await session.execute(
+                update(UserStats).where(UserStats.user_id == 1).values(active_count=5)
+            )
+            await session.commit()
+
+            assert await reconcile_user_stats(session, 1)
+            assert not await reconcile_user_stats(session, 1)
+            await session.commit()
+
+            session.expire_all()
+            return await get_user_stats(session, 1)
+
+    stats = run(main())
+
+    assert stats.active_count == 1
+    assert stats.price_totals == {"RUB": 100}
+
+
+def test_reconcile_keeps_concurrent_trigger_increment(pg_engine):
+    sessions = async_sessionmaker(pg_engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def main():
+        async with sessions() as session:
+            session.add(User(id=1, telegram_id=1, first_name="A"))
+            await session.commit()
+
+        async def reconcile():
+            async with sessions() as session:
+                await reconcile_user_stats(session, 1)
+                await session.commit()
+
+        async with sessions() as writer:
+            # Trigger has applied its delta, the transaction is still open
+            writer.add(Wish(user_id=1, title="wish"))
+            await writer.flush()
+
+            reconciling = asyncio.create_task(reconcile())
+            await asyncio.sleep(0.5)
+            assert not reconciling.done()  # waiting for the stats row lock
+
+            await writer.commit()
+            await reconciling
+
+        async with sessions() as session:
+            return await get_user_stats(session, 1)
+
+    assert run(main()).active_count == 1
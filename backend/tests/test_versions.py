@@ -0,0 +1,77 @@
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models import User, Wish
+from app.models.group import Group, GroupMember, GroupRole
+from app.models.user_stats import UserStats
+from app.services.versions import get_group_version
+
+from tests.conftest import run
+
+
+async def seed_group(session):
+    session.add_all([
+        User(id=u, telegram_id=u, first_name=f"user {u}") for u in (1, 2, 3)
+    ])
+    session.add(Group(id=1, name="group", creator_id=1))
+    await session.flush()
+    session.add_all([
+        GroupMember(group_id=1, user_id=1, role=GroupRole.OWNER),
+        GroupMember(group_id=1, user_id=2, role=GroupRole.MEMBER),
+    ])
+    await session.commit()
+
+
+def test_group_version_combines_members_versions(session_factory):
+    async def main():
+        async with session_factory() as session:
+            await seed_group(session)
+            session.add_all([
+                UserStats(user_id=1, version=3),
+                UserStats(user_id=2, version=4),
+                UserStats(user_id=3, version=100),
+            ])
+            await session.commit()
+
+            before = await get_group_version(session, 1)
+            await session.execute(
+                update(UserStats).where(UserStats.user_id == 2).values(version=5)
+            )
+            after = await get_group_version(session, 1)
+            missing = await get_group_version(session, 2)
+            return before, after, missing
+
+    # User 3 is not a member, their version does not count
+    before, after, missing = run(main())
+
+    assert before == "0.7.0"
+    assert after == "0.8.0"
+    assert missing is None
+
+
+def test_wish_writes_leave_group_row_alone(pg_engine):
+    sessions = async_sessionmaker(pg_engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def group_row_version(session):
+        return await session.scalar(select(Group.version).where(Group.id == 1))
+
+    async def main():
+        async with sessions() as session:
+            await seed_group(session)
+            versions = [(await group_row_version(session), await get_group_version(session, 1))]
+
+            session.add(Wish(user_id=2, title="wish"))
+            await session.commit()
+            versions.append((await group_row_version(session), await get_group_version(session, 1)))
+
+            await session.execute(delete(GroupMember).where(GroupMember.user_id == 2))
+            await session.commit()
+            versions.append((await group_row_version(session), await get_group_version(session, 1)))
+            return versions
+
+    (row0, v0), (row1, v1), (row2, v2) = run(main())
+
+    # A member's wish changes the group's data version, not the group row
+    assert row1 == row0 and v1 != v0
+    # Membership changes bump the group row
+    assert row2 > row1 and v2 not in (v0, v1)
@@ -11,7 +11,7 @@ export default function GroupDetailPage() {
   )
 
   const { data: wishes } = useQuery(['group-wishes', id], () =>
-    groupsAPI.getGroupWishes(Number(id)).then(res => res.data)
+    groupsAPI.getGroupWishes(Number(id)).then(res => res.data.items)
   )
 
   if (isLoading) {
@@ -12,11 +12,47 @@ const api = axios.create({
   },
 })
 
-// Add Telegram initData to requests
-api.interceptors.request.use((config) => {
+// Session token exchanged for Telegram initData once per session
+let sessionToken: string | null = null
+let sessionExpiresAt = 0
+let sessionRequest: Promise<string | null> | null = null
+
+const getSessionToken = (initData: string): Promise<string | null> => {
+  if (sessionToken && Date.now() < sessionExpiresAt) {
+    return Promise.resolve(sessionToken)
+  }
+
+  // Share one exchange between parallel requests
+  if (!sessionRequest) {
+    sessionRequest = axios
+      .post(`${API_URL}/api/auth/session`, null, {
+        headers: { 'X-Telegram-Init-Data': initData },
+      })
+      .then((response) => {
+        sessionToken = response.data.access_token
+        // Refresh a minute before expiry
+        sessionExpiresAt = Date.now() + (response.data.expires_in - 60) * 1000
+        return sessionToken
+      })
+      .catch(() => null)
+      .finally(() => {
+        sessionRequest = null
+      })
+  }
+
+  return sessionRequest
+}
+
+// Add session token (or Telegram initData as fallback) to requests
+api.interceptors.request.use(async (config) => {
   const tg = window.Telegram?.WebApp
   if (tg?.initData) {
-    config.headers['X-Telegram-Init-Data'] = tg.initData
+    const token = await getSessionToken(tg.initData)
+    if (token) {
+      config.headers['Authorization'] = `Bearer ${token}`
+    } else {
+      config.headers['X-Telegram-Init-Data'] = tg.initData
+    }
   }
   return config
 })
@@ -26,7 +62,8 @@ api.interceptors.response.use(
   (response) => response,
   (error) => {
     if (error.response?.status === 401) {
-      // Unauthorized
+      // Unauthorized - drop session token so the next request re-exchanges initData
+      sessionToken = null
       console.error('Unauthorized access')
     }
     return Promise.reject(error)
@@ -38,7 +75,8 @@ export const userAPI = {
   getProfile: () => api.get('/api/user/profile/'),
   updateProfile: (data: any) => api.put('/api/user/profile/', data),
   getUser: (userId: number) => api.get(`/api/user/${userId}/`),
-  getUserWishes: (userId: number) => api.get(`/api/user/${userId}/wishes/`),
+  getUserWishes: (userId: number, params?: any) =>
+    api.get(`/api/user/${userId}/wishes/`, { params }),
 }
 
 // Wishes API
@@ -60,7 +98,8 @@ export const groupsAPI = {
   joinGroup: (id: number, inviteCode: string) =>
     api.post(`/api/groups/${id}/join/`, { invite_code: inviteCode }),
   getMembers: (id: number) => api.get(`/api/groups/${id}/members/`),
-  getGroupWishes: (id: number) => api.get(`/api/groups/${id}/wishes/`),
+  getGroupWishes: (id: number, params?: any) =>
+    api.get(`/api/groups/${id}/wishes/`, { params }),
 }
 
 export default api
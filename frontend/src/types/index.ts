@@ -15,8 +15,12 @@ export interface User {
 
 export interface UserProfile extends User {
   wishes_count: number
+  active_wishes_count: number
   completed_wishes_count: number
   groups_count: number
+  price_totals: Record<string, number>
+  wishes_by_status: Record<string, number>
+  wishes_by_priority: Record<string, number>
 }
 
 export enum WishStatus {